@@ -0,0 +1,10 @@
+# machining_auto/__main__.py
+"""
+python -m machining_auto 진입점 (main.py로 위임).
+"""
+
+import sys
+
+from machining_auto.main import main
+
+raise SystemExit(main(sys.argv))
@@ -7,12 +7,21 @@
 """
 
 from __future__ import annotations
+import time
+
+# ✅ 시작 시간 측정: import 단계 시작 시각(아래 PySide6/Setting/CAM import 포함)
+_IMPORT_T0 = time.perf_counter()
+
 import os
 from machining_auto.common.qss_loader import load_qss_files
+from machining_auto.common.startup_timing import StartupTimer
+import contextlib
+import importlib
 import sys
 from pathlib import Path
+from typing import Optional
 
-from PySide6.QtCore import QSize, Qt, QTimer, QEvent, QPointF
+from PySide6.QtCore import QObject, QSize, Qt, QTimer, QEvent, QPointF
 from PySide6.QtGui import QIcon, QPainter, QPolygonF, QColor, QCursor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
@@ -24,14 +33,21 @@ from machining_auto.setting_sheet_auto.settings_manager import (
     load_global_settings,
 )
 
-# ✅ Setting UI / CAM UI 불러오기
-from machining_auto.setting_sheet_auto.main import MainWindow as SettingMainWindow
-from machining_auto.cam_sheet_auto.ui import CamSheetApp
+# ✅ 페이지 레지스트리(사이드바/스택 순서): (모듈, 클래스, 시작 시간 단계 키)
+# - Setting UI / CAM UI 모듈은 여기서 import하지 않습니다.
+# - 페이지가 처음 선택될 때, 또는 첫 화면 표시 후 유휴 시간에 import + 생성합니다. (ShellMainWindow._ensure_page)
+PAGE_REGISTRY = (
+    ("machining_auto.setting_sheet_auto.main", "MainWindow", "setting_page"),
+    ("machining_auto.cam_sheet_auto.ui", "CamSheetApp", "cam_page"),
+)
+PAGE_SETTING, PAGE_CAM = 0, 1
 
 
 class ShellMainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup: Optional[StartupTimer] = None):
         super().__init__()
+        # ✅ 시작 단계 타이머(main에서 전달, 없으면 측정 안 함)
+        self._startup = startup
 
         # ✅ 타이틀바 제거(프레임리스)
         self.setWindowFlag(Qt.FramelessWindowHint, True)
@@ -113,62 +129,153 @@ class ShellMainWindow(QMainWindow):
         self.stack.setMouseTracking(True)
         self.sidebar.setMouseTracking(True)
        
-        # ----- 페이지 구성 -----
-        self.page_setting = SettingMainWindow()
+        # ----- 페이지 구성(지연 생성) -----
+        # 스택에는 빈 자리만 잡아 두고, _ensure_page()에서 실제 페이지로 교체합니다.
+        # 페이지 간 연결(헤더 공급자/헤더 그리기/설비·ROTATE 주입/프로젝트명 바인딩)은
+        # 페이지가 만들어질 때 _on_*_page_ready()에서 붙입니다.
+        self.page_setting = None
+        self.page_cam = None
+        self._pages = {}
+        self._project_label_bound = set()
+        for _ in PAGE_REGISTRY:
+            self.stack.addWidget(QWidget())
+
+        # CAM 페이지가 늦게 만들어져도 그 사이의 설비 변경을 반영하기 위한 기준값
+        try:
+            self._init_machine = (self.cb_machine.currentText() or "").strip()
+        except Exception:
+            self._init_machine = ""
+
+        # 초기 페이지: Setting (CAM은 첫 화면 표시 후 load_pending_pages에서 생성)
+        self._select_page(PAGE_SETTING)
+        # ✅ show 직후 레이아웃 재계산으로 창이 줄어드는 현상 방지(초기 크기 복원)
+        QTimer.singleShot(0, self._enforce_initial_geometry)
+        # ✅ DPI/스크린 이동 진단(모니터 이동 시 들쑥날쑥 원인 확정용)
+        QTimer.singleShot(0, self._install_dpi_diagnostics)
+
+       
+    # ============================================================
+    # 페이지 지연 생성
+    # ============================================================
+    def _ensure_page(self, idx: int):
+        """
+        idx 페이지를 반환합니다. 아직 없으면 모듈 import + 생성 후 스택의 빈 자리와 교체하고 연결 훅을 실행합니다.
+        """
+        page = self._pages.get(idx)
+        if page is not None:
+            return page
+
+        module_name, class_name, stage = PAGE_REGISTRY[idx]
+        timing = self._startup.stage(stage) if self._startup is not None else contextlib.nullcontext()
+        with timing:
+            page_cls = getattr(importlib.import_module(module_name), class_name)
+            page = page_cls()
+
+        self._pages[idx] = page
+        placeholder = self.stack.widget(idx)
+        self.stack.insertWidget(idx, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+        if idx == PAGE_SETTING:
+            self.page_setting = page
+            self._on_setting_page_ready()
+        else:
+            self.page_cam = page
+            self._on_cam_page_ready()
+        self._link_cam_header_drawer()
+        self._bind_topbar_project_source()
+        return page
+
+    def load_pending_pages(self, on_done=None):
+        """
+        아직 만들지 않은 페이지를 이벤트 루프 유휴 시간에 1개씩 생성합니다. (첫 화면 표시 후 호출)
+        - 모두 끝나면 on_done()을 호출하고 시작 타이머 연결을 끊습니다.
+        """
+        pending = [i for i in range(len(PAGE_REGISTRY)) if i not in self._pages]
+
+        def _next():
+            while pending and pending[0] in self._pages:
+                pending.pop(0)
+            if not pending:
+                self._startup = None
+                if on_done is not None:
+                    on_done()
+                return
+            self._ensure_page(pending.pop(0))
+            QTimer.singleShot(0, _next)
+
+        QTimer.singleShot(0, _next)
+
+    def _on_setting_page_ready(self):
+        page = self.page_setting
 
         # 통합 쉘이 메뉴를 가지므로, Setting 내부 메뉴/상태바는 숨김(기능은 유지)
         try:
-            mb = self.page_setting.menuBar()
+            mb = page.menuBar()
             if mb is not None:
                 mb.hide()
         except Exception:
             pass
         try:
-            sb = self.page_setting.statusBar()
+            sb = page.statusBar()
             if sb is not None:
                 sb.hide()
         except Exception:
             pass
-        # ✅ 초기 설비/ROTATE 상태를 SettingMainWindow에 주입 (PDF 헤더/작업자 매핑용)
+
+        # ✅ 현재 설비/ROTATE 상태를 SettingMainWindow에 주입 (PDF 헤더/작업자 매핑용)
         try:
-            init_machine = (self.cb_machine.currentText() or "").strip()
+            machine = (self.cb_machine.currentText() or "").strip()
         except Exception:
-            init_machine = ""
+            machine = ""
 
         try:
-            if hasattr(self.page_setting, "set_shell_machine"):
-                self.page_setting.set_shell_machine(init_machine)
+            if hasattr(page, "set_shell_machine"):
+                page.set_shell_machine(machine)
         except Exception:
             pass
 
         try:
-            if hasattr(self.page_setting, "set_shell_rotate"):
-                self.page_setting.set_shell_rotate(bool(getattr(self.btn_rotate, "isChecked", lambda: False)()))
+            if hasattr(page, "set_shell_rotate"):
+                page.set_shell_rotate(bool(getattr(self.btn_rotate, "isChecked", lambda: False)()))
         except Exception:
             pass
 
-        self.page_cam = CamSheetApp()
+    def _on_cam_page_ready(self):
+        page = self.page_cam
+
+        # ✅ CAM 헤더 데이터 공급자 주입(Setting 설정 공유)
+        page.set_header_provider(self._get_setting_header_info)
+        page.use_setting_header = bool(self.act_cam_header_from_setting.isChecked())  # 기본 ON
 
-        # ✅ CAM PDF 헤더는 SettingSheet PrintEngine의 헤더를 그대로 사용
-        # (로테이트/설비/모드/작업자/날짜가 Setting과 완전히 동일해짐)
+        # ✅ 페이지 생성 전에 바뀐 공유 설비/ROTATE 상태 반영
+        try:
+            machine = (self.cb_machine.currentText() or "").strip()
+            if machine != self._init_machine and hasattr(page, "machine_input"):
+                page.machine_input.setText(machine)
+        except Exception:
+            pass
+        try:
+            if self.btn_rotate.isChecked():
+                page.rotate_on = True
+        except Exception:
+            pass
+
+    def _link_cam_header_drawer(self):
+        """
+        ✅ CAM PDF 헤더는 SettingSheet PrintEngine의 헤더를 그대로 사용
+        (로테이트/설비/모드/작업자/날짜가 Setting과 완전히 동일해짐)
+        - 두 페이지가 모두 만들어진 뒤 1번만 연결합니다.
+        """
+        if getattr(self, "_cam_header_linked", False):
+            return
+        if self.page_setting is None or self.page_cam is None:
+            return
+        self._cam_header_linked = True
         if hasattr(self.page_cam, "_cam_printer") and hasattr(self.page_setting, "print_engine"):
             self.page_cam._cam_printer.set_header_drawer(self.page_setting.print_engine._draw_header)
 
-        # ✅ CAM 헤더 데이터 공급자 주입(Setting 설정 공유)
-        self.page_cam.set_header_provider(self._get_setting_header_info)
-        self.page_cam.use_setting_header = True  # 기본 ON
-        # ✅ TopBar 프로젝트명 표시: 페이지 생성 이후에 신호를 바인딩
-        self.stack.addWidget(self.page_setting)  # index 0
-        self.stack.addWidget(self.page_cam)      # index 1
-
-        # 초기 페이지: Setting
-        self._select_page(0)
-        # ✅ show 직후 레이아웃 재계산으로 창이 줄어드는 현상 방지(초기 크기 복원)
-        QTimer.singleShot(0, self._enforce_initial_geometry)
-        # ✅ DPI/스크린 이동 진단(모니터 이동 시 들쑥날쑥 원인 확정용)
-        QTimer.singleShot(0, self._install_dpi_diagnostics)
-
-       
     def _enforce_initial_geometry(self):
         if getattr(self, "_enforced_once", False):
             return
@@ -424,8 +531,9 @@ class ShellMainWindow(QMainWindow):
         SettingSheet 쪽에 이미 구현된 설정창을 그대로 사용.
         - SettingMainWindow.open_settings_dialog()가 내부에서 load/save_global_settings를 처리함
         """
-        if hasattr(self.page_setting, "open_settings_dialog"):
-            self.page_setting.open_settings_dialog()
+        page = self._ensure_page(PAGE_SETTING)
+        if hasattr(page, "open_settings_dialog"):
+            page.open_settings_dialog()
             # 설정 저장 후 쉘 캐시를 갱신(다른 페이지에서 공유용)
             machines, op_map = load_global_settings()
             self.machine_list = machines or []
@@ -437,7 +545,8 @@ class ShellMainWindow(QMainWindow):
         """
         CAM PDF 헤더 데이터 소스를 Setting 설정(JSON)으로 쓸지 여부 토글
         """
-        if hasattr(self, "page_cam") and self.page_cam is not None:
+        # CAM 페이지가 아직 없으면 생성 시(_on_cam_page_ready) 메뉴 상태를 읽어 적용합니다.
+        if self.page_cam is not None:
             self.page_cam.use_setting_header = bool(checked)
 
     def _get_setting_header_info(self) -> dict:
@@ -823,8 +932,8 @@ class ShellMainWindow(QMainWindow):
         v.addStretch(1)
 
         # 페이지 전환
-        self.btn_setting.clicked.connect(lambda: self._select_page(0))
-        self.btn_cam.clicked.connect(lambda: self._select_page(1))
+        self.btn_setting.clicked.connect(lambda: self._select_page(PAGE_SETTING))
+        self.btn_cam.clicked.connect(lambda: self._select_page(PAGE_CAM))
 
         # 기본 선택
         self.btn_setting.setChecked(True)
@@ -836,6 +945,7 @@ class ShellMainWindow(QMainWindow):
 
 
     def _select_page(self, idx: int):
+        self._ensure_page(idx)
         self.stack.setCurrentIndex(idx)
         if idx == 0:
             self.btn_setting.setChecked(True)
@@ -847,26 +957,26 @@ class ShellMainWindow(QMainWindow):
     def _bind_topbar_project_source(self):
         """
         TopBar의 프로젝트명 표시용 라벨을 페이지 입력칸과 연결한다.
-        - Setting/CAM 페이지 생성 이후에만 호출한다.
-        - 신호 중복 연결을 방지한다.
+        - 페이지가 만들어질 때마다(_ensure_page) 호출되며, 만들어진 페이지만 연결한다.
+        - 페이지별로 1번만 연결해 신호 중복 연결을 방지한다.
         """
-        if getattr(self, "_project_label_bound", False):
-            self._update_topbar_project_label()
-            return
-
-        self._project_label_bound = True
+        bound = self._project_label_bound
 
         # Setting 페이지 프로젝트명
         try:
-            if hasattr(self.page_setting, "edit_project") and hasattr(self.page_setting.edit_project, "textChanged"):
-                self.page_setting.edit_project.textChanged.connect(self._update_topbar_project_label)
+            if self.page_setting is not None and "setting" not in bound:
+                if hasattr(self.page_setting, "edit_project") and hasattr(self.page_setting.edit_project, "textChanged"):
+                    self.page_setting.edit_project.textChanged.connect(self._update_topbar_project_label)
+                bound.add("setting")
         except Exception:
             pass
 
         # CAM 페이지(프로젝트명 입력칸이 존재하는 경우만)
         try:
-            if hasattr(self.page_cam, "project_input") and hasattr(self.page_cam.project_input, "textChanged"):
-                self.page_cam.project_input.textChanged.connect(self._update_topbar_project_label)
+            if self.page_cam is not None and "cam" not in bound:
+                if hasattr(self.page_cam, "project_input") and hasattr(self.page_cam.project_input, "textChanged"):
+                    self.page_cam.project_input.textChanged.connect(self._update_topbar_project_label)
+                bound.add("cam")
         except Exception:
             pass
 
@@ -966,7 +1076,8 @@ class ShellMainWindow(QMainWindow):
 
         # CAM 반영: 지금은 상태만 저장(출력 안정화 2단계에서 헤더에 넣을지 결정)
         try:
-            self.page_cam.rotate_on = bool(checked)
+            if self.page_cam is not None:
+                self.page_cam.rotate_on = bool(checked)
         except Exception:
             pass
 
@@ -1033,6 +1144,15 @@ class ShellMainWindow(QMainWindow):
 
         return None
 
+    def closeEvent(self, event):
+        """
+        창을 닫을 때 CAM 페이지의 작업 스레드와 스캔 캐시를 정리합니다.
+        (QStackedWidget 안의 페이지는 closeEvent를 받지 못함)
+        """
+        if self.page_cam is not None and hasattr(self.page_cam, "shutdown"):
+            self.page_cam.shutdown()
+        super().closeEvent(event)
+
     def mousePressEvent(self, event):
         """
         프레임리스 창 마우스 눌림 처리
@@ -1273,11 +1393,40 @@ def apply_brand_light_theme(app: QApplication) -> None:
     load_qss_bundle(app)
 
 
+class _FirstPaintWatcher(QObject):
+    """
+    메인 창(또는 그 자식)의 첫 Paint 이벤트를 감지해 on_painted를 1번 호출합니다.
+    - 호출은 이벤트 루프 다음 차례로 미뤄 첫 프레임 그리기가 끝난 뒤에 실행됩니다.
+    """
+
+    def __init__(self, window: QWidget, on_painted):
+        super().__init__(window)
+        self._window = window
+        self._on_painted = on_painted
+        self._done = False
+
+    def eventFilter(self, obj, event):
+        if (
+            not self._done
+            and event.type() == QEvent.Type.Paint
+            and isinstance(obj, QWidget)
+            and obj.window() is self._window
+        ):
+            self._done = True
+            QApplication.instance().removeEventFilter(self)
+            QTimer.singleShot(0, self._on_painted)
+        return False
+
+
 def main():
     from PySide6.QtWidgets import QApplication
     from PySide6.QtCore import Qt
     from pathlib import Path
 
+    # ✅ 0) 시작 타이머: 모듈 import 시간은 이미 지났으므로 시작 시각으로 기록
+    startup = StartupTimer(t0=_IMPORT_T0)
+    startup.record("import", _IMPORT_T0)
+
     # ✅ 1) 앱 생성
     app = QApplication(sys.argv)
 
@@ -1288,25 +1437,36 @@ def main():
     from machining_auto.splash_screen import AppSplash
     splash = AppSplash(logo_path=str(logo_path))
     splash.show()
-    splash.set_progress(5, "앱 초기화 중...")
+    # 진행률은 지난 실행들의 단계별 실측 시간 비율로 표시됩니다.
+    startup.on_stage = splash.set_progress
 
     # ✅ 3) 테마/QSS 적용
-    splash.set_progress(15, "테마 적용 중...")
+    startup.begin("theme")
     apply_brand_light_theme(app)
 
-    # ✅ 4) 메인 윈도우 생성(여기가 가장 무거움)
-    splash.set_progress(35, "UI 로딩 중 (Setting/CAM)...")
-    win = ShellMainWindow()
+    # ✅ 4) 메인 윈도우 생성 — 첫 페이지(Setting)만 만들고, setting_page 단계는 쉘 내부에서 전환
+    startup.begin("shell")
+    win = ShellMainWindow(startup=startup)
 
-    # ✅ 5) 표시 직전 마무리
-    splash.set_progress(85, "마무리 중...")
-    win.show()
+    # ✅ 5) 첫 화면이 그려지면 스플래시 종료
+    startup.begin("first_paint")
+
+    def _on_first_paint():
+        startup.end()
+        splash.set_progress(100, "완료")
+        splash.close()
+        # ✅ 6) 나머지 페이지(CAM)는 유휴 시간에 생성 → 끝나면 시작 시간 로그 기록
+        startup.on_stage = None
+        win.load_pending_pages(on_done=startup.finish)
 
-    splash.set_progress(100, "완료")
-    splash.close()
+    app.installEventFilter(_FirstPaintWatcher(win, _on_first_paint))
+    win.show()
 
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # ✅ EXE(PyInstaller)에서 CAM 병렬 스캔(프로세스 풀) 자식 프로세스 부트스트랩
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,134 @@
+# machining_auto/benchmarks/bench_import.py
+"""
+앱 시작 import 시간 리포트.
+
+- 새 파이썬 프로세스에서 `-X importtime`으로 대상 모듈(기본: machining_auto.app_shell)을 import하고
+  전체 시간, 느린 모듈 상위 N개, 무거운 라이브러리(pandas/openpyxl/chardet/numpy/PySide6) 로드 여부를 보여줍니다.
+- 시간은 빈 인터프리터(site 등) 시작 import 시간을 뺀 값입니다.
+- 지연 import로 시작 경로에서 빠진 라이브러리는 따로 import해 비용을 재서 "절감" 항목으로 보여줍니다.
+  (시작 경로에 다시 끌려 들어오면 로드됨으로 표시되고 절감에서 빠집니다)
+
+실행 예:
+  python -m machining_auto.benchmarks.bench_import
+  python -m machining_auto.benchmarks.bench_import --module machining_auto.cam_sheet_auto.ui --repeat 5 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MODULE = "machining_auto.app_shell"
+# 시작 경로에서 빠져 있어야 하는 라이브러리(지연 import 대상)
+DEFERRED = ("pandas", "openpyxl", "chardet", "numpy")
+# 로드 여부를 함께 보여줄 무거운 라이브러리
+HEAVY = DEFERRED + ("PySide6",)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def _run_importtime(code: str) -> Tuple[List[Tuple[str, int, int, int]], int, str]:
+    """
+    새 프로세스에서 code를 실행하고 ([(모듈, self_us, cumulative_us, 깊이)], 종료 코드, stderr 꼬리)를 반환합니다.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env,
+    )
+    entries = []
+    other = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+            entries.append((name, self_us, cum_us, (len(indent) - 1) // 2))
+        elif not line.startswith("import time:"):
+            other.append(line)
+    return entries, proc.returncode, "\n".join(other[-5:])
+
+
+def _best_of(code: str, repeat: int):
+    best = None
+    for _ in range(repeat):
+        entries, rc, err = _run_importtime(code)
+        total = sum(e[2] for e in entries if e[3] == 0)
+        if best is None or total < best[0]:
+            best = (total, entries, rc, err)
+    return best
+
+
+def measure(module: str = DEFAULT_MODULE, repeat: int = 3, top: int = 15) -> Dict[str, object]:
+    """
+    대상 모듈 import 리포트를 dict로 만듭니다.
+    """
+    # 인터프리터 자체 시작(site 등) import 시간은 빼고 비교합니다.
+    base_us = _best_of("pass", repeat)[0]
+    total_us, entries, rc, err = _best_of(f"import {module}", repeat)
+    total_us = max(total_us - base_us, 0)
+    cumulative = {name: cum for name, _, cum, _ in entries}
+
+    loaded = {lib: cumulative.get(lib) for lib in HEAVY}
+    deferred_cost: Dict[str, Optional[int]] = {}
+    for lib in DEFERRED:
+        lib_total, lib_entries, lib_rc, _ = _best_of(f"import {lib}", repeat)
+        deferred_cost[lib] = max(lib_total - base_us, 0) if lib_rc == 0 else None
+
+    savings = sum(v for lib, v in deferred_cost.items() if v and loaded.get(lib) is None)
+    slowest = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+
+    return {
+        "module": module,
+        "ok": rc == 0,
+        "error": err if rc != 0 else "",
+        "total_ms": round(total_us / 1000, 1),
+        "heavy_loaded_ms": {k: (round(v / 1000, 1) if v is not None else None) for k, v in loaded.items()},
+        "deferred_cost_ms": {k: (round(v / 1000, 1) if v is not None else None) for k, v in deferred_cost.items()},
+        "savings_ms": round(savings / 1000, 1),
+        "slowest_self_ms": [(name, round(self_us / 1000, 2)) for name, self_us, _, _ in slowest],
+    }
+
+
+def print_report(report: Dict[str, object]) -> None:
+    print(f"📦 import {report['module']}: {report['total_ms']:.1f} ms" + ("" if report["ok"] else "  (❌ import 실패)"))
+    if report["error"]:
+        print(report["error"])
+    print("\n[무거운 라이브러리]")
+    for lib, ms in report["heavy_loaded_ms"].items():
+        print(f"  {lib:<10} {'로드됨 %.1f ms' % ms if ms is not None else '-'}")
+    print("\n[지연 import 절감] (시작 경로에서 빠진 라이브러리의 단독 import 비용)")
+    for lib, ms in report["deferred_cost_ms"].items():
+        state = "시작 경로에 남아 있음" if report["heavy_loaded_ms"].get(lib) is not None else "지연됨"
+        cost = "설치 안 됨" if ms is None else f"{ms:.1f} ms"
+        print(f"  {lib:<10} {cost:>12}  {state}")
+    print(f"  합계 절감     {report['savings_ms']:.1f} ms")
+    print("\n[self 시간 상위 모듈]")
+    for name, ms in report["slowest_self_ms"]:
+        print(f"  {ms:8.2f} ms  {name}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="앱 시작 import 시간 리포트")
+    ap.add_argument("--module", default=DEFAULT_MODULE)
+    ap.add_argument("--repeat", type=int, default=3, help="반복 횟수(최솟값 사용)")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--json", default=None, help="리포트 JSON 저장 경로")
+    args = ap.parse_args(argv)
+
+    report = measure(args.module, args.repeat, args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 리포트 저장: {args.json}")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
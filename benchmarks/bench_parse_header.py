@@ -0,0 +1,171 @@
+# machining_auto/benchmarks/bench_parse_header.py
+"""
+extract_tool_data 헤더 파싱 마이크로 벤치마크.
+
+- before: 기존 구현(라인마다 미컴파일 re.search 6회 + 설비/냉각수 루프)
+- after : functions.parse_header_lines (사전 컴파일 + 키워드 부분문자열 분류)
+- 두 구현의 결과가 완전히 같은지도 함께 검사합니다. (회귀 테스트: tests/test_parse_header.py)
+
+실행 예:
+  python -m machining_auto.benchmarks.bench_parse_header
+  python -m machining_auto.benchmarks.bench_parse_header --files 2000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from machining_auto.cam_sheet_auto.functions import parse_header_lines
+
+
+def legacy_parse_header_lines(lines, job_number="N/A"):
+    """
+    변경 전 extract_tool_data 내부 루프를 그대로 옮긴 기준 구현입니다.
+    """
+    tool_db = "N/A"
+    tool_number = "N/A"
+    allowance_value = "N/A"
+    pg_name = "N/A"
+    equip_name = "N/A"
+    coolant_code = "OFF"
+
+    equipment_patterns = [
+        r"DINO_MAX#3", r"DINO_MAX#2",
+        r"DINO_MAX#1", r"DINO", r"STINGER"
+    ]
+
+    coolant_map = {
+        r"\bM08\b": "OIL",
+        r"\bM8\b": "OIL",
+        r"\bM17\b": "AIR",
+        r"\bM28\b": "IN AIR",
+        r"\bM18\b": "IN OIL",
+    }
+
+    for line in lines:
+        line_upper = line.upper()
+
+        match_tname = re.search(r"TNAME\s*:\s*(.+)", line, re.IGNORECASE)
+        if match_tname:
+            tool_db = match_tname.group(1).strip()
+
+        match_tool_call = re.search(r"TOOL CALL\s+(\d+)\s+Z", line, re.IGNORECASE)
+        if match_tool_call:
+            tool_number = match_tool_call.group(1).strip()
+
+        match_allowance = re.search(r"ALLOWANCE\s*:\s*([-\d\.]+)", line, re.IGNORECASE)
+        if match_allowance:
+            allowance_value = match_allowance.group(1).strip()
+
+        match_pg = re.search(r"\[([^\]]+)\]", line)
+        if match_pg:
+            pg_name = match_pg.group(1).strip()
+
+        if equip_name == "N/A":
+            for pattern in equipment_patterns:
+                if re.search(pattern, line, re.IGNORECASE):
+                    equip_name = pattern
+                    break
+
+        match_job = re.search(r"JOB NUMBER\s*:\s*(\S+)", line, re.IGNORECASE)
+        if match_job:
+            job_number = match_job.group(1).strip()
+
+        if coolant_code == "OFF":
+            for pattern, meaning in coolant_map.items():
+                if re.search(pattern, line_upper):
+                    coolant_code = meaning
+                    break
+
+    return tool_db, tool_number, allowance_value, pg_name, equip_name, job_number, coolant_code
+
+
+# =========================
+# 합성 헤더 생성
+# =========================
+
+_HEADER_TEMPLATES = [
+    "0 BEGIN PGM {name} MM",
+    "; [{pg}]",
+    "; TNAME : {tname}",
+    "; tname: {tname}",
+    "; ALLOWANCE : {allow}",
+    "; MACHINE : {machine}",
+    "; JOB NUMBER : {job}",
+    "BLK FORM 0.1 Z X-50 Y-50 Z-40",
+    "BLK FORM 0.2 X+50 Y+50 Z+0",
+    "TOOL CALL {tool} Z S{rpm}",
+    "L Z+100 R0 FMAX {cool}",
+    "L X+{x} Y-{y} R0 FMAX",
+    "L Z-{z} F{feed}",
+    "CYCL DEF 32.0 TOLERANCE",
+    "* - {pg} [{tool}]",
+]
+_MACHINES = ["DINO_MAX#3", "dino_max#1", "DINO", "STINGER", "HERMLE", "DINO_MAX#2 / STINGER"]
+_COOLANTS = ["M8", "M08", "M17", "M28", "M18", "M3", "M13", "M17 M8"]
+
+
+def make_header(rng: random.Random, n_lines: int = 80):
+    """
+    실제 헤더와 비슷한 형태의 라인 목록(strip 완료)을 만듭니다.
+    """
+    out = []
+    for _ in range(n_lines):
+        tpl = rng.choice(_HEADER_TEMPLATES)
+        out.append(tpl.format(
+            name=f"T{rng.randint(1, 300)}",
+            pg=rng.choice(["황삭 포켓", "FINISH WALL", "드릴 6.8", "CHAMFER 0.5"]),
+            tname=rng.choice(["D10R0.5", "BALL 6 L40", "DRILL 6.8"]),
+            allow=rng.choice(["0", "0.1", "-0.05", "0.2"]),
+            machine=rng.choice(_MACHINES),
+            job=f"J{rng.randint(100000, 999999)}",
+            tool=rng.randint(1, 99),
+            rpm=rng.randint(1000, 20000),
+            cool=rng.choice(_COOLANTS),
+            x=rng.randint(0, 99), y=rng.randint(0, 99), z=rng.randint(0, 20),
+            feed=rng.randint(100, 5000),
+        ).strip())
+    return out
+
+
+def _time_per_file(fn, headers, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for lines in headers:
+            fn(lines, "N/A")
+        best = min(best, time.perf_counter() - t0)
+    return best / len(headers)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="헤더 파싱 before/after 마이크로 벤치마크")
+    ap.add_argument("--files", type=int, default=1000, help="합성 헤더 개수")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 횟수(최솟값 사용)")
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    headers = [make_header(rng) for _ in range(args.files)]
+
+    mismatches = sum(
+        1 for lines in headers
+        if legacy_parse_header_lines(lines, "N/A") != parse_header_lines(lines, "N/A")
+    )
+
+    before = _time_per_file(legacy_parse_header_lines, headers, args.repeat)
+    after = _time_per_file(parse_header_lines, headers, args.repeat)
+
+    print(f"files={args.files} lines/file=80 repeat={args.repeat}")
+    print(f"before: {before * 1e6:8.1f} us/file")
+    print(f"after : {after * 1e6:8.1f} us/file")
+    print(f"speedup: x{before / after:.2f}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+# machining_auto/benchmarks/bench_scan.py
+"""
+폴더 스캔(scan_cam_rows) 단계별 벤치마크.
+
+- nc_corpus로 같은 seed의 합성 코퍼스를 만들고, 파일 수(기본 10/100/1k/10k)마다 측정합니다.
+- 단계:
+  - list     : .h 목록 + stat (snapshot_h_files)
+  - detect   : 인코딩 감지 (detect_encoding, 폴더 메모 초기화 후)
+  - header   : 감지된 인코딩으로 헤더 읽기 + parse_header_lines
+  - program  : 프로그램 전체 분석 (analyze_nc_program)
+  - build    : 확장 필드 변환(stats_to_fields) + CamRow 생성 + 자연 정렬
+  - scan     : scan_cam_rows 기본 실행 = 헤더만 (workers=1, 캐시 없음)
+  - scan_full: scan_cam_rows(analyze=True) 프로그램 전체 분석 포함 (workers=1, 캐시 없음)
+  - scan_par : scan_cam_rows 기본 실행 (workers=CPU 개수, 캐시 없음)
+  - scan_warm: scan_cam_rows 기본 실행 (캐시 적중)
+- 결과는 JSON으로 저장하고, --baseline으로 이전 결과와 비교해 느려진 단계를 표시합니다.
+
+실행 예:
+  python -m machining_auto.benchmarks.bench_scan
+  python -m machining_auto.benchmarks.bench_scan --sizes 10,100 --out now.json --baseline before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from machining_auto.benchmarks.nc_corpus import DEFAULT_JOB, generate_corpus, summarize
+from machining_auto.cam_sheet_auto import encoding_utils
+from machining_auto.cam_sheet_auto.cam_core import natural_sort_key, scan_cam_rows, snapshot_h_files
+from machining_auto.cam_sheet_auto.cam_models import CamRow
+from machining_auto.cam_sheet_auto.cycle_time import rapid_rate_for
+from machining_auto.cam_sheet_auto.encoding_utils import detect_encoding, get_detect_stats, read_head_lines, reset_detect_stats
+from machining_auto.cam_sheet_auto.functions import (
+    HEADER_MAX_CHARS, HEADER_MAX_LINES, PARSER_VERSION, clear_jobno_cache, extract_job_number, parse_header_lines,
+)
+from machining_auto.cam_sheet_auto.nc_analyzer import analyze_nc_program, stats_to_fields
+from machining_auto.cam_sheet_auto.scan_cache import ScanCache
+
+RESULT_SCHEMA = 1
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+def _reset_caches() -> None:
+    """
+    프로세스 안의 감지/작업번호 메모를 비워 매 측정을 같은 조건(cold)에서 시작합니다.
+    """
+    encoding_utils._ENCODING_MEMO.clear()
+    reset_detect_stats()
+    clear_jobno_cache()
+
+
+def _timed(fn: Callable[[], object], repeat: int):
+    """
+    fn을 repeat번 실행해 (최소 소요 시간, 마지막 반환값)을 돌려줍니다.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        _reset_caches()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench_folder(folder: str, repeat: int = 1, workers: int = 0) -> Dict[str, object]:
+    """
+    folder 하나에 대해 단계별 시간을 잽니다.
+    """
+    names = sorted(snapshot_h_files(folder))
+    paths = [os.path.join(folder, n) for n in names]
+    stages: Dict[str, float] = {}
+
+    stages["list"], _ = _timed(lambda: snapshot_h_files(folder), repeat)
+
+    stages["detect"], encodings = _timed(lambda: [detect_encoding(p) for p in paths], repeat)
+    _reset_caches()
+    [detect_encoding(p) for p in paths]
+    detect_stats = get_detect_stats()
+
+    def _headers():
+        job = extract_job_number(folder)
+        out = []
+        for p, enc in zip(paths, encodings):
+            with open(p, "r", encoding=enc, errors="ignore") as f:
+                lines = read_head_lines(f, HEADER_MAX_LINES, HEADER_MAX_CHARS)
+            out.append(parse_header_lines([line.strip() for line in lines[:HEADER_MAX_LINES]], job))
+        return out
+
+    stages["header"], headers = _timed(_headers, repeat)
+    stages["program"], programs = _timed(lambda: [analyze_nc_program(p) for p in paths], repeat)
+
+    def _build():
+        date = datetime.now().strftime("%m-%d")
+        rows = []
+        for name, enc, header, stats in zip(names, encodings, headers, programs):
+            tool_db, tool_no, allowance, pg_name, equip_name, job_number, coolant = header
+            rows.append(CamRow(
+                file_name=name, tool_db=tool_db, tool_no=tool_no, allowance_xy=allowance, pg_name=pg_name,
+                coolant=coolant, equip_name=equip_name, job_number=job_number, date=date, detected_encoding=enc,
+                **stats_to_fields(stats, rapid_rate_for(equip_name)),
+            ))
+        rows.sort(key=lambda r: natural_sort_key(r.file_name))
+        return rows
+
+    stages["build"], _ = _timed(_build, repeat)
+    stages["scan"], rows = _timed(lambda: scan_cam_rows(folder, workers=1), repeat)
+    stages["scan_full"], _ = _timed(lambda: scan_cam_rows(folder, workers=1, analyze=True), repeat)
+    stages["scan_par"], _ = _timed(lambda: scan_cam_rows(folder, workers=workers), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ScanCache(os.path.join(tmp, "bench_cache.sqlite3"))
+        scan_cam_rows(folder, workers=workers, cache=cache)
+        stages["scan_warm"], _ = _timed(lambda: scan_cam_rows(folder, workers=workers, cache=cache), repeat)
+        cache.close()
+
+    n = max(len(names), 1)
+    return {
+        "files": len(names),
+        "rows": len(rows),
+        "detect_paths": detect_stats,
+        "stages": {
+            k: {"seconds": round(v, 6), "per_file_us": round(v / n * 1e6, 2)}
+            for k, v in stages.items()
+        },
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    같은 파일 수끼리 단계별 시간을 비교해 threshold배 이상 느려진 항목을 반환합니다.
+    """
+    base_by_files = {r["files"]: r for r in baseline.get("results", [])}
+    slower: List[str] = []
+    for r in current["results"]:
+        base = base_by_files.get(r["files"])
+        if base is None:
+            continue
+        for stage, cur in r["stages"].items():
+            prev = base["stages"].get(stage)
+            if not prev or prev["seconds"] <= 0:
+                continue
+            ratio = cur["seconds"] / prev["seconds"]
+            mark = "▲" if ratio >= threshold else " "
+            print(f"{mark} files={r['files']:>6} {stage:<10} {prev['seconds']:9.4f}s → {cur['seconds']:9.4f}s  x{ratio:.2f}")
+            if ratio >= threshold:
+                slower.append(f"files={r['files']} {stage} x{ratio:.2f}")
+    return slower
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="scan_cam_rows 단계별 벤치마크")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="파일 수 목록 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--repeat", type=int, default=1, help="단계별 반복 횟수(최솟값 사용)")
+    ap.add_argument("--workers", type=int, default=0, help="scan_par/scan_warm 프로세스 수 (0: CPU 개수)")
+    ap.add_argument("--corpus-dir", default=None, help="코퍼스를 남겨 둘 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    ap.add_argument("--out", default="bench_scan_results.json", help="결과 JSON 경로")
+    ap.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    ap.add_argument("--threshold", type=float, default=1.2, help="느려짐 판정 배율")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    root = args.corpus_dir or tempfile.mkdtemp(prefix="bench_scan_")
+    results = []
+    try:
+        for n in sizes:
+            corpus_root = os.path.join(root, f"n{n}_seed{args.seed}")
+            folder = os.path.join(corpus_root, DEFAULT_JOB)
+            files = generate_corpus(corpus_root, n, args.seed)
+            print(f"⏱ files={n} ({sum(f.bytes for f in files) / 1e6:.1f} MB) 측정 중...")
+            result = bench_folder(folder, repeat=args.repeat, workers=args.workers)
+            result["corpus"] = summarize(files)
+            results.append(result)
+            for stage, v in result["stages"].items():
+                print(f"   {stage:<10} {v['seconds']:9.4f}s  {v['per_file_us']:10.1f} us/file")
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "schema": RESULT_SCHEMA,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "parser_version": PARSER_VERSION,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(report, baseline, args.threshold)
+        if slower:
+            print(f"⚠ 느려진 단계 {len(slower)}개: " + ", ".join(slower))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
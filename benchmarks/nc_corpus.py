@@ -0,0 +1,200 @@
+# machining_auto/benchmarks/nc_corpus.py
+"""
+벤치마크용 합성 Heidenhain(.h) 코퍼스 생성기.
+
+- seed가 같으면 파일명/내용/인코딩이 바이트 단위까지 같습니다. (측정 재현용)
+- 변수:
+  - 크기: 헤더만 있는 파일 ~ 이동 블록 수천 줄 파일
+  - 인코딩: cp949 / utf-8 / utf-8-sig
+  - 헤더 레이아웃: 표준 주석 블록, 소문자 키, 필드 누락, 헤더 앞 사이클 정의, ASCII 전용
+  - TOOL CALL 밀도: 공구 1개 ~ 공구 교환이 잦은 프로그램
+- 파일은 작업번호가 검출되는 폴더(<root>/<JOB>/)에 만듭니다.
+
+실행 예(코퍼스만 생성):
+  python -m machining_auto.benchmarks.nc_corpus OUT_DIR --files 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+ENCODINGS = ("cp949", "utf-8", "utf-8-sig")
+LAYOUTS = ("standard", "lowercase", "sparse", "cycle_first", "ascii")
+# (이름, 이동 블록 수 범위, 가중치) — 10k 파일이어도 코퍼스가 수백 MB를 넘지 않도록 큰 파일 비중은 낮게
+SIZE_CLASSES = (("header", (0, 0), 3.0), ("small", (50, 300), 6.0), ("medium", (1000, 3000), 1.0), ("large", (5000, 10000), 0.3))
+# (이름, 이동 블록당 TOOL CALL 확률)
+TOOL_DENSITIES = (("single", 0.0), ("sparse", 0.002), ("dense", 0.02))
+
+DEFAULT_JOB = "BENCH_123456_PART"
+
+_MACHINES = ("DINO_MAX#3", "DINO_MAX#2", "DINO_MAX#1", "DINO", "STINGER")
+_COOLANTS = ("M8", "M08", "M17", "M28", "M18")
+_PG_NAMES = ("황삭 포켓", "정삭 측벽", "드릴 6.8", "모따기 0.5", "ROUGH POCKET", "FINISH WALL")
+_TOOL_NAMES = ("D10R0.5 엔드밀", "BALL 6 L40", "DRILL 6.8", "D3R0.5 ENDMILL")
+
+
+@dataclass(frozen=True)
+class CorpusFile:
+    """
+    생성된 파일 1개의 메타데이터.
+    """
+    name: str
+    encoding: str
+    layout: str
+    size_class: str
+    tool_density: str
+    moves: int
+    tool_calls: int
+    bytes: int
+
+
+def _pick_size(rng: random.Random) -> str:
+    names = [n for n, _, _ in SIZE_CLASSES]
+    weights = [w for _, _, w in SIZE_CLASSES]
+    return rng.choices(names, weights)[0]
+
+
+def _header_lines(rng: random.Random, layout: str, name: str, tool: int, rpm: int, feed: int) -> List[str]:
+    pg = rng.choice(_PG_NAMES)
+    tname = rng.choice(_TOOL_NAMES)
+    machine = rng.choice(_MACHINES)
+    allow = rng.choice(("0", "0.1", "-0.05", "0.2"))
+    if layout == "ascii":
+        pg, tname = "ROUGH POCKET", "D10R0.5 ENDMILL"
+
+    fields = [
+        f"; [{pg}]",
+        f"; TNAME : {tname}",
+        f"; ALLOWANCE : {allow}",
+        f"; MACHINE : {machine}",
+        f"; STEPOVER : {rng.choice(('0.5', '1.2', '3'))}",
+    ]
+    if layout == "lowercase":
+        fields = [f.lower() if "[" not in f else f for f in fields]
+    elif layout == "sparse":
+        fields = [f for f in fields if rng.random() < 0.5]
+
+    lines = [f"0 BEGIN PGM {name} MM"]
+    if layout == "cycle_first":
+        lines += ["CYCL DEF 32.0 TOLERANCE", "CYCL DEF 32.1 T0.01", "BLK FORM 0.1 Z X-50 Y-50 Z-40",
+                  "BLK FORM 0.2 X+50 Y+50 Z+0"]
+    lines += fields
+    lines += [
+        f"TOOL CALL {tool} Z S{rpm} F{feed}",
+        f"L Z+100 R0 FMAX {rng.choice(_COOLANTS)} M3",
+    ]
+    return lines
+
+
+def _motion_lines(rng: random.Random, moves: int, tool_p: float, feed: int) -> Tuple[List[str], int]:
+    out: List[str] = []
+    tool_calls = 0
+    x = y = 0.0
+    for _ in range(moves):
+        r = rng.random()
+        if r < tool_p:
+            tool_calls += 1
+            out.append(f"TOOL CALL {rng.randint(1, 60)} Z S{rng.randint(1000, 20000)}")
+            out.append("L Z+100 R0 FMAX")
+        elif r < 0.08:
+            out.append(f"L Z{rng.uniform(-5, 50):+.3f} R0 FMAX")
+        elif r < 0.75:
+            x, y = rng.uniform(-80, 80), rng.uniform(-60, 60)
+            out.append(f"L X{x:+.3f} Y{y:+.3f} Z{rng.uniform(-20, 0):+.3f} F{feed}")
+        elif r < 0.85:
+            out.append(f"CC X{x + rng.uniform(-5, 5):+.3f} Y{y + rng.uniform(-5, 5):+.3f}")
+            out.append(f"C X{rng.uniform(-80, 80):+.3f} Y{rng.uniform(-60, 60):+.3f} DR{rng.choice('+-')}")
+        elif r < 0.95:
+            out.append(f"CR X{rng.uniform(-80, 80):+.3f} Y{rng.uniform(-60, 60):+.3f} "
+                       f"R{rng.uniform(40, 120):+.3f} DR{rng.choice('+-')}")
+        else:
+            out.append(f"L X{rng.uniform(-80, 80):+.3f} FMAX")
+    return out, tool_calls
+
+
+def make_program(rng: random.Random, name: str, layout: str, size_class: str, tool_density: str) -> Tuple[List[str], int, int]:
+    """
+    프로그램 1개의 줄 목록(줄번호 포함)과 (이동 블록 수, TOOL CALL 수)를 만듭니다.
+    """
+    lo, hi = next(r for n, r, _ in SIZE_CLASSES if n == size_class)
+    moves = rng.randint(lo, hi)
+    tool_p = dict(TOOL_DENSITIES)[tool_density]
+    tool, rpm, feed = rng.randint(1, 60), rng.randint(1000, 20000), rng.choice((300, 800, 1200, 2500))
+
+    body = _header_lines(rng, layout, name, tool, rpm, feed)
+    motion, extra_tools = _motion_lines(rng, moves, tool_p, feed)
+    body += motion
+    body += ["L Z+100 R0 FMAX M5", "M30", f"END PGM {name} MM"]
+    return [f"{i} {line}" for i, line in enumerate(body)], moves, 1 + extra_tools
+
+
+def generate_corpus(root: str, n_files: int, seed: int = 1234, job: str = DEFAULT_JOB) -> List[CorpusFile]:
+    """
+    root/<job>/ 아래에 .h 파일 n_files개를 만들고 메타데이터 목록을 반환합니다.
+    - 같은 (n_files, seed)면 같은 코퍼스가 만들어집니다.
+    """
+    folder = os.path.join(root, job)
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    out: List[CorpusFile] = []
+    for i in range(n_files):
+        layout = rng.choice(LAYOUTS)
+        encoding = "cp949" if layout == "ascii" else rng.choice(ENCODINGS)
+        size_class = _pick_size(rng)
+        tool_density = rng.choice([n for n, _ in TOOL_DENSITIES])
+        name = f"T{i + 1}"
+
+        lines, moves, tool_calls = make_program(rng, name, layout, size_class, tool_density)
+        newline = "\r\n" if rng.random() < 0.3 else "\n"
+        data = (newline.join(lines) + newline).encode(encoding)
+        path = os.path.join(folder, name + ".h")
+        with open(path, "wb") as f:
+            f.write(data)
+        out.append(CorpusFile(name + ".h", encoding, layout, size_class, tool_density, moves, tool_calls, len(data)))
+    return out
+
+
+def summarize(files: List[CorpusFile]) -> Dict[str, object]:
+    """
+    코퍼스 구성 요약(결과 JSON에 함께 기록).
+    """
+    def _count(attr):
+        counts: Dict[str, int] = {}
+        for f in files:
+            key = getattr(f, attr)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    return {
+        "files": len(files),
+        "bytes": sum(f.bytes for f in files),
+        "moves": sum(f.moves for f in files),
+        "tool_calls": sum(f.tool_calls for f in files),
+        "encodings": _count("encoding"),
+        "layouts": _count("layout"),
+        "size_classes": _count("size_class"),
+        "tool_densities": _count("tool_density"),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="합성 .h 코퍼스 생성")
+    ap.add_argument("out_dir")
+    ap.add_argument("--files", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args(argv)
+
+    files = generate_corpus(args.out_dir, args.files, args.seed)
+    info = summarize(files)
+    print(f"✅ {info['files']}개 / {info['bytes'] / 1e6:.1f} MB → {os.path.join(args.out_dir, DEFAULT_JOB)}")
+    print(f"   인코딩 {info['encodings']}")
+    print(f"   레이아웃 {info['layouts']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+# cam_sheet_auto/bulk_export.py
+"""
+여러 작업 폴더의 CAM SHEET 일괄 내보내기.
+
+- 폴더마다: scan_cam_rows → 템플릿 채우기 → <폴더>/CAM_SHEET_<작업번호>_<MMDD>.xlsx 저장
+  (같은 이름이 있으면 -2, -3 ... : excel_utils.get_unique_filename 규칙)
+- 폴더 단위로 프로세스 풀에 나눠 처리합니다. 워커 프로세스마다 템플릿은 1번만 파싱됩니다. (TemplateCache)
+- 폴더 1개의 실패가 다른 폴더를 멈추지 않으며, 결과는 폴더별 성공 여부/소요 시간/오류로 돌려줍니다.
+- 작업번호/설비명/날짜는 UI 'SHEET 추출'과 같은 규칙으로 채웁니다.
+  - 작업번호: 폴더명 자동 검출 (검출 실패면 해당 폴더는 실패 처리)
+  - 설비명/날짜: 인자로 주지 않으면 마지막 행의 equip_name/date
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .cam_core import scan_cam_rows
+from .cancel import CancelToken, check_cancel
+from .excel_utils import auto_export_path, iter_cam_rows_values, save_template_workbook
+from .functions import extract_job_number
+from .scan_cache import ScanCache
+
+
+@dataclass
+class FolderExportResult:
+    """
+    폴더 1개의 내보내기 결과.
+    """
+    folder: str
+    ok: bool
+    save_path: str = ""
+    job_number: str = ""
+    rows: int = 0
+    sheets: int = 0
+    scan_seconds: float = 0.0
+    export_seconds: float = 0.0
+    error: str = ""
+
+
+def export_folder_sheet(
+    folder_path: str,
+    machine_name: Optional[str] = None,
+    date: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    multi_sheet: bool = True,
+) -> FolderExportResult:
+    """
+    폴더 1개를 스캔해 CAM SHEET를 저장합니다. (예외를 올리지 않고 결과에 담습니다)
+    - cache_path: 스캔 캐시 DB 경로 ("" 이면 캐시 미사용, None이면 기본 경로)
+    """
+    result = FolderExportResult(folder=folder_path, ok=False)
+    try:
+        if not os.path.isdir(folder_path):
+            result.error = "폴더가 없습니다."
+            return result
+
+        job_number = extract_job_number(folder_path)
+        result.job_number = job_number
+        if not job_number or job_number == "N/A":
+            result.error = "폴더명에서 작업번호를 검출하지 못했습니다."
+            return result
+
+        t0 = time.perf_counter()
+        cache = None if cache_path == "" else ScanCache(cache_path)
+        try:
+            rows = scan_cam_rows(folder_path, workers=1, cache=cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        result.scan_seconds = time.perf_counter() - t0
+        if not rows:
+            result.error = ".h 파일이 없습니다."
+            return result
+
+        t0 = time.perf_counter()
+        last = rows[-1]
+        save_path = auto_export_path(folder_path, job_number)
+        result.rows, result.sheets = save_template_workbook(
+            save_path,
+            iter_cam_rows_values(rows),
+            job_number,
+            last.equip_name if machine_name is None else machine_name,
+            last.date if date is None else date,
+            multi_sheet=multi_sheet,
+        )
+        result.export_seconds = time.perf_counter() - t0
+        result.save_path = save_path
+        result.ok = True
+    except Exception as e:
+        result.error = f"{e}\n{traceback.format_exc()}"
+    return result
+
+
+def _unique_folders(folders: Sequence[str]) -> List[str]:
+    """
+    같은 폴더가 두 번 들어오면 1번만 처리합니다. (동시 저장 시 파일명 충돌 방지)
+    """
+    seen = set()
+    out = []
+    for f in folders:
+        key = os.path.normcase(os.path.abspath(f))
+        if key not in seen:
+            seen.add(key)
+            out.append(f)
+    return out
+
+
+def bulk_export_sheets(
+    folders: Sequence[str],
+    workers: int = 0,
+    machine_name: Optional[str] = None,
+    date: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    multi_sheet: bool = True,
+    on_result: Optional[Callable[[FolderExportResult], None]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> List[FolderExportResult]:
+    """
+    여러 폴더를 일괄 내보내고 입력 순서대로 결과 목록을 반환합니다.
+    - workers: 프로세스 수 (0 이하면 CPU 개수, 1이면 현재 프로세스에서 순차 처리)
+    - on_result: 폴더 1개가 끝날 때마다(끝난 순서) 호출
+    - cancel(CancelToken)이 취소되면 대기 중인 폴더를 취소하고 ScanCancelled를 발생시킵니다.
+      (이미 저장된 파일은 그대로 남습니다)
+    """
+    folders = _unique_folders(folders)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(folders)))
+    args = (machine_name, date, cache_path, multi_sheet)
+    results: Dict[str, FolderExportResult] = {}
+
+    def _done(res: FolderExportResult) -> None:
+        results[res.folder] = res
+        if on_result is not None:
+            on_result(res)
+
+    if workers == 1:
+        for folder in folders:
+            check_cancel(cancel)
+            _done(export_folder_sheet(folder, *args))
+        return [results[f] for f in folders]
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {pool.submit(export_folder_sheet, folder, *args): folder for folder in folders}
+        while pending:
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            check_cancel(cancel)
+            for fut in done:
+                folder = pending.pop(fut)
+                try:
+                    res = fut.result()
+                except BrokenProcessPool:
+                    # 워커가 비정상 종료된 경우 현재 프로세스에서 다시 처리
+                    res = export_folder_sheet(folder, *args)
+                except Exception as e:
+                    res = FolderExportResult(folder=folder, ok=False, error=str(e))
+                _done(res)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return [results[f] for f in folders]
+
+
+def format_report(results: Sequence[FolderExportResult]) -> List[str]:
+    """
+    콘솔/로그용 요약 줄 목록.
+    """
+    lines = []
+    for r in results:
+        if r.ok:
+            lines.append(
+                f"✅ {r.folder} → {os.path.basename(r.save_path)} "
+                f"({r.rows}행, 시트 {r.sheets}장, 스캔 {r.scan_seconds:.2f}s, 저장 {r.export_seconds:.2f}s)"
+            )
+        else:
+            lines.append(f"❌ {r.folder}: {r.error.splitlines()[0] if r.error else '실패'}")
+    ok = sum(1 for r in results if r.ok)
+    lines.append(f"📦 일괄 내보내기: 성공 {ok} / 실패 {len(results) - ok} / 전체 {len(results)}")
+    return lines
@@ -1,12 +1,33 @@
 # cam_core.py
 from __future__ import annotations
 
+import fnmatch
+import mmap
 import os
+import queue
 import re
-from typing import List
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
 
 from .cam_models import CamRow
-from .functions import extract_tool_data
+from .functions import PARSER_VERSION, extract_tool_data
+from .nc_analyzer import analyze_nc_program, stats_to_fields
+from .cycle_time import numpy_available, rapid_rate_for
+from .encoding_utils import FAST_PATHS, add_detect_stats, get_detect_stats
+from .scan_cache import ScanCache, normalize_path
+from .cancel import CancelToken, ScanCancelled, check_cancel
+
+# workers <= 0(자동)일 때: 이보다 파일이 적으면 프로세스 풀 없이 현재 스레드에서 처리합니다.
+# (프로세스 생성 비용이 수십 개 파일의 헤더 스캔보다 큼)
+AUTO_PARALLEL_MIN_FILES = 64
+# workers <= 0(자동)일 때 프로세스 수 상한
+AUTO_MAX_WORKERS = 8
 
 
 def natural_sort_key(text: str):
@@ -17,54 +38,895 @@ def natural_sort_key(text: str):
     return [int(c) if c.isdigit() else c for c in re.split(r"(\d+)", text)]
 
 
-def scan_cam_rows(folder_path: str) -> List[CamRow]:
+def _list_h_files(folder_path: str) -> List[str]:
     """
-    폴더 내 .h 파일을 스캔하여 CamRow 리스트로 반환합니다.
-    - UI/출력/DB에서 공용으로 사용하기 위한 서비스 함수입니다.
+    폴더 내 .h 파일명 목록을 반환합니다.
     """
-    if not os.path.isdir(folder_path):
-        return []
+    return [f for f in os.listdir(folder_path) if f.lower().endswith(".h")]
 
-    rows: List[CamRow] = []
-    for file_name in os.listdir(folder_path):
-        if not file_name.lower().endswith(".h"):
-            continue
 
+def _build_cam_row(file_name: str, result: tuple) -> CamRow:
+    """
+    _analyze_file 반환 튜플을 CamRow로 변환합니다.
+    """
+    tool_db, tool_no, allowance, pg_name, equip_name, job_number, date, coolant, detected_encoding, program = result
+    return CamRow(
+        file_name=file_name,
+        tool_db=tool_db,
+        tool_no=tool_no,
+        allowance_xy=allowance,
+        pg_name=pg_name,
+        coolant=coolant,
+        equip_name=equip_name,
+        job_number=job_number,
+        date=date,
+        detected_encoding=detected_encoding,
+        **program,
+    )
+
+
+def _failed_result() -> tuple:
+    """
+    파일 분석이 실패했을 때 사용할 기본 결과(extract_tool_data 예외 처리와 동일한 형태)입니다.
+    """
+    return (
+        "N/A", "N/A", "N/A", "N/A",
+        "N/A", "N/A", datetime.now().strftime("%m-%d"),
+        "OFF", "utf-8", {}
+    )
+
+
+# =========================
+# 캐시 버전(파서 버전 + 분석 수준)
+# =========================
+
+# 캐시 parser_version 값 = PARSER_VERSION * 10 + 분석 수준
+CACHE_LEVEL_HEADER = 0            # 헤더만
+CACHE_LEVEL_ANALYZED = 1          # 헤더 + 프로그램 전체 분석(가공 시간/행정 범위)
+CACHE_LEVEL_ANALYZED_NO_NUMPY = 2  # 전체 분석했지만 NumPy가 없어 가공 시간/행정 범위가 빠진 행
+
+
+def _cache_level(analyze: bool) -> int:
+    if not analyze:
+        return CACHE_LEVEL_HEADER
+    return CACHE_LEVEL_ANALYZED if numpy_available() else CACHE_LEVEL_ANALYZED_NO_NUMPY
+
+
+def cache_version(analyze: bool) -> int:
+    """
+    이 실행 방식(+ NumPy 설치 여부)으로 분석한 행을 캐시에 저장할 때 쓰는 버전 값.
+    """
+    return PARSER_VERSION * 10 + _cache_level(analyze)
+
+
+def _usable_cache_versions(analyze: bool) -> Tuple[int, ...]:
+    """
+    캐시 적중으로 인정하는 버전 값 목록.
+    - 헤더만 필요하면 전체 분석된 행도 그대로 씁니다. (헤더 필드는 같음)
+    - 전체 분석이 필요하면 헤더만 분석된 행은 다시 분석합니다.
+    - NumPy 없이 분석된 행은 NumPy가 있는 환경에서 다시 분석합니다. (반대 방향은 그대로 사용)
+    """
+    base = PARSER_VERSION * 10
+    if not analyze:
+        levels = (CACHE_LEVEL_HEADER, CACHE_LEVEL_ANALYZED, CACHE_LEVEL_ANALYZED_NO_NUMPY)
+    elif numpy_available():
+        levels = (CACHE_LEVEL_ANALYZED,)
+    else:
+        levels = (CACHE_LEVEL_ANALYZED_NO_NUMPY, CACHE_LEVEL_ANALYZED)
+    return tuple(base + level for level in levels)
+
+
+def _analyze_file(
+    file_path: str,
+    folder_path: str,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> tuple:
+    """
+    파일 1개 분석: 헤더(extract_tool_data) + (analyze=True면) 프로그램 전체 스트리밍 분석(nc_analyzer).
+
+    반환: extract_tool_data 반환 튜플 + (CamRow 확장 필드 dict,)
+    - analyze=False면 확장 필드(가공 시간/행정 범위 등)는 비워 둡니다. (헤더만 읽음)
+    - 전체 분석이 실패해도 헤더 결과는 살리고 확장 필드만 비웁니다.
+    """
+    header = extract_tool_data(file_path, folder_path, cancel)
+    if not analyze:
+        return header + ({},)
+    try:
+        # header[4] = 설비명 → 급송 시간 환산 속도
+        program = stats_to_fields(analyze_nc_program(file_path, cancel), rapid_rate_for(header[4]))
+    except ScanCancelled:
+        raise
+    except Exception as e:
+        print(f"⚠ 프로그램 전체 분석 실패({os.path.basename(file_path)}): {e}")
+        program = {}
+    return header + (program,)
+
+
+def _worker_init(log_to_stderr: bool) -> None:
+    """
+    프로세스 풀 워커 초기화: 부모가 stdout을 stderr로 돌려 둔 경우 워커 로그도 stderr로 보냅니다.
+    """
+    if log_to_stderr:
+        sys.stdout = sys.stderr
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    스캔용 프로세스 풀을 만듭니다.
+    - spawn 방식(Windows) 워커는 부모의 redirect_stdout을 물려받지 않으므로,
+      CLI가 결과를 stdout으로 내보내는 중이면(stdout → stderr) 워커에도 같은 설정을 넘깁니다.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_worker_init, initargs=(sys.stdout is sys.stderr,)
+    )
+
+
+def _extract_one(file_path: str, folder_path: str, analyze: bool = False) -> Tuple[tuple, Dict[str, int]]:
+    """
+    프로세스 풀 작업 단위입니다. (pickle 가능하도록 모듈 최상위 함수로 둡니다)
+    - 워커 프로세스의 인코딩 감지 통계 증가분을 함께 반환합니다.
+    """
+    before = get_detect_stats()
+    result = _analyze_file(file_path, folder_path, analyze=analyze)
+    after = get_detect_stats()
+    return result, {k: after[k] - before[k] for k in after}
+
+
+def _iter_parallel(
+    folder_path: str,
+    file_names: List[str],
+    workers: int,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Iterator[CamRow]:
+    """
+    _analyze_file을 프로세스 풀로 분산 실행하고, 끝나는 순서대로 CamRow를 내보냅니다.
+    - 파일 1개의 예외/워커 비정상 종료가 전체 배치를 멈추지 않도록 파일 단위로 격리합니다.
+    - 풀이 깨진 경우(BrokenProcessPool) 남은 파일은 현재 프로세스에서 순차 처리합니다.
+    - 소비 측이 중간에 멈추거나(generator close) 취소되면 대기 중인 작업은 취소합니다.
+    """
+    retry: List[str] = []
+
+    pool = _new_pool(workers)
+    try:
+        futures = {
+            pool.submit(_extract_one, os.path.join(folder_path, name), folder_path, analyze): name
+            for name in file_names
+        }
+        pending = set(futures)
+        while pending:
+            # 취소 확인을 위해 짧은 주기로 깨어납니다.
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            check_cancel(cancel)
+            for fut in done:
+                name = futures[fut]
+                try:
+                    result, delta = fut.result()
+                    add_detect_stats(delta)
+                except BrokenProcessPool:
+                    retry.append(name)
+                    continue
+                except Exception as e:
+                    print(f"❌ 파일 처리 오류 ({name}): {e}")
+                    result = _failed_result()
+                yield _build_cam_row(name, result)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    for name in retry:
+        try:
+            result = _analyze_file(os.path.join(folder_path, name), folder_path, cancel, analyze)
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            print(f"❌ 파일 처리 오류 ({name}): {e}")
+            result = _failed_result()
+        yield _build_cam_row(name, result)
+
+
+def _auto_workers(n_files: int) -> int:
+    """
+    workers <= 0(자동)일 때 폴더 스캔 프로세스 수를 정합니다.
+    - AUTO_PARALLEL_MIN_FILES개 미만이면 1(현재 스레드), 그 이상이면 CPU 개수(최대 AUTO_MAX_WORKERS)
+    """
+    if n_files < AUTO_PARALLEL_MIN_FILES:
+        return 1
+    return max(1, min(os.cpu_count() or 1, AUTO_MAX_WORKERS))
+
+
+def _iter_parse_files(
+    folder_path: str,
+    file_names: List[str],
+    workers: int,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Iterator[CamRow]:
+    """
+    파일 목록을 분석하여 CamRow를 하나씩 내보냅니다. (정렬 전, 완료 순서)
+    """
+    if workers <= 0:
+        workers = _auto_workers(len(file_names))
+    workers = min(workers, len(file_names))
+
+    if workers > 1:
+        yield from _iter_parallel(folder_path, file_names, workers, cancel, analyze)
+        return
+
+    for file_name in file_names:
         file_path = os.path.join(folder_path, file_name)
+        yield _build_cam_row(file_name, _analyze_file(file_path, folder_path, cancel, analyze))
 
-        tool_db, tool_no, allowance, pg_name, equip_name, job_number, date, coolant, detected_encoding = extract_tool_data(
-            file_path, folder_path
-        )
 
-        rows.append(
-            CamRow(
-                file_name=file_name,
-                tool_db=tool_db,
-                tool_no=tool_no,
-                allowance_xy=allowance,
-                pg_name=pg_name,
-                coolant=coolant,
-                equip_name=equip_name,
-                job_number=job_number,
-                date=date,
-                detected_encoding=detected_encoding,
-            )
+def _parse_files(folder_path: str, file_names: List[str], workers: int, analyze: bool = False) -> List[CamRow]:
+    """
+    파일 목록을 분석하여 CamRow 리스트로 반환합니다. (정렬 전)
+    """
+    return list(_iter_parse_files(folder_path, file_names, workers, analyze=analyze))
+
+
+def _stat_h_files(folder_path: str) -> Dict[str, Tuple[int, int]]:
+    """
+    폴더 내 .h 파일의 {파일명: (size, mtime_ns)}를 반환합니다.
+    - os.scandir 항목의 stat을 사용합니다. (Windows에서는 추가 I/O 없음)
+    - stat 실패 파일은 (-1, -1)로 두어 항상 재분석되게 합니다.
+    """
+    out: Dict[str, Tuple[int, int]] = {}
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if not entry.name.lower().endswith(".h"):
+                continue
+            try:
+                st = entry.stat()
+                out[entry.name] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                out[entry.name] = (-1, -1)
+    return out
+
+
+def _iter_with_cache(
+    folder_path: str,
+    workers: int,
+    cache: ScanCache,
+    on_total: Optional[Callable[[int], None]],
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Iterator[CamRow]:
+    """
+    캐시와 비교하여 새로 생겼거나 변경된 파일만 분석합니다.
+    - 캐시 적중 행을 먼저 내보내고, 이후 분석이 끝나는 순서대로 내보냅니다.
+    - 중간에 멈춰도 그때까지 분석한 결과는 캐시에 저장합니다.
+    - analyze=True인데 헤더만 분석된 캐시 행은 적중으로 보지 않습니다. (_usable_cache_versions)
+    """
+    stats = _stat_h_files(folder_path)
+    if on_total is not None:
+        on_total(len(stats))
+
+    cached = cache.load_folder(folder_path)
+    today = datetime.now().strftime("%m-%d")
+
+    hits: List[CamRow] = []
+    todo: List[str] = []
+    keys = {name: normalize_path(os.path.join(folder_path, name)) for name in stats}
+    usable = _usable_cache_versions(analyze)
+    version = cache_version(analyze)
+
+    for name, (size, mtime_ns) in stats.items():
+        hit = cached.get(keys[name])
+        if hit and size >= 0 and hit[0] == size and hit[1] == mtime_ns and hit[2] in usable:
+            hits.append(CamRow(file_name=name, date=today, **hit[3]))
+        else:
+            todo.append(name)
+
+    yield from hits
+
+    fresh: List[CamRow] = []
+    try:
+        for row in (_iter_parse_files(folder_path, todo, workers, cancel, analyze) if todo else ()):
+            fresh.append(row)
+            yield row
+    finally:
+        cache.store_folder(
+            folder_path,
+            (
+                (keys[r.file_name], *stats[r.file_name], version, r)
+                for r in fresh
+                if stats[r.file_name][0] >= 0
+            ),
+            keys.values(),
         )
 
+
+def iter_cam_rows(
+    folder_path: str,
+    workers: int = 1,
+    cache: Optional[ScanCache] = None,
+    on_total: Optional[Callable[[int], None]] = None,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Iterator[CamRow]:
+    """
+    폴더 내 .h 파일을 스캔하며 CamRow를 분석이 끝나는 즉시 하나씩 내보냅니다. (스트리밍)
+    - 순서는 정렬되지 않은 완료 순서입니다. 정렬된 목록은 scan_cam_rows를 사용합니다.
+    - on_total(n): 첫 행을 내보내기 전에 전체 파일 수를 1회 알려줍니다.
+    - workers/cache/cancel/analyze 의미는 scan_cam_rows와 같습니다.
+    """
+    if not os.path.isdir(folder_path):
+        if on_total is not None:
+            on_total(0)
+        return
+
+    stats_before = get_detect_stats()
+    try:
+        if cache is not None:
+            yield from _iter_with_cache(folder_path, workers, cache, on_total, cancel, analyze)
+        else:
+            file_names = _list_h_files(folder_path)
+            if on_total is not None:
+                on_total(len(file_names))
+            yield from _iter_parse_files(folder_path, file_names, workers, cancel, analyze)
+    finally:
+        stats_after = get_detect_stats()
+        fast = sum(stats_after[k] - stats_before[k] for k in FAST_PATHS)
+        slow = stats_after["chardet"] - stats_before["chardet"]
+        if fast or slow:
+            print(f"🔎 인코딩 감지: 빠른 경로 {fast}개 / chardet {slow}개")
+
+
+def scan_cam_rows(
+    folder_path: str,
+    workers: int = 1,
+    cache: Optional[ScanCache] = None,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> List[CamRow]:
+    """
+    폴더 내 .h 파일을 스캔하여 CamRow 리스트로 반환합니다.
+    - UI/출력/DB에서 공용으로 사용하기 위한 서비스 함수입니다.
+    - workers > 1 이면 프로세스 풀로 병렬 스캔합니다.
+      (0 이하면 자동: 파일이 AUTO_PARALLEL_MIN_FILES개 미만이면 순차, 아니면 CPU 개수(최대 AUTO_MAX_WORKERS))
+    - cache를 주면 경로/크기/수정시각/파서 버전이 같은 파일은 다시 읽지 않습니다.
+    - cancel(CancelToken)이 취소되면 파일 경계에서 ScanCancelled를 발생시킵니다.
+    - analyze=True면 프로그램 전체(가공 시간/행정 범위)까지 분석합니다. 기본은 헤더만 읽습니다.
+      (전체 분석은 파일 전체를 읽으므로 큰 프로그램이 많은 폴더에서는 훨씬 느립니다)
+    - 결과는 실행 방식과 무관하게 파일명 자연 정렬 순서입니다.
+    """
+    rows = list(iter_cam_rows(folder_path, workers=workers, cache=cache, cancel=cancel, analyze=analyze))
     rows.sort(key=lambda r: natural_sort_key(r.file_name))
     return rows
 
-# cam_core.py (하단에 추가)
+# =========================
+# 변경분 스캔(폴더 감시용)
+# =========================
+
+def snapshot_h_files(folder_path: str) -> Dict[str, Tuple[int, int]]:
+    """
+    폴더 내 .h 파일의 {파일명: (size, mtime_ns)} 스냅샷을 반환합니다. (폴더가 없으면 빈 dict)
+    """
+    if not os.path.isdir(folder_path):
+        return {}
+    try:
+        return _stat_h_files(folder_path)
+    except OSError:
+        return {}
+
+
+def scan_cam_changes(
+    folder_path: str,
+    previous: Dict[str, Tuple[int, int]],
+    cache: Optional[ScanCache] = None,
+    analyze: bool = False,
+) -> Tuple[Dict[str, Tuple[int, int]], List[CamRow], List[CamRow], List[str]]:
+    """
+    이전 스냅샷과 비교하여 추가/수정된 파일만 다시 분석합니다. (analyze 의미는 scan_cam_rows와 같음)
+
+    반환:
+        (현재 스냅샷, 추가된 행, 수정된 행, 삭제된 파일명)
+        - 행 목록은 파일명 자연 정렬 순서입니다.
+    """
+    current = snapshot_h_files(folder_path)
+
+    added = [n for n in current if n not in previous]
+    modified = [n for n in current if n in previous and current[n] != previous[n]]
+    removed = sorted((n for n in previous if n not in current), key=natural_sort_key)
+
+    parsed = {r.file_name: r for r in _parse_files(folder_path, added + modified, 1, analyze)} if (added or modified) else {}
+
+    if cache is not None and (parsed or removed):
+        keys = {n: normalize_path(os.path.join(folder_path, n)) for n in current}
+        cache.store_folder(
+            folder_path,
+            ((keys[n], *current[n], cache_version(analyze), r) for n, r in parsed.items() if current[n][0] >= 0),
+            keys.values(),
+        )
+
+    added_rows = sorted((parsed[n] for n in added), key=lambda r: natural_sort_key(r.file_name))
+    updated_rows = sorted((parsed[n] for n in modified), key=lambda r: natural_sort_key(r.file_name))
+    return current, added_rows, updated_rows, removed
 
-import re
-from typing import Tuple
 
-from .encoding_utils import read_file_with_encoding
+# =========================
+# 재귀 트리 스캔(연도/고객사/작업 폴더 구조)
+# =========================
+
+def iter_cam_folders(
+    root_path: str,
+    max_depth: Optional[int] = None,
+    pattern: str = "*.h",
+) -> Iterator[Tuple[str, List[str]]]:
+    """
+    root_path 아래를 os.scandir로 재귀 탐색하여 (폴더 경로, 매칭 파일명 목록)을 생성합니다.
+    - max_depth: root=0 기준 하위 폴더 깊이 제한 (None이면 무제한)
+    - pattern: 파일명 glob 패턴 (대소문자 무시)
+    - 심볼릭 링크 폴더는 따라가지 않습니다. (순환 방지)
+    - 읽을 수 없는 폴더는 건너뜁니다.
+    """
+    pat = pattern.lower()
+    stack = [(root_path, 0)]
+    while stack:
+        folder, depth = stack.pop()
+        names: List[str] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if max_depth is None or depth < max_depth:
+                                subdirs.append(entry.path)
+                        elif fnmatch.fnmatchcase(entry.name.lower(), pat):
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"⚠ 폴더를 읽을 수 없음: {folder} ({e})")
+            continue
+
+        if names:
+            yield folder, names
+        stack.extend((d, depth + 1) for d in subdirs)
+
+
+def _extract_batch(
+    folder_path: str,
+    file_names: List[str],
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Tuple[List[tuple], Dict[str, int]]:
+    """
+    트리 스캔용 프로세스 풀 작업 단위(같은 폴더의 파일 묶음)입니다.
+    - 파일 단위로 예외를 격리하여 묶음 전체가 실패하지 않게 합니다.
+    - cancel은 현재 프로세스에서 실행할 때만 사용합니다. (토큰은 프로세스 간 전달 불가)
+    """
+    before = get_detect_stats()
+    results = []
+    for name in file_names:
+        try:
+            results.append(_analyze_file(os.path.join(folder_path, name), folder_path, cancel, analyze))
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            print(f"❌ 파일 처리 오류 ({name}): {e}")
+            results.append(_failed_result())
+    after = get_detect_stats()
+    return results, {k: after[k] - before[k] for k in after}
+
+
+def scan_cam_tree(
+    root_path: str,
+    max_depth: Optional[int] = None,
+    pattern: str = "*.h",
+    workers: int = 0,
+    batch_size: int = 32,
+    queue_size: int = 256,
+    cancel: Optional[CancelToken] = None,
+    analyze: bool = False,
+) -> Dict[str, List[CamRow]]:
+    """
+    여러 작업 폴더가 있는 트리를 재귀 스캔하여 {작업 폴더 경로: CamRow 리스트}로 반환합니다.
+
+    - 탐색 스레드(생산자)가 폴더를 걷는 동안, 파싱은 프로세스 풀(소비자)이 동시에 진행합니다.
+    - 생산자→소비자 큐는 queue_size로 제한되고, 풀에 넣은 작업도 workers*2개로 제한하여
+      5만 개 파일 트리에서도 메모리가 대기열 크기 이상 늘지 않습니다.
+    - workers: 파싱 프로세스 수 (0 이하면 CPU 개수, 1이면 현재 프로세스에서 처리)
+    - cancel(CancelToken)이 취소되면 탐색/대기 작업을 정리하고 ScanCancelled를 발생시킵니다.
+    - analyze=True면 프로그램 전체까지 분석합니다. (기본은 헤더만, scan_cam_rows와 같음)
+    - 폴더 순서/폴더 내 행 순서는 자연 정렬입니다.
+    """
+    if not os.path.isdir(root_path):
+        return {}
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    work: "queue.Queue[Optional[Tuple[str, List[str]]]]" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+
+    def _produce():
+        try:
+            for folder, names in iter_cam_folders(root_path, max_depth, pattern):
+                for i in range(0, len(names), batch_size):
+                    if stop.is_set() or (cancel is not None and cancel.cancelled):
+                        return
+                    work.put((folder, names[i:i + batch_size]))
+        finally:
+            work.put(None)
+
+    producer = threading.Thread(target=_produce, name="cam-tree-walk", daemon=True)
+    producer.start()
+
+    grouped: Dict[str, List[CamRow]] = {}
+
+    def _collect(folder: str, names: List[str], results: List[tuple]):
+        rows = grouped.setdefault(folder, [])
+        rows.extend(_build_cam_row(n, r) for n, r in zip(names, results))
+
+    def _run_local(folder: str, names: List[str]):
+        results, _ = _extract_batch(folder, names, cancel, analyze)
+        _collect(folder, names, results)
+
+    finished = False
+    try:
+        if workers == 1:
+            while True:
+                item = work.get()
+                if item is None:
+                    finished = True
+                    break
+                check_cancel(cancel)
+                _run_local(*item)
+        else:
+            pool_broken = False
+            pool = _new_pool(workers)
+            pending: Dict[Future, Tuple[str, List[str]]] = {}
+
+            def _drain(done):
+                nonlocal pool_broken
+                for fut in done:
+                    folder, names = pending.pop(fut)
+                    try:
+                        results, delta = fut.result()
+                        add_detect_stats(delta)
+                        _collect(folder, names, results)
+                    except BrokenProcessPool:
+                        pool_broken = True
+                        _run_local(folder, names)
+                    except Exception as e:
+                        print(f"❌ 폴더 처리 오류 ({folder}): {e}")
+                        _collect(folder, names, [_failed_result() for _ in names])
+
+            try:
+                while True:
+                    item = work.get()
+                    if item is None:
+                        finished = True
+                        break
+                    check_cancel(cancel)
+                    if pool_broken:
+                        _run_local(*item)
+                        continue
+                    while len(pending) >= workers * 2:
+                        done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                        check_cancel(cancel)
+                        _drain(done)
+                    try:
+                        pending[pool.submit(_extract_batch, *item, None, analyze)] = item
+                    except BrokenProcessPool:
+                        pool_broken = True
+                        _run_local(*item)
+
+                while pending:
+                    done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    check_cancel(cancel)
+                    _drain(done)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        # 중간 종료 시 생산자가 put에서 막히지 않도록 큐를 비워 종료 신호(None)까지 받습니다.
+        stop.set()
+        if not finished:
+            while work.get() is not None:
+                pass
+
+    producer.join()
+    # 생산자가 취소를 먼저 보고 멈춘 경우(빈 결과)도 취소로 알립니다.
+    check_cancel(cancel)
+
+    for rows in grouped.values():
+        rows.sort(key=lambda r: natural_sort_key(r.file_name))
+    return {folder: grouped[folder] for folder in sorted(grouped, key=natural_sort_key)}
+
+
+# =========================
+# TOOL CALL 번호 수정
+# =========================
+
+# 'TOOL CALL <번호> Z' 의 <번호> (줄마다 첫 번째 구문만, 줄바꿈은 넘지 않음)
+# - 바이트 단위로 찾으므로 원본 인코딩/나머지 바이트를 그대로 보존합니다.
+#   (cp949/utf-8 등 ASCII 호환 인코딩 전제)
+_TOOL_CALL_BYTES_RE = re.compile(
+    rb"^([^\n]*?TOOL CALL[ \t\r\f\v]+)(\d+)(?=[ \t\r\f\v]+Z)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# 이 크기 이상이면 파일 전체를 읽지 않고 mmap으로 변경 위치만 찾아 수정합니다.
+MMAP_PATCH_MIN_BYTES = 8 * 1024 * 1024
+# 스트리밍 복사 시 한 번에 옮기는 크기(메모리 사용량 상한)
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+# (시작 오프셋, 끝 오프셋, 기존 번호 bytes)
+Span = Tuple[int, int, bytes]
+
+
+def patch_tool_call_bytes(data: bytes, new_tool_number: str) -> Tuple[bytes, int]:
+    """
+    파일 내용(bytes)에서 TOOL CALL 번호를 new_tool_number로 바꾼 결과와 변경 건수를 반환합니다.
+    - 이미 같은 번호인 구문은 변경 건수에 넣지 않습니다.
+    """
+    new_no = new_tool_number.encode("ascii")
+    changed = 0
+
+    def _sub(m):
+        nonlocal changed
+        if m.group(2) == new_no:
+            return m.group(0)
+        changed += 1
+        return m.group(1) + new_no
+
+    return _TOOL_CALL_BYTES_RE.sub(_sub, data), changed
+
+
+def find_tool_call_spans(buf, new_tool_number: str) -> List[Span]:
+    """
+    buf(bytes/mmap)에서 바꿔야 할 TOOL CALL 번호 위치 목록을 반환합니다.
+    - 줄 경계로 자른 청크마다 upper() + 'TOOL CALL' 부분문자열 검색으로 후보 줄만 찾고,
+      그 줄에만 정규식을 적용합니다. (mmap이면 메모리는 청크 크기만 사용)
+    """
+    new_no = new_tool_number.encode("ascii")
+    spans: List[Span] = []
+    total = len(buf)
+    pos = 0
+    while pos < total:
+        end = min(total, pos + _COPY_CHUNK_BYTES)
+        if end < total:
+            nl = buf.find(b"\n", end)
+            end = total if nl < 0 else nl + 1
+        block = buf[pos:end]
+        upper = block.upper()
+
+        i = upper.find(b"TOOL CALL")
+        while i >= 0:
+            line_start = block.rfind(b"\n", 0, i) + 1
+            line_end = block.find(b"\n", i)
+            if line_end < 0:
+                line_end = len(block)
+            m = _TOOL_CALL_BYTES_RE.match(block, line_start, line_end)
+            if m and m.group(2) != new_no:
+                start, stop = m.span(2)
+                spans.append((pos + start, pos + stop, m.group(2)))
+            i = upper.find(b"TOOL CALL", line_end)
+        pos = end
+    return spans
+
+
+def _write_spans_in_place(file_path: str, spans: List[Span], new_digits: Dict[int, bytes]) -> None:
+    """
+    자리수가 같은 번호를 파일 안에서 직접 덮어씁니다.
+    - 기존 값이 예상과 다르면(그 사이 파일이 바뀜) 아무것도 쓰지 않고 예외를 냅니다.
+    """
+    with open(file_path, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        for start, end, old in spans:
+            if mm[start:end] != old:
+                raise RuntimeError(f"파일이 변경되어 수정할 수 없습니다: {file_path}")
+        for start, end, _ in spans:
+            mm[start:end] = new_digits[start]
+        mm.flush()
+
+
+def _stream_patched_copy(mm, out, spans: List[Span], new_no: bytes) -> None:
+    """
+    변경 구간만 새 번호로 바꾸면서 mmap 내용을 out으로 청크 단위 복사합니다.
+    """
+    pos = 0
+    for start, end, _ in spans + [(len(mm), len(mm), b"")]:
+        while pos < start:
+            step = min(start, pos + _COPY_CHUNK_BYTES)
+            out.write(mm[pos:step])
+            pos = step
+        if end > start:
+            out.write(new_no)
+            pos = end
+
+
+class _RenumberPlan:
+    """
+    파일 1개의 변경 계획.
+    - kind="replace": tmp_path(수정본)를 원본과 원자적으로 교체
+    - kind="inplace": spans 위치에 new_no를 직접 덮어씀(자리수 동일, 대용량 전용)
+    """
+
+    def __init__(self, kind: str, tmp_path: Optional[str] = None,
+                 spans: Optional[List[Span]] = None, new_no: bytes = b""):
+        self.kind = kind
+        self.tmp_path = tmp_path
+        self.spans = spans or []
+        self.new_no = new_no
+
+
+def _write_temp_beside(file_path: str, write: Callable) -> str:
+    """
+    원본과 같은 폴더에 임시 파일을 만들고 write(f)로 내용을 채운 뒤 경로를 반환합니다.
+    """
+    folder, name = os.path.split(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(file_path, tmp_path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return tmp_path
+
+
+def _stage_renumber(file_path: str, new_tool_number: str) -> Tuple[Optional[_RenumberPlan], str]:
+    """
+    1단계(병렬): 파일 1개의 변경 계획을 만듭니다. 원본은 건드리지 않습니다.
+    - 일반 파일: 전체를 읽어 수정본 임시 파일을 작성
+    - 대용량(MMAP_PATCH_MIN_BYTES 이상): mmap으로 변경 위치만 찾고,
+      자리수가 같으면 덮어쓰기 계획만, 다르면 청크 단위로 수정본 임시 파일을 작성
+
+    반환: (변경 계획 또는 None(변경 불필요), 메시지)
+    """
+    new_no = new_tool_number.encode("ascii")
+
+    if os.path.getsize(file_path) < MMAP_PATCH_MIN_BYTES:
+        with open(file_path, "rb") as f:
+            data = f.read()
+        new_data, changed = patch_tool_call_bytes(data, new_tool_number)
+        if not changed:
+            return None, "변경할 TOOL CALL이 없거나 이미 동일 번호입니다."
+        tmp_path = _write_temp_beside(file_path, lambda out: out.write(new_data))
+        return _RenumberPlan("replace", tmp_path=tmp_path), f"TOOL CALL 수정 완료: {new_tool_number} ({changed}곳)"
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        spans = find_tool_call_spans(mm, new_tool_number)
+        if not spans:
+            return None, "변경할 TOOL CALL이 없거나 이미 동일 번호입니다."
+
+        done = f"TOOL CALL 수정 완료: {new_tool_number} ({len(spans)}곳)"
+        if all(end - start == len(new_no) for start, end, _ in spans):
+            return _RenumberPlan("inplace", spans=spans, new_no=new_no), done + " [in-place]"
+
+        tmp_path = _write_temp_beside(file_path, lambda out: _stream_patched_copy(mm, out, spans, new_no))
+        return _RenumberPlan("replace", tmp_path=tmp_path), done + " [stream]"
+
+
+def _remove_quietly(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _backup_path(file_path: str) -> str:
+    """
+    커밋 전 원본 백업 경로(같은 폴더)를 만들고, 원본을 그 경로에 보존합니다.
+    - 하드링크를 우선 사용하고(복사 없음), 지원하지 않는 파일시스템이면 복사합니다.
+    """
+    folder, name = os.path.split(os.path.abspath(file_path))
+    fd, bak = tempfile.mkstemp(prefix=f".{name}.", suffix=".bak", dir=folder)
+    os.close(fd)
+    os.remove(bak)
+    try:
+        os.link(file_path, bak)
+    except OSError:
+        shutil.copy2(file_path, bak)
+    return bak
+
+
+def _commit_plan(path: str, plan: _RenumberPlan) -> Callable[[], None]:
+    """
+    변경 계획 1개를 적용하고, 되돌리기 함수를 반환합니다.
+    """
+    if plan.kind == "inplace":
+        _write_spans_in_place(path, plan.spans, {start: plan.new_no for start, _, _ in plan.spans})
+        undo_spans = [(start, end, plan.new_no) for start, end, _ in plan.spans]
+        old_digits = {start: old for start, _, old in plan.spans}
+        return lambda: _write_spans_in_place(path, undo_spans, old_digits)
+
+    bak = _backup_path(path)
+    try:
+        os.replace(plan.tmp_path, path)
+    except BaseException:
+        _remove_quietly(bak)
+        raise
+    plan.tmp_path = bak  # 정리 단계에서 백업 삭제
+    return lambda: os.replace(bak, path)
+
+
+def renumber_tool_calls(changes: Mapping[str, str], workers: int = 8) -> Tuple[bool, Dict[str, str]]:
+    """
+    여러 .h 파일의 TOOL CALL 번호를 한 번에(전부 성공 또는 전부 원복) 변경합니다.
+
+    changes: {파일 경로: 새 공구번호(숫자 문자열)}
+
+    처리 순서:
+      1) 병렬로 각 파일의 변경 계획 작성 (원본 변경 없음)
+         - 수정본은 같은 폴더의 임시 파일로 작성, 대용량 파일은 mmap으로 변경 위치만 수집
+         - 하나라도 실패하면 임시 파일을 모두 지우고 종료
+      2) 적용
+         - 임시 파일: 원본을 백업(하드링크/복사)한 뒤 os.replace로 원자적 교체
+         - 자리수가 같은 대용량 파일: 번호 위치만 직접 덮어쓰기
+         - 적용 중 하나라도 실패하면 이미 적용한 파일을 모두 되돌림
+      3) 전부 성공하면 백업 삭제
+
+    반환:
+        (ok, {파일 경로: 메시지})
+    """
+    messages: Dict[str, str] = {}
+
+    bad = [p for p, no in changes.items() if not str(no).isdigit()]
+    if bad:
+        for p in bad:
+            messages[p] = "new_tool_number가 숫자가 아닙니다."
+        return False, messages
+
+    # ----- 1) 준비(병렬) -----
+    staged: Dict[str, _RenumberPlan] = {}
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(changes)))) as pool:
+        futures = {pool.submit(_stage_renumber, p, str(no)): p for p, no in changes.items()}
+        for fut, path in futures.items():
+            try:
+                plan, msg = fut.result()
+                messages[path] = msg
+                if plan:
+                    staged[path] = plan
+            except Exception as e:
+                failed = True
+                messages[path] = f"TOOL CALL 수정 실패: {e}"
+
+    if failed:
+        for plan in staged.values():
+            _remove_quietly(plan.tmp_path)
+        for path in staged:
+            messages[path] = "다른 파일 실패로 취소되었습니다."
+        return False, messages
+
+    # ----- 2) 적용 -----
+    committed: List[Tuple[str, Callable[[], None]]] = []  # (원본 경로, 되돌리기)
+    for path, plan in staged.items():
+        try:
+            committed.append((path, _commit_plan(path, plan)))
+        except Exception as e:
+            messages[path] = f"TOOL CALL 수정 실패: {e}"
+            for done_path, undo in reversed(committed):
+                try:
+                    undo()
+                    messages[done_path] = "다른 파일 실패로 원복되었습니다."
+                except Exception as re_err:
+                    bak = staged[done_path].tmp_path if staged[done_path].kind == "replace" else None
+                    messages[done_path] = f"원복 실패(백업: {bak}): {re_err}" if bak else f"원복 실패: {re_err}"
+            for p in staged:
+                if p not in dict(committed):
+                    _remove_quietly(staged[p].tmp_path)
+            return False, messages
+
+    # ----- 3) 정리 -----
+    for plan in staged.values():
+        _remove_quietly(plan.tmp_path)
+    return True, messages
 
 
 def update_tool_call_in_file(file_path: str, new_tool_number: str) -> Tuple[bool, str]:
     """
     .h 파일 내 'TOOL CALL <번호> Z...' 구문에서 <번호>만 new_tool_number로 교체합니다.
+    - renumber_tool_calls(1건)를 사용하므로 원본 바이트를 보존하고 원자적으로 교체합니다.
 
     반환:
         (ok, message)
@@ -74,38 +936,11 @@ def update_tool_call_in_file(file_path: str, new_tool_number: str) -> Tuple[bool
     if not new_tool_number.isdigit():
         return (False, "new_tool_number가 숫자가 아닙니다.")
 
-    try:
-        lines, detected_encoding = read_file_with_encoding(file_path)
-        if not lines:
-            return (False, f"파일을 읽지 못했습니다: {file_path}")
-
-        pattern = re.compile(r"(TOOL CALL\s+)(\d+)(\s+Z.*)", re.IGNORECASE)
+    if not os.path.isfile(file_path):
+        return (False, f"파일을 읽지 못했습니다: {file_path}")
 
-        modified = False
-        new_lines = []
-
-        for line in lines:
-            m = pattern.search(line)
-            if m:
-                prefix, old_no, suffix = m.group(1), m.group(2), m.group(3)
-                if old_no != new_tool_number:
-                    # 줄 끝 개행 유지
-                    end = "\n" if line.endswith("\n") else ""
-                    line = f"{prefix}{new_tool_number}{suffix}{end}"
-                    modified = True
-            new_lines.append(line)
-
-        if not modified:
-            return (True, "변경할 TOOL CALL이 없거나 이미 동일 번호입니다.")
-
-        # 감지된 인코딩으로 저장(읽은 인코딩을 최대한 유지)
-        with open(file_path, "w", encoding=detected_encoding, errors="ignore") as f:
-            f.writelines(new_lines)
-
-        return (True, f"TOOL CALL 수정 완료: {new_tool_number} (encoding={detected_encoding})")
-
-    except Exception as e:
-        return (False, f"TOOL CALL 수정 실패: {e}")
+    ok, messages = renumber_tool_calls({file_path: new_tool_number}, workers=1)
+    return (ok, messages.get(file_path, ""))
 
 
 def update_tool_call_in_folder(folder_path: str, file_name: str, new_tool_number: str) -> Tuple[bool, str]:
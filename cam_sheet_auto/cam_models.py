@@ -1,6 +1,7 @@
 # cam_models.py
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -19,3 +20,27 @@ class CamRow:
     job_number: str
     date: str  # "MM-DD"
     detected_encoding: str = "utf-8"
+
+    # ----- 프로그램 전체 분석(nc_analyzer) 결과 -----
+    rpm: str = ""           # TOOL CALL S값 (여러 개면 "8000/12000")
+    feed: str = ""          # 가장 많이 쓰인 이송 F
+    feeds: str = ""         # 사용된 이송값 목록 ("800,1200,1500")
+    woc: str = ""           # 측면 절입량(헤더 주석 STEPOVER/WOC/AE)
+    tool_calls: str = ""    # "T12 S8000 / T5 S12000"
+    line_count: int = 0
+    segment_count: int = 0  # 이동 블록(L/LP/C/CP/CR/CT) 수
+
+    # ----- 가공 시간 추정(cycle_time) 결과, 단위: 초/mm -----
+    cycle_time_s: float = 0.0   # 절삭 + 급송 (0 = 추정 안 됨)
+    cut_time_s: float = 0.0
+    rapid_length: float = 0.0
+    rapid_count: int = 0        # FMAX 블록 수
+
+    # ----- 공구 경로 외곽 치수(envelope), 단위: mm (None = 이동 없음/분석 안 됨) -----
+    x_min: Optional[float] = None
+    x_max: Optional[float] = None
+    y_min: Optional[float] = None
+    y_max: Optional[float] = None
+    z_min: Optional[float] = None
+    z_max: Optional[float] = None
+    tool_z_depths: str = ""     # 공구별 최저 Z "T12 Z-15.2 / T5 Z-3"
@@ -338,8 +338,8 @@ class CamPrintEngine:
             inner = rect.adjusted(8.0, 8.0, -8.0, -8.0)
 
             # ===== 열 정의 =====
-            headers: List[str] = ["ToolNo", "ToolName", "Holder", "RPM", "Feed", "DOC", "WOC", "Coolant"]
-            col_weights: List[float] = [0.08, 0.22, 0.20, 0.10, 0.10, 0.10, 0.10, 0.10]
+            headers: List[str] = ["ToolNo", "ToolName", "Holder", "RPM", "Feed", "DOC", "WOC", "Coolant", "Time"]
+            col_weights: List[float] = [0.07, 0.20, 0.18, 0.09, 0.09, 0.09, 0.09, 0.10, 0.09]
 
             # x 좌표 계산
             xs: List[float] = [inner.left()]
@@ -378,7 +378,7 @@ class CamPrintEngine:
 
                     val = "" if row_dict.get(key) is None else str(row_dict.get(key))
                     # 숫자 계열은 가운데 정렬, 텍스트는 좌측 정렬(가독성)
-                    if key in ("ToolNo", "RPM", "Feed", "DOC", "WOC"):
+                    if key in ("ToolNo", "RPM", "Feed", "DOC", "WOC", "Time"):
                         painter.drawText(cell.adjusted(4.0, 0.0, -4.0, 0.0), Qt.AlignCenter, val)
                     else:
                         painter.drawText(cell.adjusted(4.0, 0.0, -4.0, 0.0), Qt.AlignLeft | Qt.AlignVCenter, val)
@@ -0,0 +1,251 @@
+# cam_sheet_auto/cam_row_store.py
+"""
+대량 CamRow 보관용 열(column) 저장소.
+
+- CamRow 객체 리스트 대신 필드별 배열에 보관합니다.
+  - 문자열: 필드별 사전(category) 코드 배열. tool_db/equip_name/coolant/job_number처럼
+    반복되는 값은 사전에 1번만 저장됩니다.
+  - 정수: array('q'), 실수: array('d') (Optional[float]의 None은 NaN으로 저장)
+- 파일명 자연 정렬 키는 행을 넣을 때 1번만 계산하고, 정렬 순서는 행이 추가/삭제될 때까지 재사용합니다.
+- store[i] / store.get(파일명)은 CamRowView(저장소 + 행 번호만 가진 뷰)를 O(1)로 반환합니다.
+  CamRow 객체가 필요하면 view.to_row()로 만듭니다.
+- 키는 file_name이므로 저장소 1개는 폴더 1개만 담습니다. (다른 폴더의 같은 파일명은 서로 덮어씀)
+  - folder를 주면 저장소가 그 폴더에 묶이고, 다른 폴더의 행을 upsert하면 ValueError를 냅니다.
+  - 한 번의 upsert에 같은 file_name이 두 번 들어와도(여러 폴더를 합친 입력) ValueError를 냅니다.
+  - 여러 폴더(트리 스캔 결과 등)는 폴더마다 저장소를 1개씩 둡니다.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .cam_models import CamRow
+from .scan_cache import normalize_path
+
+_STR, _INT, _FLOAT, _OPT_FLOAT = range(4)
+_ARRAY_TYPECODE = {_STR: "B", _INT: "q", _FLOAT: "d", _OPT_FLOAT: "d"}
+# 문자열 코드 배열은 1바이트로 시작해 사전이 커지면 넓힙니다.
+_CODE_WIDEN = (("B", 0xFF, "H"), ("H", 0xFFFF, "I"))
+
+
+def _column_kind(type_name: str) -> int:
+    # cam_models는 from __future__ import annotations를 쓰므로 타입은 문자열입니다.
+    return {"int": _INT, "float": _FLOAT, "Optional[float]": _OPT_FLOAT}.get(str(type_name), _STR)
+
+
+# (필드명, 열 종류) — CamRow 필드 순서 그대로 (file_name은 키 열로 따로 보관)
+_FIELDS = tuple((f.name, _column_kind(f.type)) for f in fields(CamRow))
+_KIND = dict(_FIELDS)
+_COLUMNS = tuple((n, k) for n, k in _FIELDS if n != "file_name")
+
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def natural_key(text: str) -> str:
+    """
+    자연 정렬 키(T1, T2, ..., T10)를 문자열 1개로 만듭니다.
+    - ui/cam_core의 natural_sort_key(list)와 같은 순서이며, tuple/list보다 메모리가 작고 비교가 빠릅니다.
+    - 문자 구간은 '\\0'으로 끝맺고, 숫자 구간은 (자릿수 문자 + 숫자)로 적어 자릿수 → 값 순으로 비교됩니다.
+    """
+    parts = []
+    for k, seg in enumerate(_DIGITS_RE.split(text)):
+        if k % 2:
+            digits = seg.lstrip("0") or "0"
+            parts.append(chr(len(digits)) + digits)
+        else:
+            parts.append(seg + "\0")
+    return "".join(parts)
+
+
+class _Categories:
+    """
+    문자열 ↔ 정수 코드 사전.
+    """
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class CamRowView:
+    """
+    저장소의 1행을 가리키는 읽기 전용 뷰. CamRow와 같은 속성 이름으로 값을 읽습니다.
+    - 저장소에서 행이 삭제되면(remove) 이전에 받은 뷰는 더 이상 유효하지 않습니다.
+    """
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: "CamRowStore", i: int):
+        self._store = store
+        self._i = i
+
+    def __getattr__(self, name: str):
+        if name not in _KIND:
+            raise AttributeError(name)
+        return self._store.value(self._i, name)
+
+    @property
+    def index(self) -> int:
+        return self._i
+
+    def to_row(self) -> CamRow:
+        return self._store.row(self._i)
+
+    def __repr__(self) -> str:
+        return f"CamRowView({self._i}, {self.file_name!r})"
+
+
+class CamRowStore:
+    """
+    CamRow 열 저장소.
+
+    - 반복(iter)은 파일명 자연 정렬 순서입니다. 인덱스 접근(store[i])은 삽입 순서입니다.
+    - upsert: 같은 file_name이 있으면 그 자리를 덮어쓰고, 없으면 끝에 추가합니다.
+    - folder: 행들이 속한 폴더 ("" 이면 아직 묶이지 않음, 처음 folder를 준 upsert에서 묶임)
+    """
+
+    def __init__(self, rows: Iterable[CamRow] = (), folder: str = ""):
+        self._cats: Dict[str, _Categories] = {n: _Categories() for n, k in _COLUMNS if k == _STR}
+        self._cols: Dict[str, array] = {n: array(_ARRAY_TYPECODE[k]) for n, k in _COLUMNS}
+        self._names: List[str] = []     # file_name (키 열)
+        self._keys: List[str] = []      # natural_key(file_name)
+        self._index: Dict[str, int] = {}
+        self._order: Optional[List[int]] = None
+        self.folder = folder
+        self.upsert(rows)
+
+    # -------------------------
+    # 읽기
+    # -------------------------
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, i: int) -> CamRowView:
+        if i < 0:
+            i += len(self._names)
+        if not 0 <= i < len(self._names):
+            raise IndexError(i)
+        return CamRowView(self, i)
+
+    def __iter__(self) -> Iterator[CamRowView]:
+        for i in self.sorted_indices():
+            yield CamRowView(self, i)
+
+    def __contains__(self, file_name: str) -> bool:
+        return file_name in self._index
+
+    def get(self, file_name: str) -> Optional[CamRowView]:
+        i = self._index.get(file_name)
+        return None if i is None else CamRowView(self, i)
+
+    def value(self, i: int, name: str):
+        if name == "file_name":
+            return self._names[i]
+        kind = _KIND[name]
+        v = self._cols[name][i]
+        if kind == _STR:
+            return self._cats[name].values[v]
+        if kind == _OPT_FLOAT and math.isnan(v):
+            return None
+        return v
+
+    def row(self, i: int) -> CamRow:
+        return CamRow(**{name: self.value(i, name) for name, _ in _FIELDS})
+
+    def rows(self) -> List[CamRow]:
+        """자연 정렬 순서의 CamRow 리스트 (내보내기/직렬화용)."""
+        return [self.row(i) for i in self.sorted_indices()]
+
+    def sorted_indices(self) -> List[int]:
+        """파일명 자연 정렬 순서의 행 번호 (다음 변경 전까지 캐시)."""
+        if self._order is None:
+            self._order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        return self._order
+
+    def column(self, name: str) -> List:
+        """삽입 순서의 열 값 전체."""
+        if name == "file_name":
+            return list(self._names)
+        if _KIND[name] == _STR:
+            values = self._cats[name].values
+            return [values[c] for c in self._cols[name]]
+        return [self.value(i, name) for i in range(len(self._names))]
+
+    # -------------------------
+    # 쓰기
+    # -------------------------
+    def _encode(self, name: str, kind: int, value):
+        if kind == _STR:
+            code = self._cats[name].encode("" if value is None else str(value))
+            col = self._cols[name]
+            for typecode, max_code, wider in _CODE_WIDEN:
+                if col.typecode == typecode and code > max_code:
+                    col = self._cols[name] = array(wider, col)
+            return code
+        if kind == _INT:
+            return int(value or 0)
+        if value is None:
+            return math.nan if kind == _OPT_FLOAT else 0.0
+        return float(value)
+
+    def _check_folder(self, folder: Optional[str]) -> None:
+        if not folder:
+            return
+        if not self.folder:
+            self.folder = folder
+        elif normalize_path(folder) != normalize_path(self.folder):
+            raise ValueError(f"다른 폴더의 행은 넣을 수 없습니다: {folder} (저장소 폴더: {self.folder})")
+
+    def upsert(self, rows: Iterable[CamRow], folder: Optional[str] = None) -> None:
+        """
+        행을 추가/갱신합니다.
+        - folder: rows가 속한 폴더. 저장소 폴더와 다르면 ValueError (None이면 검사하지 않음)
+        - 한 번의 호출에 같은 file_name이 두 번 있으면 ValueError (여러 폴더를 합친 입력으로 봄)
+        """
+        rows = list(rows)
+        seen = set()
+        for r in rows:
+            if r.file_name in seen:
+                raise ValueError(f"같은 파일명이 두 번 들어왔습니다(여러 폴더의 행?): {r.file_name}")
+            seen.add(r.file_name)
+        self._check_folder(folder)
+
+        for r in rows:
+            i = self._index.get(r.file_name)
+            if i is None:
+                for name, kind in _COLUMNS:
+                    code = self._encode(name, kind, getattr(r, name))
+                    self._cols[name].append(code)
+                self._index[r.file_name] = len(self._names)
+                self._names.append(r.file_name)
+                self._keys.append(natural_key(r.file_name))
+                self._order = None
+            else:
+                for name, kind in _COLUMNS:
+                    code = self._encode(name, kind, getattr(r, name))
+                    self._cols[name][i] = code
+
+    def remove(self, file_names: Iterable[str]) -> None:
+        """file_name 목록의 행을 삭제하고 열을 압축합니다. (이전에 받은 뷰는 무효)"""
+        drop = {self._index[n] for n in file_names if n in self._index}
+        if not drop:
+            return
+        keep = [i for i in range(len(self._names)) if i not in drop]
+        for name, col in self._cols.items():
+            self._cols[name] = array(col.typecode, (col[i] for i in keep))
+        self._names = [self._names[i] for i in keep]
+        self._keys = [self._keys[i] for i in keep]
+        self._index = {n: j for j, n in enumerate(self._names)}
+        self._order = None
@@ -5,6 +5,8 @@ from .ui import CamSheetApp
 
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = CamSheetApp()
     window.show()
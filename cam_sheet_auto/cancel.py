@@ -0,0 +1,44 @@
+# cam_sheet_auto/cancel.py
+"""
+스캔 취소용 협조적(cooperative) 취소 토큰.
+
+- UI 스레드에서 cancel()을 호출하면, 스캔 루프가 파일 경계마다 확인하고 ScanCancelled로 빠져나옵니다.
+- 프로세스 풀 워커에는 전달하지 않고, 부모 프로세스가 남은 작업을 취소합니다.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+
+class ScanCancelled(Exception):
+    """스캔이 취소 토큰으로 중단되었음을 나타냅니다."""
+
+
+class CancelToken:
+    """
+    스레드 간 공유 가능한 취소 플래그.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ScanCancelled()
+
+
+def check_cancel(cancel: Optional[CancelToken]) -> None:
+    """
+    cancel이 주어졌고 취소되었으면 ScanCancelled를 발생시킵니다. (None이면 아무 것도 안 함)
+    """
+    if cancel is not None and cancel.cancelled:
+        raise ScanCancelled()
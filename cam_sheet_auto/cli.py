@@ -0,0 +1,211 @@
+# cam_sheet_auto/cli.py
+"""
+CAM 시트 헤드리스 CLI (Qt 없이 스캔/내보내기).
+
+- 실행 예:
+  python -m machining_auto cam scan DIR
+  python -m machining_auto cam scan DIR --format csv -o rows.csv
+  python -m machining_auto cam scan DIR --analyze      (가공 시간/행정 범위까지 분석)
+  python -m machining_auto cam scan ROOT --recursive --format xlsx -o weekly.xlsx
+  python -m machining_auto cam export DIR1 DIR2 ... --report report.json
+  python -m machining_auto cam export --list folders.txt -j 8
+
+- PySide6(Qt)를 import하지 않습니다. (파일 서버 야간 배치용)
+- 결과를 stdout으로 내보낼 때는 스캔 진행 로그를 stderr로 돌려 출력 데이터가 섞이지 않게 합니다.
+  (프로세스 풀 워커의 로그도 stderr로 보냅니다. — cam_core._new_pool)
+- export: 폴더마다 CAM SHEET(템플릿)를 <폴더>/CAM_SHEET_<작업번호>_<MMDD>.xlsx로 저장합니다. (bulk_export)
+- 종료 코드: 0 성공 / 1 스캔·저장 실패(export는 1개 폴더라도 실패) / 2 사용법 오류 / 130 중단(Ctrl+C)
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from dataclasses import asdict, fields
+from typing import Dict, List, Optional, Sequence
+
+from .cam_core import scan_cam_rows, scan_cam_tree
+from .cam_models import CamRow
+from .scan_cache import ScanCache
+
+FORMATS = ("json", "csv", "xlsx")
+# 출력 열 순서(CamRow 필드 순서) — 트리 스캔이면 맨 앞에 folder 열을 붙입니다.
+ROW_FIELDS = tuple(f.name for f in fields(CamRow))
+
+
+def _rows_to_records(grouped: Dict[str, List[CamRow]], with_folder: bool) -> List[Dict[str, object]]:
+    records = []
+    for folder, rows in grouped.items():
+        for r in rows:
+            rec = asdict(r)
+            if with_folder:
+                rec = {"folder": folder, **rec}
+            records.append(rec)
+    return records
+
+
+def write_json(records: Sequence[Dict[str, object]], out) -> None:
+    json.dump(records, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+
+def write_csv(records: Sequence[Dict[str, object]], columns: Sequence[str], out) -> None:
+    writer = csv.DictWriter(out, fieldnames=list(columns), extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for rec in records:
+        writer.writerow({k: ("" if v is None else v) for k, v in rec.items()})
+
+
+def write_xlsx(records: Sequence[Dict[str, object]], columns: Sequence[str], path: str) -> None:
+    """
+    단순 표 형태(1행 헤더 + 데이터)로 저장합니다. openpyxl은 이 형식에서만 import합니다.
+    - write_only 모드로 행을 바로 흘려 쓰므로 행 수가 많아도 메모리가 늘지 않습니다. (excel_writer)
+    """
+    from .excel_writer import write_rows_xlsx
+
+    write_rows_xlsx(path, columns, ([rec.get(c) for c in columns] for rec in records))
+
+
+def _scan(args) -> Dict[str, List[CamRow]]:
+    if args.recursive:
+        # 트리 스캔은 스캔 캐시를 쓰지 않습니다. (폴더마다 캐시를 여닫지 않도록)
+        if args.cache or args.no_cache:
+            print("⚠ --cache/--no-cache는 --recursive 트리 스캔에는 적용되지 않습니다.", file=sys.stderr)
+        return scan_cam_tree(args.folder, max_depth=args.max_depth, workers=args.workers, analyze=args.analyze)
+
+    cache = ScanCache(args.cache) if args.cache else (None if args.no_cache else ScanCache())
+    try:
+        return {args.folder: scan_cam_rows(args.folder, workers=args.workers, cache=cache, analyze=args.analyze)}
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def cmd_scan(args) -> int:
+    if not os.path.isdir(args.folder):
+        print(f"❌ 폴더가 없습니다: {args.folder}", file=sys.stderr)
+        return 1
+    if args.format == "xlsx" and not args.output:
+        print("❌ xlsx 형식은 --output 경로가 필요합니다.", file=sys.stderr)
+        return 2
+
+    to_stdout = not args.output
+    log_target = sys.stderr if to_stdout else sys.stdout
+    with contextlib.redirect_stdout(log_target):
+        grouped = _scan(args)
+
+    records = _rows_to_records(grouped, with_folder=args.recursive)
+    columns = (("folder",) if args.recursive else ()) + ROW_FIELDS
+
+    try:
+        if args.format == "xlsx":
+            write_xlsx(records, columns, args.output)
+        elif to_stdout:
+            if args.format == "json":
+                write_json(records, sys.stdout)
+            else:
+                write_csv(records, columns, sys.stdout)
+        else:
+            # CSV는 Excel에서 바로 열 수 있도록 BOM 포함 UTF-8로 저장
+            encoding = "utf-8-sig" if args.format == "csv" else "utf-8"
+            with open(args.output, "w", encoding=encoding, newline="") as f:
+                if args.format == "json":
+                    write_json(records, f)
+                else:
+                    write_csv(records, columns, f)
+    except OSError as e:
+        print(f"❌ 저장 실패: {e}", file=sys.stderr)
+        return 1
+
+    if not to_stdout:
+        print(f"✅ {len(records)}행 / 폴더 {len(grouped)}개 → {args.output}")
+    return 0
+
+
+def _read_folder_list(path: str) -> List[str]:
+    """
+    폴더 목록 파일(1줄 1폴더, 빈 줄과 #주석 무시)을 읽습니다.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def cmd_export(args) -> int:
+    from .bulk_export import bulk_export_sheets, format_report
+
+    folders = list(args.folders)
+    if args.list:
+        try:
+            folders += _read_folder_list(args.list)
+        except OSError as e:
+            print(f"❌ 폴더 목록을 읽지 못했습니다: {e}", file=sys.stderr)
+            return 2
+    if not folders:
+        print("❌ 내보낼 폴더가 없습니다. (폴더 인자 또는 --list)", file=sys.stderr)
+        return 2
+
+    cache_path = "" if args.no_cache else args.cache
+    results = bulk_export_sheets(
+        folders,
+        workers=args.workers,
+        machine_name=args.machine,
+        date=args.date,
+        cache_path=cache_path,
+        multi_sheet=not args.single_sheet,
+        on_result=lambda r: print(format_report([r])[0], flush=True),
+    )
+    print(format_report(results)[-1])
+
+    if args.report:
+        try:
+            with open(args.report, "w", encoding="utf-8") as f:
+                write_json([asdict(r) for r in results], f)
+            print(f"✅ 리포트 저장: {args.report}")
+        except OSError as e:
+            print(f"❌ 리포트 저장 실패: {e}", file=sys.stderr)
+            return 1
+    return 0 if all(r.ok for r in results) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m machining_auto cam", description="CAM 시트 헤드리스 도구")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sp = sub.add_parser("scan", help="폴더의 .h 파일을 스캔하여 CamRow로 내보냅니다.")
+    sp.add_argument("folder", help="작업 폴더 (--recursive면 상위 폴더)")
+    sp.add_argument("--format", "-f", choices=FORMATS, default="json")
+    sp.add_argument("--output", "-o", default=None, help="출력 파일 (없으면 stdout, xlsx는 필수)")
+    sp.add_argument("--workers", "-j", type=int, default=0, help="파싱 프로세스 수 (0: CPU 개수, 1: 순차)")
+    sp.add_argument("--recursive", "-r", action="store_true", help="하위 작업 폴더까지 트리 스캔")
+    sp.add_argument("--max-depth", type=int, default=None, help="--recursive 탐색 깊이 제한")
+    sp.add_argument("--cache", default=None, help="스캔 캐시 DB 경로 (기본: 사용자 로컬 캐시, 단일 폴더 스캔에만 적용)")
+    sp.add_argument("--no-cache", action="store_true", help="스캔 캐시를 사용하지 않음")
+    sp.add_argument("--analyze", action="store_true",
+                    help="프로그램 전체 분석(가공 시간/행정 범위) 포함 (기본: 헤더만, 느림)")
+    sp.set_defaults(func=cmd_scan)
+
+    ep = sub.add_parser("export", help="여러 작업 폴더의 CAM SHEET(xlsx)를 일괄 저장합니다.")
+    ep.add_argument("folders", nargs="*", help="작업 폴더 목록")
+    ep.add_argument("--list", "-l", default=None, help="폴더 목록 파일 (1줄 1폴더)")
+    ep.add_argument("--workers", "-j", type=int, default=0, help="프로세스 수 (0: CPU 개수, 1: 순차)")
+    ep.add_argument("--machine", default=None, help="헤더 설비명 (기본: 폴더의 마지막 행 설비명)")
+    ep.add_argument("--date", default=None, help="헤더 날짜 (기본: 스캔 날짜 MM-DD)")
+    ep.add_argument("--single-sheet", action="store_true", help="96행까지만 저장 (시트 추가 안 함)")
+    ep.add_argument("--report", default=None, help="폴더별 결과 JSON 저장 경로")
+    ep.add_argument("--cache", default=None, help="스캔 캐시 DB 경로 (기본: 사용자 로컬 캐시)")
+    ep.add_argument("--no-cache", action="store_true", help="스캔 캐시를 사용하지 않음")
+    ep.set_defaults(func=cmd_export)
+    return ap
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("⏹ 중단됨", file=sys.stderr)
+        return 130
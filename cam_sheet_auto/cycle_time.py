@@ -0,0 +1,416 @@
+# cam_sheet_auto/cycle_time.py
+"""
+Heidenhain(.h) 프로그램 가공 시간(사이클 타임) 추정.
+
+- 청크를 바이트 배열로 보고 이동 블록(L / CC / C / CR / CT)과 TOOL CALL의 단어(X/Y/Z/R/DR/F)를
+  NumPy 벡터 연산으로 좌표/이송 배열로 바꾼 뒤, 경로 길이와 절삭 시간을 계산합니다.
+  (블록마다 파이썬 코드를 돌지 않으므로 1천만 블록도 수 초 단위)
+- 모달 값(좌표/이송/원호 중심)은 청크 경계를 넘어 이어집니다. (nc_analyzer 스트리밍과 함께 사용)
+- FMAX(급송) 블록은 절삭과 따로 길이/횟수만 집계하고,
+  시간은 설비별 급송 속도(MACHINE_RAPID_MM_MIN)로 마지막에 환산합니다.
+- NumPy는 선택 의존성입니다. 설치되어 있지 않으면 시간 추정만 건너뜁니다.
+  - 실제로 분석할 때(new_accumulator / CycleTimeAccumulator) 처음 import합니다.
+    헤더만 읽는 스캔과 앱 시작 경로에서는 NumPy를 로드하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
+
+# load_numpy()가 처음 호출될 때 채워집니다. (없으면 계속 None)
+np = None
+_NUMPY_CHECKED = False
+
+
+def load_numpy():
+    """
+    NumPy 모듈을 반환합니다. (처음 호출할 때 1번만 import, 설치되어 있지 않으면 None)
+    """
+    global np, _NUMPY_CHECKED
+    if not _NUMPY_CHECKED:
+        try:
+            import numpy
+        except ImportError:  # 선택 의존성
+            numpy = None
+        np = numpy
+        _NUMPY_CHECKED = True
+    return np
+
+
+def numpy_available() -> bool:
+    """
+    가공 시간/외곽 치수 분석이 가능한지(NumPy 설치 여부) 반환합니다.
+    """
+    return load_numpy() is not None
+
+
+# =========================
+# 설비별 급송 속도 (mm/min)
+# =========================
+
+MACHINE_RAPID_MM_MIN = {
+    "DINO_MAX#3": 36000.0,
+    "DINO_MAX#2": 36000.0,
+    "DINO_MAX#1": 36000.0,
+    "DINO": 30000.0,
+    "STINGER": 40000.0,
+}
+DEFAULT_RAPID_MM_MIN = 30000.0
+
+
+def rapid_rate_for(equip_name: str) -> float:
+    """
+    설비명(헤더 감지 결과)에 해당하는 급송 속도(mm/min)를 반환합니다. (모르면 기본값)
+    """
+    return MACHINE_RAPID_MM_MIN.get((equip_name or "").strip().upper(), DEFAULT_RAPID_MM_MIN)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    초 → 'H:MM:SS' (1시간 미만은 'M:SS'). 0 이하면 빈 문자열.
+    """
+    if not seconds or seconds <= 0:
+        return ""
+    total = int(round(seconds))
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+# =========================
+# 블록 파싱(바이트 배열 벡터 연산)
+# =========================
+
+# 블록 종류 코드
+K_NONE, K_TOOL_CALL, K_CC, K_L, K_C, K_CR, K_CT = range(7)
+
+_NUM_WIDTH = 12  # 숫자 1개 최대 길이(부호 포함, ±99999.9999 = 11자)
+
+_TWO_PI = 2.0 * math.pi
+
+
+@dataclass(frozen=True)
+class CycleTimeStats:
+    """
+    시간 추정 결과(급송 시간 제외 — 설비 속도로 나중에 환산).
+    - tools: (절삭 시간 s, 절삭 길이 mm, 급송 길이 mm) 목록
+      [0]은 첫 TOOL CALL 이전 이동, [k]는 k번째 TOOL CALL 이후 이동
+    """
+    cut_length: float = 0.0
+    cut_time_s: float = 0.0
+    rapid_length: float = 0.0
+    rapid_count: int = 0
+    tools: Tuple[Tuple[float, float, float], ...] = ()
+
+    def cycle_time_s(self, rapid_mm_min: float) -> float:
+        """절삭 시간 + 급송 시간(초)."""
+        rapid = self.rapid_length / rapid_mm_min * 60.0 if rapid_mm_min > 0 else 0.0
+        return self.cut_time_s + rapid
+
+
+def _parse_numbers(buf: "np.ndarray", pos: "np.ndarray") -> "np.ndarray":
+    """
+    buf[pos]에서 시작하는 '+12.5' / '-.5' / '300' 형태 숫자를 한 번에 float 배열로 바꿉니다.
+    - 숫자 뒤 글자를 잘라낸 고정 폭 bytes 배열을 만들어 NumPy 변환(C 구현)에 맡깁니다.
+    - 숫자가 없으면 NaN
+    """
+    np = load_numpy()
+    if pos.size == 0:
+        return np.empty(0)
+    idx = np.minimum(pos[:, None] + np.arange(_NUM_WIDTH), buf.size - 1)
+    win = buf[idx]
+
+    digit = (win >= ord("0")) & (win <= ord("9"))
+    valid = digit | (win == ord("."))
+    signed = (win[:, 0] == ord("-")) | (win[:, 0] == ord("+"))
+    valid[:, 0] |= signed
+    valid[:, -1] = False  # 폭을 넘는 숫자는 잘라서 읽음
+    end = valid.argmin(axis=1)
+    win[np.arange(_NUM_WIDTH) >= end[:, None]] = 0
+
+    # 부호 다음 첫 글자가 숫자(또는 '.숫자')여야 유효
+    rows = np.arange(pos.size)
+    first = signed.astype(np.intp)
+    ok = digit[rows, first] | ((win[rows, first] == ord(".")) & digit[rows, np.minimum(first + 1, _NUM_WIDTH - 1)])
+    ok &= end > first
+    win[~ok] = 0
+    win[~ok, :3] = np.frombuffer(b"nan", dtype=np.uint8)
+
+    text = np.ascontiguousarray(win).view(f"S{_NUM_WIDTH}").ravel()
+    try:
+        return text.astype(np.float64)
+    except ValueError:
+        # '1.2.3' 같은 비정상 단어가 섞인 경우만 하나씩 변환
+        out = np.empty(text.size)
+        for i, t in enumerate(text):
+            try:
+                out[i] = float(t)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+
+def _parse_block(block: bytes):
+    """
+    청크(줄 경계, '\n'으로 시작)를 블록 단위 배열로 변환합니다.
+
+    반환: (kind, x, y, z, r, ccw, feed, rapid) — 이동/CC/TOOL CALL 블록만, 파일 순서
+    - 없는 좌표/값은 NaN, ccw는 DR+ 여부, rapid는 FMAX 여부
+    - ';' 뒤 주석의 단어는 무시합니다.
+    """
+    np = load_numpy()
+    if not block.endswith(b"\n"):  # 파일 마지막 줄
+        block += b"\n"
+    buf = np.frombuffer(block, dtype=np.uint8)
+    nl = np.flatnonzero(buf == ord("\n"))
+    starts = nl[:-1] + 1
+    ends = nl[1:]
+    if starts.size == 0:
+        return None
+    pad = np.concatenate((buf, np.zeros(8, dtype=np.uint8)))
+
+    # ----- 블록 종류: 줄번호 뒤 첫 단어 -----
+    spaces = np.flatnonzero((buf == ord(" ")) | (buf == ord("\t")))
+    first_sp = spaces[np.minimum(np.searchsorted(spaces, starts), spaces.size - 1)] if spaces.size else ends
+    numbered = (pad[starts] >= ord("0")) & (pad[starts] <= ord("9"))
+    ws = np.where(numbered & (first_sp > starts) & (first_sp < ends), first_sp + 1, starts)
+    c = [pad[ws + i] for i in range(6)]
+
+    def _sep(ch):
+        return (ch == ord(" ")) | (ch == ord("\t")) | (ch == ord("\r"))
+
+    kind = np.zeros(starts.size, dtype=np.int8)
+    kind[(c[0] == ord("L")) & _sep(c[1])] = K_L
+    is_c0 = c[0] == ord("C")
+    kind[is_c0 & _sep(c[1])] = K_C
+    kind[is_c0 & (c[1] == ord("C")) & _sep(c[2])] = K_CC
+    kind[is_c0 & (c[1] == ord("R")) & _sep(c[2])] = K_CR
+    kind[is_c0 & (c[1] == ord("T")) & _sep(c[2])] = K_CT
+    # TOOL CALL은 대소문자 무시 (nc_analyzer / cam_core와 같은 규칙, 0x20 비트로 소문자화)
+    lc = [ch | 0x20 for ch in c]
+    kind[(lc[0] == ord("t")) & (lc[1] == ord("o")) & (lc[2] == ord("o")) & (lc[3] == ord("l"))
+         & (c[4] == ord(" ")) & (lc[5] == ord("c"))] = K_TOOL_CALL
+
+    keep = np.flatnonzero(kind)
+    if keep.size == 0:
+        return None
+
+    # 주석(';') 시작 위치 = 단어 검색 끝
+    semis = np.flatnonzero(buf == ord(";"))
+    if semis.size:
+        first_semi = semis[np.minimum(np.searchsorted(semis, starts), semis.size - 1)]
+        line_end = np.where((first_semi >= starts) & (first_semi < ends), first_semi, ends)
+    else:
+        line_end = ends
+
+    prev_sep = np.zeros(buf.size, dtype=bool)
+    prev_sep[1:] = (buf[:-1] == ord(" ")) | (buf[:-1] == ord("\t"))
+
+    def _word(letter: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(줄 번호, 글자 위치) — 공백 뒤 letter, 주석 앞, 종류가 있는 줄만"""
+        pos = np.flatnonzero((buf == ord(letter)) & prev_sep)
+        line = np.searchsorted(starts, pos, side="right") - 1
+        ok = (line >= 0) & (pos < line_end[np.maximum(line, 0)])
+        pos, line = pos[ok], line[ok]
+        ok = kind[line] != K_NONE
+        return line[ok], pos[ok]
+
+    n = starts.size
+    values = {}
+    for letter in "XYZR":
+        line, pos = _word(letter)
+        arr = np.full(n, np.nan)
+        vals = _parse_numbers(pad, pos + 1)
+        good = ~np.isnan(vals)
+        arr[line[good]] = vals[good]
+        values[letter] = arr
+
+    # F<값> / FMAX
+    line, pos = _word("F")
+    feed = np.full(n, np.nan)
+    rapid = np.zeros(n, dtype=bool)
+    is_max = (pad[pos + 1] == ord("M")) & (pad[pos + 2] == ord("A")) & (pad[pos + 3] == ord("X"))
+    rapid[line[is_max]] = True
+    vals = _parse_numbers(pad, pos[~is_max] + 1)
+    good = ~np.isnan(vals)
+    feed[line[~is_max][good]] = vals[good]
+
+    # DR+ / DR-
+    line, pos = _word("D")
+    ccw = np.zeros(n, dtype=bool)
+    is_dr = (pad[pos + 1] == ord("R"))
+    ccw[line[is_dr & (pad[pos + 2] == ord("+"))]] = True
+
+    return (kind[keep], values["X"][keep], values["Y"][keep], values["Z"][keep],
+            values["R"][keep], ccw[keep], feed[keep], rapid[keep])
+
+
+def _ffill(values: "np.ndarray", init: float) -> "np.ndarray":
+    """
+    NaN을 직전 값으로 채운 배열(길이 n+1, [0]=init)을 반환합니다.
+    """
+    np = load_numpy()
+    arr = np.concatenate(([init], values))
+    idx = np.where(np.isnan(arr), 0, np.arange(arr.size))
+    np.maximum.accumulate(idx, out=idx)
+    return arr[idx]
+
+
+class MotionChunk(NamedTuple):
+    """
+    청크 안 이동 블록(L/C/CR/CT)만의 배열 묶음(파일 순서).
+    - tool: 공구 구간 번호(0 = 첫 TOOL CALL 이전)
+    - ex/ey/ez: 블록 끝 좌표 (미확정 축은 NaN)
+    - 원호(is_arc)만 acx/acy(중심), ar(반경), a0(시작각), sweep(회전량 ≥ 0), ccw(반시계) 유효
+    """
+    tool: "np.ndarray"
+    ex: "np.ndarray"
+    ey: "np.ndarray"
+    ez: "np.ndarray"
+    rapid: "np.ndarray"
+    is_arc: "np.ndarray"
+    acx: "np.ndarray"
+    acy: "np.ndarray"
+    ar: "np.ndarray"
+    a0: "np.ndarray"
+    sweep: "np.ndarray"
+    ccw: "np.ndarray"
+
+
+class CycleTimeAccumulator:
+    """
+    청크(줄 경계, '\\n'으로 시작) 단위로 블록을 받아 시간/길이를 누적합니다.
+    """
+
+    def __init__(self):
+        if load_numpy() is None:
+            raise ImportError("NumPy가 없어 가공 시간을 계산할 수 없습니다.")
+        self.x = self.y = self.z = math.nan
+        self.cx = self.cy = math.nan
+        self.feed = math.nan
+        self.tool = 0
+        self.rapid_count = 0
+        # 공구 구간별 [절삭 시간 s, 절삭 길이, 급송 길이]
+        self._cut_time: List[float] = [0.0]
+        self._cut_len: List[float] = [0.0]
+        self._rapid_len: List[float] = [0.0]
+
+    def add_block(self, block: bytes) -> Optional["MotionChunk"]:
+        """
+        청크 1개를 누적하고, 다른 분석(외곽 치수 등)이 재사용할 이동 블록 배열을 반환합니다.
+        """
+        np = load_numpy()
+        parsed = _parse_block(block)
+        if parsed is None:
+            return None
+        kind, x, y, z, rad_all, ccw_all, feed, is_rapid = parsed
+        is_tc = kind == K_TOOL_CALL
+        is_cc = kind == K_CC
+        is_move = ~(is_tc | is_cc)
+
+        # ----- 모달 값 채우기 (이전 청크 상태에서 이어짐) -----
+        nan = np.nan
+        px = _ffill(np.where(is_move, x, nan), self.x)
+        py = _ffill(np.where(is_move, y, nan), self.y)
+        pz = _ffill(np.where(is_move, z, nan), self.z)
+        ccx = _ffill(np.where(is_cc, x, nan), self.cx)[1:]
+        ccy = _ffill(np.where(is_cc, y, nan), self.cy)[1:]
+        ff = _ffill(np.where(is_rapid, nan, feed), self.feed)[1:]
+        tool = self.tool + np.cumsum(is_tc)
+
+        self.x, self.y, self.z = float(px[-1]), float(py[-1]), float(pz[-1])
+        self.cx, self.cy = float(ccx[-1]), float(ccy[-1])
+        self.feed = float(ff[-1])
+        self.tool = int(tool[-1])
+        while len(self._cut_time) <= self.tool:
+            self._cut_time.append(0.0)
+            self._cut_len.append(0.0)
+            self._rapid_len.append(0.0)
+
+        m = is_move
+        if not m.any():
+            return None
+        sx, sy, sz = px[:-1][m], py[:-1][m], pz[:-1][m]
+        ex, ey, ez = px[1:][m], py[1:][m], pz[1:][m]
+        k = kind[m]
+        # 아직 값이 정해지지 않은 축(프로그램 첫 이동 등)은 이동 거리 0으로 봅니다.
+        dx, dy, dz = (np.nan_to_num(e - s_, nan=0.0) for e, s_ in ((ex, sx), (ey, sy), (ez, sz)))
+
+        # ----- 직선(L, CT는 현 길이로 근사) -----
+        length = np.sqrt(dx * dx + dy * dy + dz * dz)
+
+        # ----- 원호: 중심(acx, acy), 반경(ar), 시작각(a0), 회전량(sweep ≥ 0), 방향(ccw) -----
+        nm = k.size
+        acx, acy, ar, a0, sweep = (np.full(nm, np.nan) for _ in range(5))
+        ccw = ccw_all[m]
+
+        # C: CC 중심 기준 원호 (DR+ 반시계 / DR- 시계)
+        is_c = k == K_C
+        if is_c.any():
+            acx[is_c], acy[is_c] = ccx[m][is_c], ccy[m][is_c]
+            ar[is_c] = np.hypot(sx[is_c] - acx[is_c], sy[is_c] - acy[is_c])
+            start = np.arctan2(sy[is_c] - acy[is_c], sx[is_c] - acx[is_c])
+            end = np.arctan2(ey[is_c] - acy[is_c], ex[is_c] - acx[is_c])
+            sw = np.where(ccw[is_c], (end - start) % _TWO_PI, (start - end) % _TWO_PI)
+            a0[is_c] = start
+            sweep[is_c] = np.where(sw < 1e-9, _TWO_PI, sw)  # 시작=끝이면 전체 원
+
+        # CR: 반경 지정 원호 (R+ 180° 이하 / R- 180° 초과)
+        is_cr = k == K_CR
+        if is_cr.any():
+            rad = rad_all[m][is_cr]
+            chord = np.hypot(dx[is_cr], dy[is_cr])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                half = np.clip(chord / (2.0 * np.abs(rad)), 0.0, 1.0)
+                sw = 2.0 * np.arcsin(half)
+                sw = np.where(rad < 0, _TWO_PI - sw, sw)
+                # 중심: 현 중점에서 수직 방향으로 h (반시계+작은 원호면 진행 방향 왼쪽)
+                h = np.abs(rad) * np.sqrt(1.0 - half * half)
+                side = np.where(ccw[is_cr] ^ (rad < 0), 1.0, -1.0)
+                acx[is_cr] = (sx[is_cr] + ex[is_cr]) / 2.0 - side * h * dy[is_cr] / chord
+                acy[is_cr] = (sy[is_cr] + ey[is_cr]) / 2.0 + side * h * dx[is_cr] / chord
+            ar[is_cr] = np.abs(rad)
+            a0[is_cr] = np.arctan2(sy[is_cr] - acy[is_cr], sx[is_cr] - acx[is_cr])
+            sweep[is_cr] = sw
+
+        is_arc = ~np.isnan(ar * sweep)
+        length[is_arc] = np.hypot(ar[is_arc] * sweep[is_arc], dz[is_arc])
+        length = np.nan_to_num(length, nan=0.0)  # 원호 중심/반경 미확정 블록
+
+        rapid = is_rapid[m]
+        f = ff[m]
+        cut = ~rapid & (f > 0)
+        t = tool[m]
+        n = self.tool + 1
+
+        cut_len = np.bincount(t[cut], weights=length[cut], minlength=n)
+        cut_time = np.bincount(t[cut], weights=length[cut] / f[cut] * 60.0, minlength=n)
+        rapid_len = np.bincount(t[rapid], weights=length[rapid], minlength=n)
+        for i in np.flatnonzero(cut_len + rapid_len):
+            self._cut_time[i] += float(cut_time[i])
+            self._cut_len[i] += float(cut_len[i])
+            self._rapid_len[i] += float(rapid_len[i])
+        self.rapid_count += int(rapid.sum())
+
+        return MotionChunk(
+            tool=t, ex=ex, ey=ey, ez=ez, rapid=rapid, is_arc=is_arc,
+            acx=acx, acy=acy, ar=ar, a0=a0, sweep=sweep, ccw=ccw,
+        )
+
+    def result(self) -> CycleTimeStats:
+        return CycleTimeStats(
+            cut_length=sum(self._cut_len),
+            cut_time_s=sum(self._cut_time),
+            rapid_length=sum(self._rapid_len),
+            rapid_count=self.rapid_count,
+            tools=tuple(zip(self._cut_time, self._cut_len, self._rapid_len)),
+        )
+
+
+def new_accumulator() -> Optional[CycleTimeAccumulator]:
+    """
+    NumPy가 있으면 누적기를, 없으면 None을 반환합니다.
+    """
+    return CycleTimeAccumulator() if numpy_available() else None
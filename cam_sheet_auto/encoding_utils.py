@@ -1,28 +1,162 @@
-import chardet
+import codecs
+import os
+
+# chardet은 빠른 경로가 모두 실패한 파일에서만 쓰므로 detect_encoding 안에서 불러옵니다.
+
+# ===== 인코딩 감지 통계/폴더별 메모 =====
+# 감지 경로별 파일 수: ascii/bom/utf8/cp949/memo 는 빠른 경로, chardet 은 느린 경로
+_DETECT_STATS = {"ascii": 0, "bom": 0, "utf8": 0, "cp949": 0, "memo": 0, "chardet": 0}
+FAST_PATHS = ("ascii", "bom", "utf8", "cp949", "memo")
+
+# 폴더(≈ CAM 포스트프로세서 출력 단위)별로 마지막에 감지된(ASCII/BOM 제외) 인코딩
+# - UTF-8/CP949 엄격 디코딩 또는 chardet이 고른 인코딩을 기억하고, 같은 폴더의 다음 파일은 이것부터 시도합니다.
+# - 멀티바이트/UTF 인코딩만 기억합니다. 단일 바이트 코덱(Windows-1252 등)은 어떤 바이트든
+#   디코딩되므로, chardet이 한 번 잘못 고르면 폴더 전체의 한글이 깨지기 때문입니다.
+_ENCODING_MEMO = {}
+_ENCODING_MEMO_MAX = 256
+_MEMO_CODECS = frozenset({
+    "cp949", "euc_kr", "johab", "iso2022_kr",
+    "gb2312", "gbk", "gb18030", "big5", "big5hkscs", "hz",
+    "cp932", "shift_jis", "shift_jis_2004", "shift_jisx0213", "euc_jp", "iso2022_jp",
+})
+
+
+def get_detect_stats():
+    """인코딩 감지 경로별 파일 수(복사본)를 반환"""
+    return dict(_DETECT_STATS)
+
+
+def reset_detect_stats():
+    """인코딩 감지 통계를 0으로 초기화"""
+    for k in _DETECT_STATS:
+        _DETECT_STATS[k] = 0
+
+
+def add_detect_stats(delta):
+    """다른 프로세스(병렬 스캔 워커)에서 집계한 통계를 합산"""
+    for k, v in delta.items():
+        if k in _DETECT_STATS:
+            _DETECT_STATS[k] += v
+
+
+def _decodes_strict(raw_data, encoding):
+    """샘플이 해당 인코딩으로 오류 없이 디코딩되는지 검사 (샘플 끝의 잘린 문자는 허용)"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(raw_data, final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def _memoizable(encoding):
+    """폴더 메모에 남겨도 되는(잘못 골랐을 때 엄격 디코딩으로 걸러지는) 인코딩인지 여부"""
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return name.startswith("utf") or name in _MEMO_CODECS
 
-def detect_encoding(file_path, num_bytes=2048):
-    """파일의 인코딩을 자동 감지하고 신뢰도 높은 인코딩을 반환"""
-    with open(file_path, 'rb') as f:
-        raw_data = f.read(num_bytes)
-    result = chardet.detect(raw_data)
-    encoding = result['encoding']
 
+def _remember(folder, encoding):
+    """폴더 메모에 감지된 인코딩을 남깁니다. (단일 바이트 코덱은 남기지 않음)"""
+    if not _memoizable(encoding):
+        return
+    if folder not in _ENCODING_MEMO and len(_ENCODING_MEMO) >= _ENCODING_MEMO_MAX:
+        _ENCODING_MEMO.clear()
+    _ENCODING_MEMO[folder] = encoding
+
+
+def _normalize_chardet(encoding):
+    """chardet 결과를 기존 규칙에 맞게 정리"""
     if encoding is None:
         return 'utf-8'  # 기본값 설정
     elif encoding.lower() in ['ascii', 'iso-8859-1']:
         return 'cp949'  # 한국어 파일일 가능성이 크므로 cp949 설정
     return encoding
+
+
+def detect_encoding(file_path, num_bytes=2048):
+    """파일의 인코딩을 자동 감지하고 신뢰도 높은 인코딩을 반환
+
+    빠른 경로를 먼저 시도하고, 모두 실패할 때만 chardet을 사용합니다.
+      1) UTF-8 BOM → utf-8-sig
+      2) 순수 ASCII → cp949 (기존 chardet 'ascii' 처리와 동일)
+      3) 같은 폴더에서 직전에 감지된 멀티바이트/UTF 인코딩으로 엄격 디코딩 성공 → 그 인코딩
+         (CP949 폴더는 실패할 UTF-8 시도를 건너뜀)
+      4) UTF-8 엄격 디코딩 성공 → utf-8
+      5) CP949 엄격 디코딩 성공 → cp949 (한글 CAM 출력의 대부분)
+      6) chardet
+    - 4)~6)에서 고른 인코딩은 폴더 메모에 남깁니다.
+    """
+    with open(file_path, 'rb') as f:
+        raw_data = f.read(num_bytes)
+
+    if raw_data.startswith(codecs.BOM_UTF8):
+        _DETECT_STATS["bom"] += 1
+        return 'utf-8-sig'
+    if raw_data.isascii():
+        _DETECT_STATS["ascii"] += 1
+        return 'cp949'
+
+    folder = os.path.dirname(os.path.abspath(file_path))
+    memo = _ENCODING_MEMO.get(folder)
+    if memo and _decodes_strict(raw_data, memo):
+        _DETECT_STATS["memo"] += 1
+        return memo
+
+    if _decodes_strict(raw_data, 'utf-8'):
+        _DETECT_STATS["utf8"] += 1
+        _remember(folder, 'utf-8')
+        return 'utf-8'
+    if _decodes_strict(raw_data, 'cp949'):
+        _DETECT_STATS["cp949"] += 1
+        _remember(folder, 'cp949')
+        return 'cp949'
+
+    import chardet
+
+    _DETECT_STATS["chardet"] += 1
+    encoding = _normalize_chardet(chardet.detect(raw_data)['encoding'])
+    _remember(folder, encoding)
+    return encoding
     
-def read_file_with_encoding(file_path):
-    """📌 감지된 인코딩으로 파일을 읽고, 한글이 깨지면 다른 인코딩으로 재시도"""
+def read_head_lines(file, max_lines=None, max_chars=None):
+    """📌 열린 텍스트 파일에서 앞쪽 max_lines줄 / max_chars글자까지만 읽고 멈춤
+
+    - 파일 끝까지 읽지 않으므로 I/O가 파일 크기와 무관합니다.
+    - 개행 없는 거대한 줄도 max_chars에서 잘립니다.
+    """
+    lines = []
+    budget = max_chars
+    while max_lines is None or len(lines) < max_lines:
+        line = file.readline(-1 if budget is None else budget)
+        if not line:
+            break
+        lines.append(line)
+        if budget is not None:
+            budget -= len(line)
+            if budget <= 0:
+                break
+    return lines
+
+def read_file_with_encoding(file_path, max_lines=None, max_chars=None, debug=False):
+    """📌 감지된 인코딩으로 파일을 읽고, 한글이 깨지면 다른 인코딩으로 재시도
+
+    - max_lines / max_chars 중 하나라도 주면 헤더 구간만 읽습니다. (둘 다 None이면 전체)
+    - debug=True 일 때만 파일별 성공 로그를 출력합니다. (폴더 스캔 시 로그 폭주 방지)
+    """
     detected_encoding = detect_encoding(file_path)
     encodings = [detected_encoding, 'utf-8-sig', 'utf-8', 'cp949', 'euc-kr', 'latin1']
 
     for enc in encodings:
         try:
             with open(file_path, 'r', encoding=enc, errors='ignore') as file:
-                lines = file.readlines()
-                print(f"✅ 성공적으로 읽음 (사용된 인코딩: {enc})")
+                if max_lines is None and max_chars is None:
+                    lines = file.readlines()
+                else:
+                    lines = read_head_lines(file, max_lines, max_chars)
+                if debug:
+                    print(f"✅ 성공적으로 읽음 (사용된 인코딩: {enc})")
                 return lines, enc
         except UnicodeDecodeError:
             print(f"⚠ {enc} 인코딩으로 읽기 실패, 다른 인코딩 시도 중...")
@@ -0,0 +1,198 @@
+# cam_sheet_auto/envelope.py
+"""
+공구 경로 외곽 치수(X/Y/Z 최소·최대)와 설비 행정(travel) 한계 검사.
+
+- cycle_time이 청크마다 만든 이동 블록 배열(MotionChunk)을 받아 NumPy 축소 연산으로
+  최소/최대만 누적하므로 메모리는 청크 크기 이상 늘지 않습니다.
+- NumPy는 cycle_time.load_numpy()로 사용할 때 가져옵니다. (누적기는 NumPy가 있을 때만 생성됨)
+- 원호(C/CR)는 끝점뿐 아니라 0°/90°/180°/270°를 지나는 경우의 극점까지 포함합니다.
+- 공구 구간(TOOL CALL 사이)별 최저 Z(절삭 깊이)도 함께 집계합니다.
+- 설비별 한계는 global_settings.json의 machine_limits에 두고, 검사는 캐시된 외곽 치수로만 하므로
+  한계를 바꿔도 파일을 다시 읽지 않습니다. (기본 배포값은 비어 있어 검사하지 않음)
+- 외곽 치수는 프로그램 좌표(공작물 원점 = 워크 오프셋 기준)입니다. 기계 좌표가 아니므로
+  행정 검사는 기본적으로 외곽 폭(최대-최소)을 행정 길이와 비교합니다. (check_envelope)
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .cycle_time import MotionChunk, load_numpy
+
+_TWO_PI = 2.0 * math.pi
+
+AXES = ("x", "y", "z")
+
+
+@dataclass(frozen=True)
+class ExtentsStats:
+    """
+    외곽 치수 결과 (이동이 없던 축은 None).
+    - tool_z: 공구 구간별 절삭 이동 최저 Z ([0]은 첫 TOOL CALL 이전, CycleTimeStats.tools와 같은 순서)
+    """
+    x_min: Optional[float] = None
+    x_max: Optional[float] = None
+    y_min: Optional[float] = None
+    y_max: Optional[float] = None
+    z_min: Optional[float] = None
+    z_max: Optional[float] = None
+    tool_z: Tuple[Optional[float], ...] = ()
+
+
+def _reduce(fn, *arrays) -> float:
+    """NaN을 무시한 최소/최대 (값이 없으면 ±inf)."""
+    init = math.inf if fn is load_numpy().fmin else -math.inf
+    out = init
+    for arr in arrays:
+        if arr.size:
+            out = float(fn(out, fn.reduce(arr, initial=init)))
+    return out
+
+
+def _fin(v: float) -> Optional[float]:
+    return v if math.isfinite(v) else None
+
+
+class ExtentsAccumulator:
+    """
+    MotionChunk를 받아 축별 최소/최대와 공구 구간별 최저 Z를 누적합니다.
+    """
+
+    def __init__(self):
+        self.lo = {a: math.inf for a in AXES}
+        self.hi = {a: -math.inf for a in AXES}
+        self._tool_z: List[float] = [math.inf]
+
+    def add(self, mc: MotionChunk) -> None:
+        np = load_numpy()
+        # ----- 원호 극점(0°: +X, 90°: +Y, 180°: -X, 270°: -Y) -----
+        extra = {"x": [], "y": []}
+        arc = mc.is_arc
+        if arc.any():
+            a0, sw, ccw = mc.a0[arc], mc.sweep[arc], mc.ccw[arc]
+            cx, cy, r = mc.acx[arc], mc.acy[arc], mc.ar[arc]
+            for theta, axis, center, sign in (
+                (0.0, "x", cx, 1.0), (math.pi / 2, "y", cy, 1.0),
+                (math.pi, "x", cx, -1.0), (3 * math.pi / 2, "y", cy, -1.0),
+            ):
+                offset = np.where(ccw, (theta - a0) % _TWO_PI, (a0 - theta) % _TWO_PI)
+                hit = offset <= sw
+                extra[axis].append(center[hit] + sign * r[hit])
+
+        for axis, end in (("x", mc.ex), ("y", mc.ey), ("z", mc.ez)):
+            arrays = [end] + extra.get(axis, [])
+            self.lo[axis] = min(self.lo[axis], _reduce(np.fmin, *arrays))
+            self.hi[axis] = max(self.hi[axis], _reduce(np.fmax, *arrays))
+
+        # ----- 공구 구간별 최저 Z (절삭 이동만, tool은 청크 안에서 단조 증가) -----
+        cut = ~mc.rapid
+        t, z = mc.tool[cut], mc.ez[cut]
+        while len(self._tool_z) <= (int(mc.tool[-1]) if mc.tool.size else 0):
+            self._tool_z.append(math.inf)
+        if t.size:
+            first = np.concatenate(([0], np.flatnonzero(np.diff(t)) + 1))
+            mins = np.fmin.reduceat(z, first)
+            for tool_idx, zmin in zip(t[first].tolist(), mins.tolist()):
+                if zmin < self._tool_z[tool_idx]:
+                    self._tool_z[tool_idx] = zmin
+
+    def result(self, tool_count: int = 0) -> ExtentsStats:
+        """
+        - tool_count: 공구 구간 수(CycleTimeStats.tools 길이). 마지막 이동 뒤의 TOOL CALL 구간까지 채웁니다.
+        """
+        while len(self._tool_z) < tool_count:
+            self._tool_z.append(math.inf)
+        return ExtentsStats(
+            x_min=_fin(self.lo["x"]), x_max=_fin(self.hi["x"]),
+            y_min=_fin(self.lo["y"]), y_max=_fin(self.hi["y"]),
+            z_min=_fin(self.lo["z"]), z_max=_fin(self.hi["z"]),
+            tool_z=tuple(_fin(v) for v in self._tool_z),
+        )
+
+
+def format_tool_z(tool_calls: Sequence[Tuple[str, str]], tool_z: Sequence[Optional[float]]) -> str:
+    """
+    공구별 최저 Z 요약: 'T12 Z-15.2 / T5 Z-3'
+    - tool_z[0](첫 TOOL CALL 이전 이동)은 TOOL CALL이 없는 프로그램일 때만 표시합니다.
+    """
+    parts = []
+    for k, z in enumerate(tool_z):
+        if z is None:
+            continue
+        if k == 0:
+            if tool_calls:
+                continue
+            label = "-"
+        else:
+            label = f"T{tool_calls[k - 1][0]}" if k - 1 < len(tool_calls) else f"#{k}"
+        parts.append(f"{label} Z{z:+.3f}".rstrip("0").rstrip("."))
+    return " / ".join(parts)
+
+
+# =========================
+# 설비 행정 한계 검사
+# =========================
+
+# 축 한계: 숫자 1개(행정 길이 — 외곽 폭과 비교) 또는 (최소, 최대) 프로그램 좌표 범위
+AxisLimit = Union[float, Tuple[float, float]]
+MachineLimits = Mapping[str, Mapping[str, AxisLimit]]
+
+
+def find_machine_limits(limits: MachineLimits, *machine_names: str) -> Optional[Mapping[str, AxisLimit]]:
+    """
+    후보 설비명 순서대로(대소문자 무시) 한계 설정을 찾습니다.
+    - UI는 (헤더 설비명, 선택 설비명) 순서로 넘깁니다. 헤더가 번호 없는 "DINO"이고
+      "DINO" 항목이 없으면 선택 설비명의 한계를 씁니다.
+    """
+    by_upper = {str(k).strip().upper(): v for k, v in (limits or {}).items()}
+    for name in machine_names:
+        hit = by_upper.get((name or "").strip().upper())
+        if hit:
+            return hit
+    return None
+
+
+def check_envelope(cam_row, axis_limits: Optional[Mapping[str, AxisLimit]]) -> List[str]:
+    """
+    CamRow의 외곽 치수를 설비 한계와 비교해 초과 항목 메시지 목록을 반환합니다. (없으면 빈 목록)
+    - 한계 설정이 없거나 외곽 치수가 없는 축은 검사하지 않습니다.
+    - 숫자 한계(행정 길이): 외곽 폭(최대-최소)과 비교합니다. 워크 오프셋 위치와 무관하게
+      "이 설비에서 한 번에 가공할 수 없는 크기"만 잡습니다.
+    - (최소, 최대) 한계: 프로그램 좌표를 그대로 비교합니다. 공작물 원점 기준 값이므로
+      설비별 원점 설정 규칙이 고정된 경우에만 의미가 있습니다.
+    """
+    if not axis_limits:
+        return []
+
+    problems: List[str] = []
+    for axis in AXES:
+        limit = axis_limits.get(axis)
+        lo = getattr(cam_row, f"{axis}_min", None)
+        hi = getattr(cam_row, f"{axis}_max", None)
+        if limit is None or lo is None or hi is None:
+            continue
+        name = axis.upper()
+        if isinstance(limit, (int, float)):
+            if hi - lo > float(limit):
+                problems.append(f"{name} 폭 {hi - lo:.3f} > 행정 {float(limit):.3f}")
+        else:
+            lim_lo, lim_hi = float(limit[0]), float(limit[1])
+            if lo < lim_lo:
+                problems.append(f"{name} 최소 {lo:+.3f} < {lim_lo:+.3f}")
+            if hi > lim_hi:
+                problems.append(f"{name} 최대 {hi:+.3f} > {lim_hi:+.3f}")
+    return problems
+
+
+def extents_to_fields(stats: ExtentsStats, tool_calls: Sequence[Tuple[str, str]]) -> Dict[str, object]:
+    """
+    ExtentsStats를 CamRow 확장 필드 값으로 변환합니다.
+    """
+    return {
+        "x_min": stats.x_min, "x_max": stats.x_max,
+        "y_min": stats.y_min, "y_max": stats.y_max,
+        "z_min": stats.z_min, "z_max": stats.z_max,
+        "tool_z_depths": format_tool_z(tool_calls, stats.tool_z),
+    }
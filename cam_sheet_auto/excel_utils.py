@@ -1,9 +1,13 @@
 import os
 import sys  # 🔥 추가: sys 모듈 import
-import openpyxl
+import copy
 import datetime
+import io
+import pickle
+import threading
 import traceback
-from openpyxl.utils import column_index_from_string
+
+# openpyxl은 엑셀 저장 시에만 필요하므로 함수 안에서 불러옵니다. (앱 시작 시간 단축)
 
 # ✅ CAM SHEET.xlsx 파일 경로 설정
 def get_template_path():
@@ -15,9 +19,8 @@ def get_template_path():
 
     return os.path.join(base_path, "CAM SHEET.xlsx")
 
-# ✅ CAM SHEET 템플릿 경로 설정
+# ✅ CAM SHEET 템플릿 경로 설정 (경로 계산만, 로그는 저장할 때 출력)
 TEMPLATE_PATH = get_template_path()
-print(f"📂 엑셀 템플릿 경로: {TEMPLATE_PATH}")
 
 # ✅ 페이지별 데이터 입력 위치 (최대 24개씩)
 PAGE_RANGES = [
@@ -26,9 +29,18 @@ PAGE_RANGES = [
     ("K2", "T29"),  # 3페이지 (2~29행, 우측)
     ("K31", "T54")  # 4페이지 (31~54행, 우측)
 ]
+PAGE_BLOCK_ROWS = 24
+# ✅ 시트 1장에 들어가는 행 수(4블록 × 24행) — 넘치면 템플릿 서식 시트를 추가합니다.
+ROWS_PER_SHEET = PAGE_BLOCK_ROWS * len(PAGE_RANGES)
+# ✅ 블록 시작 열 기준 값 열 위치: 파일명, TOOL D/B, 공구 번호, 여유량(XY), 작업 내용
+BLOCK_COL_OFFSETS = (0, 1, 4, 5, 6)
+# ✅ 헤더 셀 위치(행, 열): 작업번호 / 설비명 / 날짜
+HEADER_CELLS = {"job_number": (3, 7), "machine_name": (3, 3), "date": (3, 10)}
 
 def col_to_num(cell_address):
     """엑셀 열 문자(A, B, ... AA)를 숫자로 변환하는 함수"""
+    from openpyxl.utils import column_index_from_string
+
     col_str = ''.join(filter(str.isalpha, cell_address))  # A6 → A / AA6 → AA
     return column_index_from_string(col_str)  # A → 1, AA → 27
 
@@ -41,16 +53,225 @@ def convert_number(value):
     except ValueError:
         return value  # 변환 불가능한 경우 원래 값 유지
 
-def set_value_in_merged_cell(sheet, row, col, value):
-    """📌 병합된 셀인지 확인 후 첫 번째 셀에만 값 입력"""
-    cell = sheet.cell(row=row, column=col)
+def build_merged_anchor_index(sheet):
+    """
+    📌 병합 셀 좌표 → 병합 첫 번째 셀(anchor) 인덱스
+    - {(row, col): (min_row, min_col)} — 병합 범위 안의 모든 칸을 1번만 펼쳐 둡니다.
+    - 같은 템플릿에서 나온 시트는 병합 구조가 같으므로 인덱스를 재사용할 수 있습니다.
+    """
+    index = {}
     for merged_range in sheet.merged_cells.ranges:
-        if cell.coordinate in merged_range:
-            min_col, min_row, _, _ = merged_range.bounds  # 병합된 첫 번째 셀 찾기
-            first_cell = sheet.cell(row=min_row, column=min_col)
-            first_cell.value = value  # ✅ 값 입력
-            return
-    cell.value = value  # ✅ 병합되지 않은 경우 값 입력
+        min_col, min_row, max_col, max_row = merged_range.bounds
+        for r in range(min_row, max_row + 1):
+            for c in range(min_col, max_col + 1):
+                index[(r, c)] = (min_row, min_col)
+    return index
+
+
+def set_value_in_merged_cell(sheet, row, col, value, merged_index=None):
+    """
+    📌 병합된 셀인지 확인 후 첫 번째 셀에만 값 입력
+    - merged_index(build_merged_anchor_index 결과)를 주면 병합 범위 전체를 훑지 않고 바로 찾습니다.
+    - 인덱스 없이 부르면(단발 호출) 인덱스를 만들지 않고 병합 범위를 직접 훑습니다.
+      여러 칸을 채울 때는 인덱스를 1번 만들어 넘기세요. (write_sheet_header / TemplateCache.merged_index)
+    """
+    if merged_index is None:
+        for merged_range in sheet.merged_cells.ranges:
+            min_col, min_row, max_col, max_row = merged_range.bounds
+            if min_row <= row <= max_row and min_col <= col <= max_col:
+                sheet.cell(row=min_row, column=min_col).value = value  # ✅ 병합된 첫 번째 셀에 입력
+                return
+        sheet.cell(row=row, column=col).value = value  # ✅ 병합되지 않은 경우 값 입력
+        return
+    min_row, min_col = merged_index.get((row, col), (row, col))  # 병합되지 않은 경우 자기 자신
+    sheet.cell(row=min_row, column=min_col).value = value  # ✅ 값 입력
+
+
+# =========================
+# 템플릿 캐시
+# =========================
+class TemplateCache:
+    """
+    📌 CAM SHEET.xlsx 템플릿 캐시
+    - 템플릿은 1번만 파싱(load_workbook)하고 직렬화(pickle)해 둡니다.
+    - workbook()은 직렬화본을 복원한 독립 사본을 돌려줍니다. (파싱보다 수십 배 빠름, 사본끼리 서로 영향 없음)
+    - 활성 시트의 병합 anchor 인덱스도 1번만 계산해 공유합니다.
+    - 템플릿 파일의 크기/수정시각이 바뀌면 다시 파싱합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._blob = None
+        self._merged_index = None
+
+    def _ensure_loaded(self):
+        st = os.stat(self.path)  # 파일이 없으면 FileNotFoundError
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if self._stamp != stamp:
+                import openpyxl
+
+                workbook = openpyxl.load_workbook(self.path)
+                self._merged_index = build_merged_anchor_index(workbook.active)
+                self._blob = pickle.dumps(workbook, protocol=pickle.HIGHEST_PROTOCOL)
+                self._stamp = stamp
+                workbook.close()
+            return self._blob, self._merged_index
+
+    def workbook(self):
+        """템플릿 워크북의 새 사본"""
+        blob, _ = self._ensure_loaded()
+        return pickle.loads(blob)
+
+    def merged_index(self):
+        """활성 시트의 병합 anchor 인덱스 (사본들이 공유하므로 수정 금지)"""
+        _, index = self._ensure_loaded()
+        return index
+
+
+_TEMPLATE_CACHES = {}
+_TEMPLATE_CACHES_LOCK = threading.Lock()
+
+
+def get_template_cache(path=None):
+    """경로별 TemplateCache (기본: TEMPLATE_PATH)"""
+    path = path or TEMPLATE_PATH
+    with _TEMPLATE_CACHES_LOCK:
+        cache = _TEMPLATE_CACHES.get(path)
+        if cache is None:
+            cache = _TEMPLATE_CACHES[path] = TemplateCache(path)
+        return cache
+
+
+def _block_origins():
+    """PAGE_RANGES 블록별 (시작 행, 시작 열)"""
+    return [(int(''.join(filter(str.isdigit, start_cell))), col_to_num(start_cell)) for start_cell, _ in PAGE_RANGES]
+
+
+def write_sheet_header(sheet, job_number, machine_name, date, merged_index=None):
+    """📌 시트 헤더(작업번호/설비명/날짜) 입력"""
+    if merged_index is None:
+        merged_index = build_merged_anchor_index(sheet)
+    for key, value in (("job_number", job_number), ("machine_name", machine_name), ("date", date)):
+        row, col = HEADER_CELLS[key]
+        set_value_in_merged_cell(sheet, row, col, value, merged_index)
+
+
+def _clear_data_blocks(sheet, origins):
+    """복사한 시트의 데이터 칸을 비웁니다. (서식/헤더는 유지)"""
+    for start_row, start_col in origins:
+        for i in range(PAGE_BLOCK_ROWS):
+            for offset in BLOCK_COL_OFFSETS:
+                sheet.cell(row=start_row + i, column=start_col + offset).value = None
+
+
+def _image_bytes(image):
+    """
+    📌 openpyxl Image의 원본 바이트를 읽습니다. (원본 핸들은 닫지 않음)
+    - Image._data()는 읽은 뒤 원본 파일 객체를 닫아 버려, 원본 시트를 저장할 때
+      "I/O operation on closed file"이 납니다. 그래서 ref를 직접 읽습니다.
+    """
+    ref = image.ref
+    if isinstance(ref, bytes):
+        return ref
+    if isinstance(ref, (str, os.PathLike)):
+        with open(ref, "rb") as f:
+            return f.read()
+    if hasattr(ref, "read"):
+        ref.seek(0)
+        data = ref.read()
+        ref.seek(0)  # 저장 시 원본이 처음부터 다시 읽히도록
+        return data
+    # PIL 이미지 객체
+    buf = io.BytesIO()
+    ref.save(buf, format="png")
+    return buf.getvalue()
+
+
+def _copy_print_layout(source, target):
+    """
+    📌 copy_worksheet가 옮기지 않는 인쇄/그림 설정을 복사합니다.
+    - copy_worksheet: 셀 값/서식, 행·열 크기, 병합, 여백(page_margins), 용지 설정(page_setup), 인쇄 옵션
+    - 여기서 추가: 인쇄 영역, 인쇄 제목 행/열, 머리글/바닥글(쪽 번호), 페이지 나누기, 그림(로고)
+    - 차트는 복사하지 않습니다. (템플릿에 없음)
+    """
+    if source.print_area:
+        target.print_area = source.print_area  # "'Sheet1'!$A$1:..." → 대상 시트 이름으로 바뀜
+    target.print_title_rows = source.print_title_rows
+    target.print_title_cols = source.print_title_cols
+    target.HeaderFooter = copy.deepcopy(source.HeaderFooter)
+    target.row_breaks = copy.deepcopy(source.row_breaks)
+    target.col_breaks = copy.deepcopy(source.col_breaks)
+
+    images = getattr(source, "_images", ())
+    if images:
+        from openpyxl.drawing.image import Image  # 그림이 읽혔다면 Pillow도 설치되어 있음
+
+        for image in images:
+            clone = Image(io.BytesIO(_image_bytes(image)))
+            clone.width, clone.height = image.width, image.height
+            clone.anchor = copy.deepcopy(image.anchor)
+            target.add_image(clone)
+
+
+def fill_template_sheets(workbook, rows, job_number, machine_name, date, merged_index=None, multi_sheet=True):
+    """
+    📌 템플릿 워크북에 행을 채웁니다.
+    - rows: (파일명, TOOL D/B, 공구 번호, 여유량, 작업 내용) 튜플을 차례로 내놓는 iterable
+      (리스트로 모으지 않고 1행씩 바로 셀에 씁니다)
+    - 첫 시트의 4블록(ROWS_PER_SHEET행)이 차면 첫 시트를 복사해 데이터 칸만 비운 시트를 추가합니다.
+      (시트 이름: "Sheet1 (2)", "Sheet1 (3)", ...)
+      - 셀 서식/병합/헤더 값/여백/용지 설정은 copy_worksheet가, 인쇄 영역/인쇄 제목/바닥글(쪽 번호)/
+        페이지 나누기/그림(로고)은 _copy_print_layout이 옮깁니다. 차트는 옮기지 않습니다.
+    - multi_sheet=False면 기존처럼 첫 시트까지만 쓰고 나머지는 버립니다. (경고 출력)
+    - 쓴 행 수를 반환합니다.
+    - 메모리: 행은 스트리밍으로 받지만 워크북은 메모리에 모두 올라가므로, 추가 시트마다
+      템플릿 시트 1장 분량(셀 서식/병합/그림)이 늘어납니다. openpyxl의 write_only 모드는
+      기존 파일(서식 템플릿)을 열 수도, copy_worksheet를 쓸 수도 없어 이 경로와 함께 쓸 수 없습니다.
+    """
+    first = workbook.active
+    write_sheet_header(first, job_number, machine_name, date, merged_index)
+    origins = _block_origins()
+
+    sheet = first
+    written = 0
+    for file_name, tool_db, tool_number, allowance, work_content in rows:
+        slot = written % ROWS_PER_SHEET
+        if written and slot == 0:
+            if not multi_sheet:
+                print(f"⚠ {ROWS_PER_SHEET}행을 넘는 데이터는 저장하지 않았습니다. (시트 추가 모드 꺼짐)")
+                break
+            sheet = workbook.copy_worksheet(first)
+            sheet.title = f"{first.title} ({written // ROWS_PER_SHEET + 1})"
+            _copy_print_layout(first, sheet)
+            _clear_data_blocks(sheet, origins)
+
+        block, i = divmod(slot, PAGE_BLOCK_ROWS)
+        start_row, start_col = origins[block]
+        values = (file_name, tool_db, convert_number(tool_number), convert_number(allowance), work_content)
+        for offset, value in zip(BLOCK_COL_OFFSETS, values):
+            sheet.cell(row=start_row + i, column=start_col + offset, value=value)
+        written += 1
+    return written
+
+
+def iter_table_rows(table_widget):
+    """📌 QTableWidget의 0~4열을 (파일명, TOOL D/B, 공구 번호, 여유량, 작업 내용) 튜플로 1행씩 내놓습니다."""
+    for r in range(table_widget.rowCount()):
+        yield tuple(table_widget.item(r, c).text() if table_widget.item(r, c) else "" for c in range(5))
+
+
+def iter_cam_rows_values(cam_rows, empty="N/A"):
+    """
+    📌 CamRow(또는 같은 속성을 가진 객체)를 시트용 튜플로 1행씩 내놓습니다.
+    - 빈 값은 empty로 씁니다. 기본 "N/A"는 스캔 결과를 테이블에 표시하는 규칙과 같습니다.
+    """
+    for r in cam_rows:
+        values = (r.file_name, r.tool_db, r.tool_no, r.allowance_xy, r.pg_name)
+        yield tuple(v if v else empty for v in values)
+
 
 def get_unique_filename(folder_path, base_filename):
     """중복된 파일명이 있으면 -2, -3 식으로 카운팅하여 새로운 파일명 생성"""
@@ -62,55 +283,54 @@ def get_unique_filename(folder_path, base_filename):
         new_filename = f"{name}-{counter}{ext}"  # 파일명-2.xlsx, 파일명-3.xlsx 형식으로 변경
     return new_filename
 
-def export_to_excel_with_auto_filename(job_number, machine_name, date, table_widget, folder_path):
-    """PyQt UI 데이터를 받아서 CAM SHEET.xlsx에 저장 후 데이터 폴더에 자동 파일명으로 저장"""
+def auto_export_path(folder_path, job_number):
+    """📌 데이터 폴더 안의 자동 저장 경로: CAM_SHEET_<작업번호>_<MMDD>.xlsx (중복 시 -2, -3 ...)"""
     today_date = datetime.datetime.today().strftime("%m%d")  # ✅ MMDD 형식으로 변경
     base_filename = f"CAM_SHEET_{job_number}_{today_date}.xlsx"
-    unique_filename = get_unique_filename(folder_path, base_filename)
-    save_path = os.path.join(folder_path, unique_filename)
+    return os.path.join(folder_path, get_unique_filename(folder_path, base_filename))
+
+
+def save_template_workbook(save_path, rows, job_number, machine_name, date, multi_sheet=True, template_path=None):
+    """
+    📌 템플릿 사본에 rows를 채워 save_path로 저장하고 (행 수, 시트 수)를 반환합니다.
+    - 템플릿이 없거나 저장에 실패하면 예외를 그대로 올립니다. (호출 측에서 메시지 처리)
+    """
+    template = get_template_cache(template_path or TEMPLATE_PATH)
+    workbook = template.workbook()
+    try:
+        written = fill_template_sheets(
+            workbook, rows, job_number, machine_name, date, template.merged_index(), multi_sheet=multi_sheet
+        )
+        sheets = len(workbook.worksheets)
+        workbook.save(save_path)
+    finally:
+        workbook.close()
+    return written, sheets
 
-    
+
+def export_to_excel_with_auto_filename(job_number, machine_name, date, table_widget, folder_path, multi_sheet=True):
+    """
+    PyQt UI 데이터를 받아서 CAM SHEET.xlsx에 저장 후 데이터 폴더에 자동 파일명으로 저장
+    - auto_export_path + save_template_workbook을 호출하는 호환용 진입점입니다.
+      (GUI 스레드에서 위젯을 직접 읽으므로, 화면에서는 ExcelExportThread + write_cam_rows_sheet를 사용)
+    - 96행(4블록)을 넘으면 템플릿 서식 시트를 필요한 만큼 추가합니다. (multi_sheet=False면 96행까지만)
+
+    반환: 저장 경로, 실패하면 None
+    """
+    save_path = auto_export_path(folder_path, job_number)
 
     if not os.path.exists(TEMPLATE_PATH):
         print(f"❌ 템플릿 파일을 찾을 수 없습니다! 현재 경로: {TEMPLATE_PATH}")
         return None
 
     try:
-        workbook = openpyxl.load_workbook(TEMPLATE_PATH)
-        sheet = workbook.active  # 첫 번째 시트 선택
-        set_value_in_merged_cell(sheet, 3, 7, job_number)
-        set_value_in_merged_cell(sheet, 3, 3, machine_name)
-        set_value_in_merged_cell(sheet, 3, 10, date)
-
-        total_rows = table_widget.rowCount()
-        row_offset = 0
-        for page_index, (start_cell, end_cell) in enumerate(PAGE_RANGES):
-            if row_offset >= total_rows:
-                break
-            start_row = int(''.join(filter(str.isdigit, start_cell)))
-            start_col = col_to_num(start_cell)
-            for i in range(24):
-                if row_offset >= total_rows:
-                    break
-                file_name = table_widget.item(row_offset, 0).text() if table_widget.item(row_offset, 0) else ""
-                tool_db = table_widget.item(row_offset, 1).text() if table_widget.item(row_offset, 1) else ""
-                tool_number = table_widget.item(row_offset, 2).text() if table_widget.item(row_offset, 2) else ""
-                allowance = table_widget.item(row_offset, 3).text() if table_widget.item(row_offset, 3) else ""
-                work_content = table_widget.item(row_offset, 4).text() if table_widget.item(row_offset, 4) else ""
-                sheet.cell(row=start_row + i, column=start_col, value=file_name)
-                sheet.cell(row=start_row + i, column=start_col + 1, value=tool_db)
-                sheet.cell(row=start_row + i, column=start_col + 4, value=convert_number(tool_number))
-                sheet.cell(row=start_row + i, column=start_col + 5, value=convert_number(allowance))
-                sheet.cell(row=start_row + i, column=start_col + 6, value=work_content)
-                row_offset += 1
-        workbook.save(save_path)
-        workbook.close()
-        print(f"✅ 엑셀 저장 완료: {save_path}")
+        written, sheets = save_template_workbook(
+            save_path, iter_table_rows(table_widget), job_number, machine_name, date, multi_sheet=multi_sheet
+        )
+        print(f"✅ 엑셀 저장 완료: {save_path} ({written}행 / 시트 {sheets}장)")
         return save_path
     except Exception as e:
         error_message = f"❌ 파일 저장 중 오류 발생: {e}\n{traceback.format_exc()}"
-        
-        # CMD에서 강제 출력
         print(error_message)
 
         # 로그 파일 강제 생성
@@ -0,0 +1,82 @@
+# cam_sheet_auto/excel_writer.py
+"""
+CamRow → Excel 저장 계층 (Qt/pandas 미사용).
+
+- 입력은 CamRow(또는 같은 속성을 가진 CamRowView 등) 시퀀스입니다. QTableWidget을 읽지 않습니다.
+- 두 가지 형식:
+  - 표(write_cam_rows_table, functions.export_to_excel): 1행 헤더 + 데이터.
+    openpyxl write_only 모드로 행을 바로 흘려 씁니다. (CLI scan --format xlsx는 write_rows_xlsx 직접 사용)
+  - CAM SHEET(write_cam_rows_sheet): 템플릿 서식. excel_utils의 템플릿 캐시/시트 추가 규칙을 그대로 사용합니다.
+- Qt 객체를 건드리지 않으므로 작업 스레드(QThread)나 다른 프로세스에서 그대로 호출할 수 있습니다.
+- openpyxl은 저장할 때만 import합니다.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from .excel_utils import iter_cam_rows_values, save_template_workbook
+
+# (헤더, CamRow 속성) — CAM 화면 테이블 열 순서 그대로
+# (ui 테이블 헤더, SHEET 추출 스냅샷, 표 내보내기가 모두 이 정의를 씁니다. ui는 열 번호로도 읽으므로 순서 변경 금지)
+TABLE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("FILE명", "file_name"),
+    ("TOOL D / B", "tool_db"),
+    ("공구 번호", "tool_no"),
+    ("여유량(XY)", "allowance_xy"),
+    ("작업 내용", "pg_name"),
+    ("냉각수", "coolant"),
+)
+
+
+def write_rows_xlsx(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]], sheet_title: str = "CAM") -> int:
+    """
+    header 1행 + rows를 write_only 모드로 저장하고 데이터 행 수를 반환합니다.
+    - 행을 모아 두지 않고 바로 써서 메모리가 행 수에 따라 늘지 않습니다.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append(list(header))
+    count = 0
+    for row in rows:
+        ws.append(list(row))
+        count += 1
+    wb.save(path)
+    return count
+
+
+def write_cam_rows_table(
+    path: str,
+    cam_rows: Iterable[Any],
+    columns: Sequence[Tuple[str, str]] = TABLE_COLUMNS,
+) -> int:
+    """
+    CamRow 시퀀스를 단순 표 xlsx로 저장하고 행 수를 반환합니다.
+    - columns: (헤더, CamRow 속성) 목록 (기본: TABLE_COLUMNS)
+    """
+    attrs = [attr for _, attr in columns]
+    rows = ([getattr(r, a) for a in attrs] for r in cam_rows)
+    return write_rows_xlsx(path, [h for h, _ in columns], rows)
+
+
+def write_cam_rows_sheet(
+    path: str,
+    cam_rows: Iterable[Any],
+    job_number: str,
+    machine_name: str,
+    date: str,
+    multi_sheet: bool = True,
+    template_path: Optional[str] = None,
+    empty: str = "N/A",
+) -> Tuple[int, int]:
+    """
+    CamRow 시퀀스를 CAM SHEET 템플릿에 채워 저장하고 (행 수, 시트 수)를 반환합니다.
+    - 96행을 넘으면 템플릿 서식 시트를 추가합니다. (multi_sheet=False면 96행까지만)
+    - empty: 빈 값 대신 쓸 문자열 (테이블 스냅샷처럼 빈 칸을 그대로 두려면 "")
+    """
+    return save_template_workbook(
+        path, iter_cam_rows_values(cam_rows, empty), job_number, machine_name, date,
+        multi_sheet=multi_sheet, template_path=template_path,
+    )
@@ -0,0 +1,188 @@
+# cam_sheet_auto/folder_watch.py
+"""
+CAM 폴더 감시(Watch) 모드.
+
+- 네이티브 감시(QFileSystemWatcher: Linux inotify / Windows ReadDirectoryChangesW)를 우선 사용합니다.
+- 감시 등록에 실패하거나 네트워크 경로(UNC)면 주기적 스냅샷 비교(polling)로 대체합니다.
+- 짧은 시간에 몰린 이벤트는 debounce로 묶어 1회만 처리합니다.
+- 변경된 파일만 다시 분석하여 행 단위(추가/수정/삭제) 시그널로 전달합니다.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, Signal
+
+from .cam_core import scan_cam_changes, snapshot_h_files
+from .scan_cache import ScanCache
+
+
+class _ChangeScanThread(QThread):
+    """
+    변경분 스캔을 백그라운드에서 1회 수행하는 스레드.
+    """
+    scanned = Signal(int, object)  # (generation, (snapshot, added, updated, removed))
+
+    def __init__(self, generation: int, folder_path: str, previous: Dict[str, Tuple[int, int]],
+                 cache: Optional[ScanCache], analyze: bool = False):
+        super().__init__()
+        self.generation = generation
+        self.folder_path = folder_path
+        self.previous = previous
+        self.cache = cache
+        self.analyze = analyze
+
+    def run(self):
+        try:
+            result = scan_cam_changes(self.folder_path, self.previous, self.cache, self.analyze)
+        except Exception as e:
+            print(f"❌ 폴더 감시 스캔 오류: {e}")
+            result = None
+        finally:
+            if self.cache is not None:
+                self.cache.release_thread()
+        self.scanned.emit(self.generation, result)
+
+
+class FolderWatcher(QObject):
+    """
+    선택된 폴더의 .h 파일 변경을 감시하여 행 단위 시그널을 보냅니다.
+
+    rows_inserted(list[CamRow]) / rows_updated(list[CamRow]) / rows_removed(list[str: 파일명])
+    - analyze: 변경 파일을 프로그램 전체까지 분석할지 여부 (기본: 헤더만, 화면은 전체 분석을 따로 채움)
+    """
+    rows_inserted = Signal(list)
+    rows_updated = Signal(list)
+    rows_removed = Signal(list)
+
+    def __init__(self, parent=None, *, debounce_ms: int = 400, poll_ms: int = 2000,
+                 cache: Optional[ScanCache] = None, analyze: bool = False):
+        super().__init__(parent)
+        self.cache = cache
+        self.analyze = analyze
+        self.folder_path = ""
+        self.mode = ""  # "native" | "poll" | ""
+
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._generation = 0
+        self._thread: Optional[_ChangeScanThread] = None
+        self._dirty = False
+
+        self._fs = QFileSystemWatcher(self)
+        self._fs.directoryChanged.connect(self._on_fs_event)
+        self._fs.fileChanged.connect(self._on_fs_event)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._run_change_scan)
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(poll_ms)
+        self._poll.timeout.connect(self._run_change_scan)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def start(self, folder_path: str) -> None:
+        """
+        folder_path 감시를 시작합니다. (기존 감시는 중단)
+        - 시작 시점의 스냅샷을 기준으로 이후 변경만 보고합니다.
+        """
+        self.stop()
+        if not folder_path or not os.path.isdir(folder_path):
+            return
+
+        self.folder_path = folder_path
+        self._snapshot = snapshot_h_files(folder_path)
+
+        is_network = folder_path.startswith(("\\\\", "//"))
+        if not is_network and self._fs.addPath(folder_path):
+            self._sync_file_watches()
+            self.mode = "native"
+        else:
+            self._poll.start()
+            self.mode = "poll"
+        print(f"👀 폴더 감시 시작({self.mode}): {folder_path}")
+
+    def stop(self) -> None:
+        """
+        감시를 중단합니다. 진행 중인 스캔 결과는 generation 비교로 버려집니다.
+        """
+        self._generation += 1
+        self._debounce.stop()
+        self._poll.stop()
+        watched = self._fs.directories() + self._fs.files()
+        if watched:
+            self._fs.removePaths(watched)
+        self._dirty = False
+        self.folder_path = ""
+        self.mode = ""
+
+    def shutdown(self) -> None:
+        """
+        감시를 중단하고 진행 중인 변경 스캔이 끝날 때까지 기다립니다. (종료 시 캐시를 닫기 전에 호출)
+        """
+        self.stop()
+        if self._thread is not None:
+            self._thread.wait()
+            self._thread = None
+
+    # -------------------------
+    # Internal
+    # -------------------------
+    def _sync_file_watches(self) -> None:
+        """
+        현재 스냅샷의 파일을 개별 감시 목록에 맞춥니다.
+        (저장 시 파일을 교체하는 편집기는 감시가 풀리므로 스캔마다 다시 맞춥니다)
+        """
+        wanted = {os.path.join(self.folder_path, n) for n in self._snapshot}
+        current = set(self._fs.files())
+        stale = list(current - wanted)
+        missing = [p for p in wanted - current if os.path.exists(p)]
+        if stale:
+            self._fs.removePaths(stale)
+        if missing:
+            self._fs.addPaths(missing)
+
+    def _on_fs_event(self, _path: str) -> None:
+        self._debounce.start()
+
+    def _run_change_scan(self) -> None:
+        if not self.folder_path:
+            return
+        if self._thread is not None and self._thread.isRunning():
+            self._dirty = True
+            return
+
+        self._thread = _ChangeScanThread(
+            self._generation, self.folder_path, dict(self._snapshot), self.cache, self.analyze
+        )
+        self._thread.scanned.connect(self._on_scanned)
+        self._thread.start()
+
+    def _on_scanned(self, generation: int, result) -> None:
+        if generation != self._generation or result is None:
+            # 중단/재시작 사이에 쌓인 이벤트는 새 감시 기준으로 다시 처리
+            if self._dirty and self.folder_path:
+                self._dirty = False
+                self._debounce.start()
+            return
+
+        snapshot, added, updated, removed = result
+        self._snapshot = snapshot
+        if self.mode == "native":
+            self._sync_file_watches()
+
+        if removed:
+            self.rows_removed.emit(removed)
+        if updated:
+            self.rows_updated.emit(updated)
+        if added:
+            self.rows_inserted.emit(added)
+
+        if self._dirty:
+            self._dirty = False
+            self._debounce.start()
@@ -1,10 +1,28 @@
 import os
 import re
-import pandas as pd
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from .encoding_utils import detect_encoding, read_file_with_encoding, safe_decode
+from .cancel import ScanCancelled, check_cancel
+from .encoding_utils import read_file_with_encoding
 # ===== 작업번호 추출 캐시(폴더 단위) =====
-_JOBNO_CACHE = {}
+# 키: 정규화된 폴더 경로 / 값: 작업번호. 오래 안 쓴 폴더부터 밀어내는 LRU입니다.
+_JOBNO_CACHE = OrderedDict()
+_JOBNO_CACHE_MAX = 256
+_JOBNO_CACHE_LOCK = threading.Lock()
+_JOBNO_STATS = {"hits": 0, "misses": 0}
+
+# ===== 파서 버전 =====
+# 스캔 결과(extract_tool_data / nc_analyzer)가 달라지는 수정을 하면 올려야 합니다. (스캔 캐시 무효화용)
+# 2: 프로그램 전체 분석 필드(rpm/feed/woc/줄 수 등) 추가
+# 3: 가공 시간 추정 필드(cycle_time_s 등) 추가
+# 4: 공구 경로 외곽 치수(x_min~z_max, tool_z_depths) 추가
+PARSER_VERSION = 4
+
+# ===== 헤더 분석 구간 =====
+# 공구/여유량/설비 정보는 프로그램 앞부분에만 있으므로 이 구간만 읽습니다.
+HEADER_MAX_LINES = 80
+HEADER_MAX_CHARS = 256 * 1024
 
 
 def get_default_data():
@@ -17,12 +35,53 @@ def get_default_data():
     }
 
 
+def get_jobno_cache_stats():
+    """작업번호 캐시 진단용 통계 (hits, misses, size)"""
+    with _JOBNO_CACHE_LOCK:
+        return {**_JOBNO_STATS, "size": len(_JOBNO_CACHE)}
+
+
+def clear_jobno_cache():
+    """작업번호 캐시와 통계를 비움 (폴더명이 바뀐 경우 등)"""
+    with _JOBNO_CACHE_LOCK:
+        _JOBNO_CACHE.clear()
+        _JOBNO_STATS["hits"] = 0
+        _JOBNO_STATS["misses"] = 0
+
+
 def extract_job_number(folder_path, debug: bool = False):
-    """경로 내에서 숫자가 6자리 이상 포함되고 '_'를 포함한 폴더명을 찾아 반환"""
+    """경로 내에서 숫자가 6자리 이상 포함되고 '_'를 포함한 폴더명을 찾아 반환
+
+    - 같은 폴더는 1회만 계산하고 이후에는 _JOBNO_CACHE 값을 돌려줍니다.
+    - debug=True 이면 캐시를 건너뛰고 판정 과정을 출력합니다.
+    - 존재하지 않는 폴더("N/A")는 캐시하지 않습니다.
+    """
+    key = os.path.normcase(os.path.normpath(folder_path))
+    if not debug:
+        with _JOBNO_CACHE_LOCK:
+            cached = _JOBNO_CACHE.get(key)
+            if cached is not None:
+                _JOBNO_CACHE.move_to_end(key)
+                _JOBNO_STATS["hits"] += 1
+                return cached
+            _JOBNO_STATS["misses"] += 1
+
     if not os.path.exists(folder_path):
         print(f"❌ 폴더 경로가 존재하지 않습니다: {folder_path}")
         return "N/A"
 
+    job_number = _resolve_job_number(folder_path, debug)
+
+    with _JOBNO_CACHE_LOCK:
+        _JOBNO_CACHE[key] = job_number
+        _JOBNO_CACHE.move_to_end(key)
+        while len(_JOBNO_CACHE) > _JOBNO_CACHE_MAX:
+            _JOBNO_CACHE.popitem(last=False)
+    return job_number
+
+
+def _resolve_job_number(folder_path, debug: bool = False):
+    """extract_job_number의 실제 판정 로직 (캐시 없음)"""
     # 경로를 '/' 또는 '\' 기준으로 분할하여 폴더별로 리스트화
     
     path_parts = os.path.normpath(folder_path).split(os.sep)
@@ -63,17 +122,114 @@ def extract_job_number(folder_path, debug: bool = False):
         print("🔍 6자리 이상 숫자가 포함되고 '_'가 있는 폴더를 찾지 못함. 'N/A' 반환")
     return "N/A"
 
-def extract_tool_data(file_path, folder_path):
+# ===== 헤더 파싱 패턴(모듈 로드 시 1회 컴파일) =====
+# 라인 분류는 line.upper() 1회 + 키워드 부분문자열 검사로 하고,
+# 키워드가 있는 라인에만 해당 필드 정규식을 실행합니다.
+_TNAME_RE = re.compile(r"TNAME\s*:\s*(.+)", re.IGNORECASE)
+_TOOL_CALL_RE = re.compile(r"TOOL CALL\s+(\d+)\s+Z", re.IGNORECASE)
+_ALLOWANCE_RE = re.compile(r"ALLOWANCE\s*:\s*([-\d\.]+)", re.IGNORECASE)
+_PG_RE = re.compile(r"\[([^\]]+)\]")
+_JOB_RE = re.compile(r"JOB NUMBER\s*:\s*(\S+)", re.IGNORECASE)
+
+# 설비/냉각수: 우선순위 순서의 named group 교대식 1개로 판정합니다.
+# (한 줄에 여러 개가 있으면 목록 앞쪽 항목이 이김 — 기존 for/break 순서와 동일)
+EQUIPMENT_NAMES = ("DINO_MAX#3", "DINO_MAX#2", "DINO_MAX#1", "DINO", "STINGER")
+_EQUIP_RE = re.compile(
+    "|".join(f"(?P<e{i}>{re.escape(name)})" for i, name in enumerate(EQUIPMENT_NAMES)),
+    re.IGNORECASE,
+)
+
+COOLANT_CODES = (
+    (r"\bM08\b", "OIL"),
+    (r"\bM8\b", "OIL"),
+    (r"\bM17\b", "AIR"),
+    (r"\bM28\b", "IN AIR"),
+    (r"\bM18\b", "IN OIL"),
+)
+_COOLANT_RE = re.compile("|".join(f"(?P<c{i}>{pat})" for i, (pat, _) in enumerate(COOLANT_CODES)))
+_COOLANT_HINTS = ("M8", "M08", "M17", "M28", "M18")
+
+
+def _best_named_match(pattern, text: str):
+    """
+    교대식 named group 중 가장 우선순위가 높은(번호가 작은) 매칭 번호를 반환합니다.
+    매칭이 없으면 None.
+    """
+    best = None
+    for m in pattern.finditer(text):
+        idx = int(m.lastgroup[1:])
+        if best is None or idx < best:
+            best = idx
+            if idx == 0:
+                break
+    return best
+
+
+def parse_header_lines(lines, job_number: str = "N/A"):
+    """
+    .h 파일 헤더 라인(strip 완료)에서 CAM 정보를 한 번의 순회로 추출합니다.
+    - 반환: (tool_db, tool_number, allowance_value, pg_name, equip_name, job_number, coolant_code)
+    - job_number: 파일 안에 JOB NUMBER가 없을 때 사용할 기본값(폴더 기준 작업번호)
+    """
+    tool_db = "N/A"
+    tool_number = "N/A"
+    allowance_value = "N/A"
+    pg_name = "N/A"
+    equip_name = "N/A"
+    coolant_code = "OFF"
+
+    for line in lines:
+        line_upper = line.upper()
+
+        if "TNAME" in line_upper:
+            m = _TNAME_RE.search(line)
+            if m:
+                tool_db = m.group(1).strip()
+        if "TOOL CALL" in line_upper:
+            m = _TOOL_CALL_RE.search(line)
+            if m:
+                tool_number = m.group(1).strip()
+        if "ALLOWANCE" in line_upper:
+            m = _ALLOWANCE_RE.search(line)
+            if m:
+                allowance_value = m.group(1).strip()
+        if "[" in line:
+            m = _PG_RE.search(line)
+            if m:
+                pg_name = m.group(1).strip()
+        if "JOB NUMBER" in line_upper:
+            m = _JOB_RE.search(line)
+            if m:
+                job_number = m.group(1).strip()
+
+        if equip_name == "N/A" and ("DINO" in line_upper or "STINGER" in line_upper):
+            idx = _best_named_match(_EQUIP_RE, line)
+            if idx is not None:
+                equip_name = EQUIPMENT_NAMES[idx]
+
+        if coolant_code == "OFF" and any(h in line_upper for h in _COOLANT_HINTS):
+            idx = _best_named_match(_COOLANT_RE, line_upper)
+            if idx is not None:
+                coolant_code = COOLANT_CODES[idx][1]
+
+    return tool_db, tool_number, allowance_value, pg_name, equip_name, job_number, coolant_code
+
+
+def extract_tool_data(file_path, folder_path, cancel=None):
     """
     파일에서 TOOL CALL 및 TOOL D/B(TNAME:) 정보를 추출합니다.
     - 반환 구조:
       (tool_db, tool_number, allowance_value, pg_name, equip_name,
        job_number, date, coolant_code, detected_encoding)
+    - cancel(CancelToken)이 취소되면 파일을 열기 전/분석 전에 ScanCancelled를 발생시킵니다.
     """
     try:
+        check_cancel(cancel)
         detected_encoding = "utf-8"
 
-        lines, detected_encoding = read_file_with_encoding(file_path)
+        lines, detected_encoding = read_file_with_encoding(
+            file_path, max_lines=HEADER_MAX_LINES, max_chars=HEADER_MAX_CHARS
+        )
         if not lines:
             return (
                 "N/A", "N/A", "N/A", "N/A",
@@ -81,64 +237,13 @@ def extract_tool_data(file_path, folder_path):
                 "OFF", detected_encoding
             )
 
-        lines = [line.strip() for line in lines[:80]]
+        check_cancel(cancel)
+        lines = [line.strip() for line in lines[:HEADER_MAX_LINES]]
 
-        tool_db = "N/A"
-        tool_number = "N/A"
-        allowance_value = "N/A"
-        pg_name = "N/A"
-        equip_name = "N/A"
-        job_number = extract_job_number(folder_path)
         date = datetime.now().strftime("%m-%d")
-        coolant_code = "OFF"
-
-        equipment_patterns = [
-            r"DINO_MAX#3", r"DINO_MAX#2",
-            r"DINO_MAX#1", r"DINO", r"STINGER"
-        ]
-
-        coolant_map = {
-            r"\bM08\b": "OIL",
-            r"\bM8\b": "OIL",
-            r"\bM17\b": "AIR",
-            r"\bM28\b": "IN AIR",
-            r"\bM18\b": "IN OIL",
-        }
-
-        for line in lines:
-            line_upper = line.upper()
-
-            match_tname = re.search(r"TNAME\s*:\s*(.+)", line, re.IGNORECASE)
-            if match_tname:
-                tool_db = match_tname.group(1).strip()
-
-            match_tool_call = re.search(r"TOOL CALL\s+(\d+)\s+Z", line, re.IGNORECASE)
-            if match_tool_call:
-                tool_number = match_tool_call.group(1).strip()
-
-            match_allowance = re.search(r"ALLOWANCE\s*:\s*([-\d\.]+)", line, re.IGNORECASE)
-            if match_allowance:
-                allowance_value = match_allowance.group(1).strip()
-
-            match_pg = re.search(r"\[([^\]]+)\]", line)
-            if match_pg:
-                pg_name = match_pg.group(1).strip()
-
-            if equip_name == "N/A":
-                for pattern in equipment_patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        equip_name = pattern
-                        break
-
-            match_job = re.search(r"JOB NUMBER\s*:\s*(\S+)", line, re.IGNORECASE)
-            if match_job:
-                job_number = match_job.group(1).strip()
-
-            if coolant_code == "OFF":
-                for pattern, meaning in coolant_map.items():
-                    if re.search(pattern, line_upper):
-                        coolant_code = meaning
-                        break
+        tool_db, tool_number, allowance_value, pg_name, equip_name, job_number, coolant_code = parse_header_lines(
+            lines, extract_job_number(folder_path)
+        )
 
         return (
             tool_db, tool_number, allowance_value, pg_name,
@@ -146,6 +251,8 @@ def extract_tool_data(file_path, folder_path):
             coolant_code, detected_encoding
         )
 
+    except ScanCancelled:
+        raise
     except Exception as e:
         print(f"❌ 파일 분석 오류: {e}")
         return (
@@ -156,15 +263,9 @@ def extract_tool_data(file_path, folder_path):
 
 
 
-def export_to_excel(file_path, table):
-    """QTableWidget 데이터를 Excel로 저장하는 함수"""
-    data = []
-    for row in range(table.rowCount()):
-        row_data = []
-        for col in range(table.columnCount()):
-            item = table.item(row, col)
-            row_data.append(item.text() if item else "")
-        data.append(row_data)
-    
-    df = pd.DataFrame(data, columns=["FILE명", "TOOL D / B", "공구 번호", "여유량(XY)", "작업 내용", "설비명", "작업번호"])
-    df.to_excel(file_path, index=False)
+def export_to_excel(file_path, cam_rows):
+    """CamRow 시퀀스를 표 형식 Excel로 저장하는 함수 (헤더/열 순서는 CAM 화면 테이블과 같음)"""
+    # pandas/QTableWidget 없이 excel_writer의 스트리밍 저장으로 씁니다.
+    from .excel_writer import write_cam_rows_table
+
+    return write_cam_rows_table(file_path, cam_rows)
@@ -0,0 +1,215 @@
+# cam_sheet_auto/nc_analyzer.py
+"""
+Heidenhain(.h) 프로그램 전체 스트리밍 분석.
+
+- 헤더(80줄)만 보는 extract_tool_data와 달리, 프로그램 끝까지 읽어
+  TOOL CALL(공구번호 + S회전수), 사용 이송(F), 줄 수, 이동 블록(세그먼트) 수를 집계합니다.
+- 파일은 줄 경계로 자른 고정 크기 청크 단위로 읽으므로 메모리는 파일 크기와 무관합니다.
+- 청크 단위 bytes 정규식만 사용하고 줄 단위 파이썬 루프는 돌지 않습니다. (디스크 속도 수준)
+- 대상 인코딩은 cp949/utf-8 등 ASCII 호환 인코딩입니다. (NC 워드는 모두 ASCII)
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .cancel import CancelToken, check_cancel
+from .cycle_time import CycleTimeStats, new_accumulator
+from .envelope import ExtentsAccumulator, ExtentsStats, extents_to_fields
+
+# 한 번에 읽는 크기(줄 경계로 잘라 처리, 메모리 사용량 상한)
+ANALYZE_CHUNK_BYTES = 4 * 1024 * 1024
+
+# TOOL CALL <번호 또는 "이름"> [축] [S<회전수>]
+_TOOL_CALL_RE = re.compile(rb"TOOL CALL[ \t]+(\d+|\"[^\"\n]*\")?([^\n;]*)", re.IGNORECASE)
+_SPINDLE_RE = re.compile(rb"(?:^|[ \t])S[ \t]*\+?(\d+(?:\.\d*)?)", re.IGNORECASE)
+# 이동 블록: (줄번호) L / LP / C / CP / CR / CT
+# - 줄 시작(\n) 리터럴로 시작해야 정규식 엔진이 빠른 탐색을 사용합니다.
+_SEGMENT_RE = re.compile(rb"\n[ \t]*(?:\d+[ \t]+)?(?:LP?|C[PRT]?)[ \t\r]")
+# 이송 F<값> (FMAX/FAUTO 등은 숫자가 아니므로 제외)
+_FEED_RE = re.compile(rb" F\+?(\d+(?:\.\d*)?)(?![\d.])")
+# 사이클 이송(Q206: 절입 이송, Q207: 가공 이송)
+_CYCLE_FEED_RE = re.compile(rb"Q20[67][ \t]*=[ \t]*\+?(\d+(?:\.\d*)?)")
+# 헤더 주석의 측면 절입량(스텝오버)
+_WOC_RE = re.compile(rb"\b(?:STEP[ _]?OVER|WOC|AE)\b[ \t]*[:=][ \t]*\+?(\d+(?:\.\d*)?)", re.IGNORECASE)
+# WOC는 헤더 주석에만 있으므로 앞부분만 검색합니다.
+_WOC_SEARCH_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class NcProgramStats:
+    """
+    프로그램 전체 분석 결과.
+    - tool_calls: 등장 순서대로 (공구번호, S회전수) ("" = 미지정)
+    - feeds: 사용된 이송값 {값: 등장 횟수}
+    - cycle: 가공 시간 추정 결과 (NumPy가 없으면 None)
+    - extents: 공구 경로 외곽 치수 (NumPy가 없으면 None)
+    """
+    line_count: int = 0
+    segment_count: int = 0
+    tool_calls: Tuple[Tuple[str, str], ...] = ()
+    feeds: Tuple[Tuple[str, int], ...] = ()
+    woc: str = ""
+    cycle: Optional[CycleTimeStats] = None
+    extents: Optional[ExtentsStats] = None
+
+    @property
+    def rpm_text(self) -> str:
+        """S값(중복 제거, 등장 순서)을 '/'로 연결합니다."""
+        seen: List[str] = []
+        for _, s in self.tool_calls:
+            if s and s not in seen:
+                seen.append(s)
+        return "/".join(seen)
+
+    @property
+    def main_feed(self) -> str:
+        """가장 많이 쓰인 이송값(동률이면 큰 값)."""
+        if not self.feeds:
+            return ""
+        return max(self.feeds, key=lambda kv: (kv[1], float(kv[0])))[0]
+
+    @property
+    def feeds_text(self) -> str:
+        """사용된 이송값을 오름차순으로 ','로 연결합니다."""
+        return ",".join(sorted((f for f, _ in self.feeds), key=float))
+
+    @property
+    def tool_calls_text(self) -> str:
+        """'T12 S8000 / T5 S12000' 형태의 요약."""
+        parts = []
+        for no, s in self.tool_calls:
+            parts.append(f"T{no} S{s}" if s else f"T{no}")
+        return " / ".join(parts)
+
+
+def _normalize_number(raw: bytes) -> str:
+    """b'1200.' / b'1200.0' → '1200', b'0.50' → '0.5'"""
+    text = raw.decode("ascii")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text or "0"
+
+
+def analyze_nc_stream(f, cancel: Optional[CancelToken] = None,
+                      chunk_size: int = ANALYZE_CHUNK_BYTES) -> NcProgramStats:
+    """
+    바이너리 파일 객체 f를 현재 위치부터 끝까지 읽어 NcProgramStats를 반환합니다.
+    - cancel(CancelToken)이 취소되면 청크 경계에서 ScanCancelled를 발생시킵니다.
+    """
+    line_count = 0
+    segment_count = 0
+    tool_calls: List[Tuple[str, str]] = []
+    raw_feeds: Counter = Counter()
+    woc = ""
+    cycle = new_accumulator()
+    extents = ExtentsAccumulator() if cycle is not None else None
+
+    # 첫 줄도 '\n' 리터럴로 시작하도록 앞에 붙여 둡니다. (줄 수에는 반영하지 않음)
+    carry = b"\n"
+    first = True
+    last_byte = b""
+    while True:
+        check_cancel(cancel)
+        data = f.read(chunk_size)
+        if data:
+            last_byte = data[-1:]
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                carry += data
+                continue
+            block = carry + data[:cut + 1]
+            carry = data[cut:]  # 다음 블록도 '\n'으로 시작
+        else:
+            block = carry
+            carry = b""
+            if len(block) <= 1:
+                break
+
+        if first:
+            m = _WOC_RE.search(block, 0, _WOC_SEARCH_BYTES)
+            if m:
+                woc = _normalize_number(m.group(1))
+            first = False
+
+        # 시작 '\n'은 이전 블록 몫이므로 1개 빼고 셉니다.
+        line_count += block.count(b"\n") - 1
+        segment_count += len(_SEGMENT_RE.findall(block))
+
+        # 소문자 "tool call"도 인정하므로 리터럴 선검사 없이 찾습니다.
+        for m in _TOOL_CALL_RE.finditer(block):
+            no = (m.group(1) or b"").strip(b'"').decode("ascii", "replace")
+            s = _SPINDLE_RE.search(m.group(2))
+            tool_calls.append((no, _normalize_number(s.group(1)) if s else ""))
+
+        # 같은 값이 수백만 번 반복되므로 원본 bytes로 세고 마지막에 한 번만 정규화합니다.
+        raw_feeds.update(_FEED_RE.findall(block))
+        if b"Q20" in block:
+            raw_feeds.update(_CYCLE_FEED_RE.findall(block))
+
+        if cycle is not None:
+            motion = cycle.add_block(block)
+            if motion is not None:
+                extents.add(motion)
+
+        if not data:
+            break
+
+    # 마지막 줄이 개행 없이 끝나는 경우
+    if last_byte and last_byte != b"\n":
+        line_count += 1
+
+    feeds: Counter = Counter()
+    for raw, n in raw_feeds.items():
+        feeds[_normalize_number(raw)] += n
+
+    cycle_stats = cycle.result() if cycle is not None else None
+
+    return NcProgramStats(
+        line_count=line_count,
+        segment_count=segment_count,
+        tool_calls=tuple(tool_calls),
+        feeds=tuple(sorted(feeds.items(), key=lambda kv: float(kv[0]))),
+        woc=woc,
+        cycle=cycle_stats,
+        extents=extents.result(len(cycle_stats.tools)) if extents is not None else None,
+    )
+
+
+def analyze_nc_program(file_path: str, cancel: Optional[CancelToken] = None) -> NcProgramStats:
+    """
+    .h 프로그램 파일 전체를 스트리밍 분석합니다.
+    - 모달 값(좌표/이송/원호 중심)이 파일 앞에서부터 이어지므로 한 파일은 한 번에 순서대로 읽습니다.
+      병렬 처리는 폴더 스캔의 파일 단위로만 합니다.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        return analyze_nc_stream(f, cancel)
+
+
+def stats_to_fields(stats: NcProgramStats, rapid_mm_min: float) -> Dict[str, object]:
+    """
+    NcProgramStats를 CamRow 확장 필드 값으로 변환합니다.
+    - rapid_mm_min: 급송(FMAX) 시간 환산용 설비 급송 속도
+    """
+    fields: Dict[str, object] = {
+        "rpm": stats.rpm_text,
+        "feed": stats.main_feed,
+        "feeds": stats.feeds_text,
+        "woc": stats.woc,
+        "tool_calls": stats.tool_calls_text,
+        "line_count": stats.line_count,
+        "segment_count": stats.segment_count,
+    }
+    if stats.cycle is not None:
+        fields.update(
+            cut_time_s=round(stats.cycle.cut_time_s, 1),
+            rapid_count=stats.cycle.rapid_count,
+            rapid_length=round(stats.cycle.rapid_length, 1),
+            cycle_time_s=round(stats.cycle.cycle_time_s(rapid_mm_min), 1),
+        )
+    if stats.extents is not None:
+        fields.update(extents_to_fields(stats.extents, stats.tool_calls))
+    return fields
@@ -0,0 +1,221 @@
+# cam_sheet_auto/scan_cache.py
+"""
+CAM 폴더 스캔 결과(CamRow) 영속 캐시.
+
+- SQLite 파일 1개에 파일별 분석 결과를 저장합니다.
+- 키: 절대경로 + 파일 크기 + 수정시각(ns) + 파서 버전
+- 셋 중 하나라도 다르면 해당 파일만 다시 분석합니다.
+- 날짜(date) 컬럼은 파일 속성이 아니라 스캔 시점 값이므로 저장하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cam_models import CamRow
+
+
+def default_cache_path() -> Path:
+    """
+    캐시 DB 기본 경로를 반환합니다.
+    - EXE 실행 시 패키지 폴더는 임시 폴더이므로 사용자 로컬 폴더에 둡니다.
+    """
+    base = os.environ.get("LOCALAPPDATA") or str(Path.home())
+    return Path(base) / "machining_auto" / "cam_scan_cache.sqlite3"
+
+
+def normalize_path(path: str) -> str:
+    """
+    캐시 키로 쓰기 위한 경로 정규화(절대경로 + 대소문자 규칙).
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+
+# 저장 컬럼(CamRow에서 file_name/date 제외)
+_ROW_COLUMNS = (
+    "tool_db", "tool_no", "allowance_xy", "pg_name", "coolant",
+    "equip_name", "job_number", "detected_encoding",
+    "rpm", "feed", "feeds", "woc", "tool_calls", "line_count", "segment_count",
+    "cycle_time_s", "cut_time_s", "rapid_length", "rapid_count",
+    "x_min", "x_max", "y_min", "y_max", "z_min", "z_max", "tool_z_depths",
+)
+# TEXT가 아닌 컬럼
+_COLUMN_TYPES = {
+    "line_count": "INTEGER", "segment_count": "INTEGER", "rapid_count": "INTEGER",
+    "cycle_time_s": "REAL", "cut_time_s": "REAL", "rapid_length": "REAL",
+    "x_min": "REAL", "x_max": "REAL", "y_min": "REAL", "y_max": "REAL", "z_min": "REAL", "z_max": "REAL",
+}
+
+# (size, mtime_ns, parser_version, {컬럼: 값})
+CacheEntry = Tuple[int, int, int, Dict[str, str]]
+
+
+class ScanCache:
+    """
+    스캔 결과 캐시.
+    - 연결은 스레드마다 1개를 열어 재사용합니다. (QThread 등 다른 스레드에서 호출해도 안전)
+    - DB 오류는 캐시 미스로 취급하고 스캔은 계속 진행합니다. (오류가 난 연결은 닫고 다음 호출에서 다시 엽니다)
+    - 작업 스레드는 끝날 때 release_thread()로 자기 연결을 닫습니다. (QThread마다 연결이 남지 않도록)
+    - 다 쓴 뒤 close()로 모든 스레드의 연결을 닫습니다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or default_cache_path())
+        self._ready = False
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+
+    def __getstate__(self):
+        # 연결/스레드 로컬은 다른 프로세스로 넘기지 않습니다.
+        return {"db_path": self.db_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["db_path"])
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if not self._ready:
+            try:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                # 폴더를 만들 수 없으면 DB 오류와 같이 취급(캐시 없이 스캔)
+                raise sqlite3.OperationalError(f"캐시 폴더 생성 실패: {e}") from e
+        # close()는 다른 스레드에서 호출될 수 있으므로 check_same_thread=False (사용은 만든 스레드에서만)
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+        try:
+            if not self._ready:
+                cols = ", ".join(f"{c} {_COLUMN_TYPES.get(c, 'TEXT')}" for c in _ROW_COLUMNS)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cam_rows ("
+                    "path TEXT PRIMARY KEY, folder TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, parser_version INTEGER NOT NULL, "
+                    f"{cols})"
+                )
+                # 이전 버전 DB: 없는 컬럼 추가 (기존 행은 parser_version이 달라 어차피 재분석됨)
+                existing = {rec[1] for rec in conn.execute("PRAGMA table_info(cam_rows)")}
+                for c in _ROW_COLUMNS:
+                    if c not in existing:
+                        conn.execute(f"ALTER TABLE cam_rows ADD COLUMN {c} {_COLUMN_TYPES.get(c, 'TEXT')}")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cam_rows_folder ON cam_rows(folder)")
+                conn.commit()
+                self._ready = True
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._local.conn = conn
+        with self._conns_lock:
+            self._conns.append(conn)
+        return conn
+
+    def _drop_connection(self) -> None:
+        """
+        현재 스레드의 연결을 버립니다. (DB 오류 후 다음 호출에서 새로 연결)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._conns_lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def release_thread(self) -> None:
+        """
+        현재 스레드의 연결을 닫습니다. (작업 스레드의 run() 끝에서 호출, 이후 호출은 새로 연결)
+        """
+        self._drop_connection()
+
+    def close(self) -> None:
+        """
+        모든 스레드의 연결을 닫습니다. (이후 호출은 새로 연결)
+        """
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def load_folder(self, folder_path: str) -> Dict[str, CacheEntry]:
+        """
+        폴더에 속한 캐시 항목을 {정규화 경로: CacheEntry}로 반환합니다.
+        """
+        folder = normalize_path(folder_path)
+        try:
+            conn = self._connect()
+            cur = conn.execute(
+                f"SELECT path, size, mtime_ns, parser_version, {', '.join(_ROW_COLUMNS)} "
+                "FROM cam_rows WHERE folder = ?",
+                (folder,),
+            )
+            out: Dict[str, CacheEntry] = {}
+            for rec in cur:
+                out[rec[0]] = (rec[1], rec[2], rec[3], dict(zip(_ROW_COLUMNS, rec[4:])))
+            return out
+        except sqlite3.Error as e:
+            self._drop_connection()
+            print(f"⚠ 스캔 캐시 읽기 실패(전체 재분석): {e}")
+            return {}
+
+    def store_folder(
+        self,
+        folder_path: str,
+        entries: Iterable[Tuple[str, int, int, int, CamRow]],
+        keep_paths: Iterable[str],
+    ) -> None:
+        """
+        분석 결과를 저장하고, 폴더에서 사라진 파일의 캐시는 삭제합니다.
+
+        entries: (정규화 경로, size, mtime_ns, parser_version, CamRow)
+        keep_paths: 현재 폴더에 존재하는 파일의 정규화 경로
+        """
+        folder = normalize_path(folder_path)
+        records = [
+            (path, folder, size, mtime_ns, version, *(getattr(row, c) for c in _ROW_COLUMNS))
+            for path, size, mtime_ns, version, row in entries
+        ]
+        keep = set(keep_paths)
+        placeholders = ", ".join("?" for _ in range(5 + len(_ROW_COLUMNS)))
+        try:
+            conn = self._connect()
+            with conn:
+                if records:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO cam_rows (path, folder, size, mtime_ns, parser_version, "
+                        f"{', '.join(_ROW_COLUMNS)}) VALUES ({placeholders})",
+                        records,
+                    )
+                stale = [
+                    (p,) for (p,) in conn.execute("SELECT path FROM cam_rows WHERE folder = ?", (folder,))
+                    if p not in keep
+                ]
+                if stale:
+                    conn.executemany("DELETE FROM cam_rows WHERE path = ?", stale)
+        except sqlite3.Error as e:
+            self._drop_connection()
+            print(f"⚠ 스캔 캐시 저장 실패: {e}")
+
+    def clear(self) -> None:
+        """
+        캐시 전체를 비웁니다.
+        """
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM cam_rows")
+        except sqlite3.Error as e:
+            self._drop_connection()
+            print(f"⚠ 스캔 캐시 초기화 실패: {e}")
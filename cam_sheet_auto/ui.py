@@ -1,16 +1,27 @@
 # ui.py
+import bisect
 import os
 import re
 import sys
+import time
+import traceback
 from datetime import datetime
-from .cam_core import update_tool_call_in_folder
-import chardet  # 기존 코드 호환을 위해 유지(직접 사용하지 않아도 무방)
+from typing import Optional
+from .cam_core import renumber_tool_calls
 from .encoding_utils import safe_decode
-from .excel_utils import export_to_excel_with_auto_filename
+from .excel_utils import auto_export_path
+from .excel_writer import TABLE_COLUMNS, write_cam_rows_sheet
+from .cam_models import CamRow
 from .functions import extract_tool_data, extract_job_number
-from .cam_core import scan_cam_rows
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QFont, QPixmap, QIcon
+from .cam_core import iter_cam_rows
+from .scan_cache import ScanCache
+from .folder_watch import FolderWatcher
+from .cancel import CancelToken, ScanCancelled
+from .cycle_time import format_duration
+from .cam_row_store import CamRowStore
+from .envelope import check_envelope, find_machine_limits
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QPixmap, QIcon
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -28,9 +39,11 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QMenu,
     QAbstractItemView,
+    QProgressBar,
 )
 # ===== [PDF 출력/동시출력] 공용/출력 엔진 =====
 from machining_auto.common.print.common_blocks import HeaderPayload
+from machining_auto.setting_sheet_auto.settings_manager import load_machine_limits
 from .cam_print_engine import CamPrintEngine, CamPrintPayload
 from machining_auto.common.print.orchestrator import (
     export_setting_cam_combined_pdf,
@@ -49,49 +62,234 @@ def natural_sort_key(text: str):
 class FileLoaderThread(QThread):
     """
     백그라운드에서 폴더 내 .h 파일을 로드하는 스레드.
+    - stream=True 이면 분석되는 대로 batch_files개 또는 batch_ms 간격마다 행 묶음을 보냅니다.
+      (첫 행은 즉시 보냄) 마지막에는 전체 결과(CamRowStore)를 scan_done으로 한 번 더 보냅니다.
+    - generation: UI가 부여한 스캔 세대 번호. 모든 진행 시그널에 실어 보내며,
+      UI는 현재 세대가 아닌(대체된) 스캔의 결과를 버립니다.
+    - cancel(): 협조적 취소. 파일 경계에서 멈추고 결과 시그널은 보내지 않습니다.
+    - analyze: 프로그램 전체 분석(가공 시간/행정 범위) 포함 여부 (iter_cam_rows와 같음)
+    - 스캔 도중 예외가 나면 결과 시그널 대신 scan_failed로 오류 내용을 보냅니다.
+      (스트리밍으로 이미 보낸 일부 행은 UI가 지웁니다)
     """
-    files_loaded = Signal(list, list)  # (files_data, cam_rows)
-
-
-    def __init__(self, folder_path: str):
+    scan_done = Signal(int, object)  # (generation, CamRowStore)
+    scan_failed = Signal(int, str)  # (generation, 오류 메시지)
+    rows_batch = Signal(int, list)  # 스트리밍: (generation, CamRow 묶음(완료 순서))
+    progress = Signal(int, int, int)  # (generation, 처리한 파일 수, 전체 파일 수)
+
+
+    def __init__(
+        self,
+        folder_path: str,
+        workers: int = 1,
+        cache: Optional[ScanCache] = None,
+        stream: bool = False,
+        batch_files: int = 20,
+        batch_ms: int = 150,
+        generation: int = 0,
+        analyze: bool = False,
+    ):
         super().__init__()
         self.folder_path = folder_path
+        self.workers = workers
+        self.cache = cache
+        self.stream = stream
+        self.batch_files = batch_files
+        self.batch_ms = batch_ms
+        self.generation = generation
+        self.analyze = analyze
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        """
+        진행 중인 스캔을 취소합니다. (스레드는 파일 경계에서 스스로 종료)
+        """
+        self.cancel_token.cancel()
+
+    def _scan(self):
+        """
+        iter_cam_rows를 소비하면서 진행률(및 stream이면 행 묶음) 시그널을 보내고,
+        전체 목록(완료 순서)을 반환합니다. 정렬은 CamRowStore가 맡습니다.
+        """
+        total = 0
+
+        def _on_total(n: int):
+            nonlocal total
+            total = n
+            self.progress.emit(self.generation, 0, n)
+
+        rows = []
+        batch = []
+        last_flush = time.monotonic()
+        for row in iter_cam_rows(
+            self.folder_path,
+            workers=self.workers,
+            cache=self.cache,
+            on_total=_on_total,
+            cancel=self.cancel_token,
+            analyze=self.analyze,
+        ):
+            rows.append(row)
+            batch.append(row)
+            now = time.monotonic()
+            if len(rows) == 1 or len(batch) >= self.batch_files or (now - last_flush) * 1000 >= self.batch_ms:
+                if self.stream:
+                    self.rows_batch.emit(self.generation, batch)
+                self.progress.emit(self.generation, len(rows), total)
+                batch = []
+                last_flush = now
+
+        if batch:
+            if self.stream:
+                self.rows_batch.emit(self.generation, batch)
+            self.progress.emit(self.generation, len(rows), total)
+
+        return rows
 
     def run(self):
         """
-        폴더에서 .h 파일을 스캔하여 CamRow 리스트로 가져온 뒤,
-        UI 테이블 입력용 튜플 리스트로 변환하여 시그널로 전달합니다.
+        폴더에서 .h 파일을 스캔하여 CamRow 열 저장소(CamRowStore)로 만든 뒤 시그널로 전달합니다.
         """
         try:
-            rows = scan_cam_rows(self.folder_path)
+            rows = self._scan()
 
             if not rows:
                 print("⚠ 선택한 폴더에 .H 파일이 없습니다!")
-                self.files_loaded.emit([], [])
+                self.scan_done.emit(self.generation, CamRowStore(folder=self.folder_path))
                 return
 
-            files_data = []
-            for r in rows:
-                files_data.append(
-                    (
-                        r.file_name,
-                        r.tool_db,
-                        r.tool_no,
-                        r.allowance_xy,
-                        r.pg_name,
-                        r.equip_name,
-                        r.job_number,
-                        r.date,
-                        r.coolant,
-                    )
-                )
-            self.files_loaded.emit(files_data, rows)
+            self.scan_done.emit(self.generation, CamRowStore(rows, folder=self.folder_path))
 
+        except ScanCancelled:
+            print(f"⏹ 스캔 취소됨: {self.folder_path}")
 
         except Exception as e:
             print(f"❌ 폴더 로딩 오류: {e}")
-            self.files_loaded.emit([], [])
+            traceback.print_exc()
+            self.scan_failed.emit(self.generation, str(e) or type(e).__name__)
+
+        finally:
+            if self.cache is not None:
+                self.cache.release_thread()
+
+
+class ProgramAnalysisThread(QThread):
+    """
+    헤더만 읽어 표시한 뒤, 프로그램 전체 분석(RPM/Feed/WOC/가공 시간/외곽 치수)을 뒤에서 채우는 스레드.
+    - 20~200MB NC 프로그램을 통째로 읽으므로 폴더 로딩과 분리하여 낮은 우선순위로 돌립니다.
+    - ScanCache에 (크기, 수정 시각)으로 분석 결과를 남기므로, 다시 시작해도 바뀐 파일만 읽습니다.
+    - generation/cancel 규칙은 FileLoaderThread와 같습니다.
+    """
+    rows_analyzed = Signal(int, list)  # (generation, 분석된 CamRow 묶음)
+    analysis_done = Signal(int)  # generation
+
+    def __init__(
+        self,
+        folder_path: str,
+        workers: int = 1,
+        cache: Optional[ScanCache] = None,
+        batch_files: int = 20,
+        batch_ms: int = 500,
+        generation: int = 0,
+    ):
+        super().__init__()
+        self.folder_path = folder_path
+        self.workers = workers
+        self.cache = cache
+        self.batch_files = batch_files
+        self.batch_ms = batch_ms
+        self.generation = generation
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        """
+        진행 중인 분석을 취소합니다. (스레드는 파일 경계에서 스스로 종료)
+        """
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            batch = []
+            last_flush = time.monotonic()
+            for row in iter_cam_rows(
+                self.folder_path,
+                workers=self.workers,
+                cache=self.cache,
+                cancel=self.cancel_token,
+                analyze=True,
+            ):
+                batch.append(row)
+                now = time.monotonic()
+                if len(batch) >= self.batch_files or (now - last_flush) * 1000 >= self.batch_ms:
+                    self.rows_analyzed.emit(self.generation, batch)
+                    batch = []
+                    last_flush = now
+            if batch:
+                self.rows_analyzed.emit(self.generation, batch)
+            self.analysis_done.emit(self.generation)
+
+        except ScanCancelled:
+            print(f"⏹ 프로그램 분석 취소됨: {self.folder_path}")
+
+        except Exception as e:
+            # 분석 실패는 표시된 헤더 행에 영향을 주지 않습니다. (가공 시간/행정 경고만 빠짐)
+            print(f"❌ 프로그램 분석 오류: {e}")
+            traceback.print_exc()
+
+        finally:
+            if self.cache is not None:
+                self.cache.release_thread()
+
+
+class ToolRenumberThread(QThread):
+    """
+    표에서 바꾼 툴번호를 .h 파일 TOOL CALL에 반영하는 스레드.
+    - changes: {파일 경로: 새 공구번호} → renumber_tool_calls로 한 번에 적용(전부 성공 또는 전부 원복)
+    - 대용량 NC 파일도 GUI 스레드를 막지 않습니다.
+    - 끝나면 renumber_done(ok, {파일 경로: 메시지})를 보냅니다.
+    """
+    renumber_done = Signal(bool, dict)
+
+    def __init__(self, changes: dict):
+        super().__init__()
+        self.changes = dict(changes)
+
+    def run(self):
+        try:
+            ok, messages = renumber_tool_calls(self.changes)
+        except Exception as e:
+            print(f"❌ TOOL CALL 수정 오류: {e}\n{traceback.format_exc()}")
+            ok, messages = False, {path: f"TOOL CALL 수정 실패: {e}" for path in self.changes}
+        self.renumber_done.emit(ok, messages)
+
+
+class ExcelExportThread(QThread):
+    """
+    CAM SHEET 엑셀 저장을 백그라운드에서 수행하는 스레드.
+    - 입력은 GUI 스레드에서 만든 CamRow 리스트라 작업 중 Qt 위젯을 읽지 않습니다. (excel_writer)
+    - 끝나면 export_done(저장 경로, 행 수, 시트 수) 또는 export_failed(오류 메시지)를 보냅니다.
+    """
+    export_done = Signal(str, int, int)
+    export_failed = Signal(str)
+
+    def __init__(self, rows, folder_path: str, job_number: str, machine_name: str, date: str):
+        super().__init__()
+        self.rows = rows
+        self.folder_path = folder_path
+        self.job_number = job_number
+        self.machine_name = machine_name
+        self.date = date
 
+    def run(self):
+        try:
+            save_path = auto_export_path(self.folder_path, self.job_number)
+            written, sheets = write_cam_rows_sheet(
+                save_path, self.rows, self.job_number, self.machine_name, self.date, empty=""
+            )
+            print(f"✅ 엑셀 저장 완료: {save_path} ({written}행 / 시트 {sheets}장)")
+            self.export_done.emit(save_path, written, sheets)
+        except Exception as e:
+            print(f"❌ 파일 저장 중 오류 발생: {e}\n{traceback.format_exc()}")
+            self.export_failed.emit(str(e))
 
 
 class CamSheetApp(QWidget):
@@ -99,8 +297,41 @@ class CamSheetApp(QWidget):
         super().__init__()
         self.selected_folder = ""
         self.loader_thread = None
+        # 엑셀 저장 스레드(SHEET 추출)
+        self.export_thread = None
+        # 스캔 세대 번호: 새 폴더 로딩마다 증가, 이전 세대의 결과/진행 시그널은 버림
+        self._scan_generation = 0
+        # 취소했지만 아직 끝나지 않은 스레드(끝날 때까지 참조 유지)
+        self._retired_loaders = []
+        # 폴더 스캔 프로세스 수 (1: 순차, 0 이하: 자동 — 작은 폴더는 순차, 큰 폴더만 프로세스 풀)
+        self.scan_workers = 0
+        # 스캔 결과 영속 캐시 (변경되지 않은 .h 파일은 다시 읽지 않음)
+        self._scan_cache = ScanCache()
+        # 스트리밍 로딩: 분석되는 대로 테이블에 행을 채움
+        self.stream_scan = True
+        # 프로그램 전체 분석(가공 시간 / 행정 범위 경고)
+        # - 폴더 로딩/감시는 헤더만 읽고, 전체 분석은 표시 후 뒤에서 낮은 우선순위로 채웁니다.
+        # - False이면 전체 분석을 하지 않습니다. (PDF의 RPM/Feed/가공 시간 칸이 비고 행정 경고 없음)
+        self.background_analysis = True
+        self.analysis_workers = 2
+        self.analysis_thread = None
+        self._analysis_generation = 0
+        # 툴번호 변경: 편집을 모아 작업 스레드에서 일괄 적용 ({파일 경로: (파일명, 새 번호)})
+        self.renumber_thread = None
+        self._pending_renumber = {}
+        self._renumber_names = {}
+        self._stream_active = False
+        self._stream_keys = []
         self.initUI()
 
+        # ===== [폴더 감시] =====
+        # 로딩 완료 후 선택 폴더를 감시하여 변경된 파일만 행 단위로 반영합니다.
+        self.watch_enabled = True
+        self._folder_watcher = FolderWatcher(self, cache=self._scan_cache)
+        self._folder_watcher.rows_inserted.connect(self.on_watch_rows_inserted)
+        self._folder_watcher.rows_updated.connect(self.on_watch_rows_updated)
+        self._folder_watcher.rows_removed.connect(self.on_watch_rows_removed)
+
         # ===== [PDF 출력 엔진] =====
         base_path = os.path.dirname(os.path.abspath(__file__))
         # CAM 쪽 로고를 우선 사용(공용 로고로 교체는 통합 단계에서 진행)
@@ -108,15 +339,20 @@ class CamSheetApp(QWidget):
         self._cam_printer = CamPrintEngine(parent=self, logo_path=logo_path)
 
         # ===== [CAM 원본 데이터 캐시] =====
-        # FileLoaderThread에서 스캔한 CamRow 원본을 보관하여 PDF 출력에 사용합니다.
-        self._cam_rows_cache = []
+        # FileLoaderThread에서 스캔한 CamRow 원본(CamRowStore)을 보관하여 PDF 출력에 사용합니다.
+        self._cam_rows_cache = CamRowStore()
         self._header_provider = None
+
+        # ===== [설비 행정 한계] =====
+        # global_settings.json의 machine_limits (폴더 로딩마다 다시 읽음)
+        self._machine_limits = load_machine_limits()
         self.use_setting_header = False
 
     def handle_tool_number_change(self, item):
         """
         툴번호(3열) 변경 시 .h 파일 내 TOOL CALL의 숫자만 교체합니다.
-        - 실제 파일 수정 로직은 cam_core로 이관되어, 여기서는 호출만 수행합니다.
+        - 같은 순간에 들어온 편집(붙여넣기 등)은 모아서 작업 스레드에서 한 번에 적용합니다.
+        - 실제 파일 수정 로직은 cam_core.renumber_tool_calls가 맡습니다.
         """
         if item.column() != 2:
             return
@@ -135,12 +371,52 @@ class CamSheetApp(QWidget):
             return
 
         file_name = file_item.text().strip()
+        path = os.path.join(self.selected_folder, file_name)
+        self._pending_renumber[path] = (file_name, new_tool_number)
+        QTimer.singleShot(0, self._flush_tool_renumber)
 
-        ok, msg = update_tool_call_in_folder(self.selected_folder, file_name, new_tool_number)
-        if ok:
-            print(f"✅ {msg}")
-        else:
-            print(f"❌ {msg}")
+    def _flush_tool_renumber(self):
+        """
+        모아 둔 툴번호 변경을 작업 스레드로 넘깁니다. (실행 중이면 끝난 뒤 이어서 처리)
+        """
+        if not self._pending_renumber:
+            return
+        if self.renumber_thread is not None and self.renumber_thread.isRunning():
+            return
+
+        pending, self._pending_renumber = self._pending_renumber, {}
+        self._renumber_names = {path: name for path, (name, _) in pending.items()}
+        self.renumber_thread = ToolRenumberThread({path: no for path, (_, no) in pending.items()})
+        self.renumber_thread.renumber_done.connect(self._on_tool_renumber_done)
+        # 스레드가 완전히 끝난 뒤 그 사이 들어온 편집을 이어서 처리
+        self.renumber_thread.finished.connect(self._flush_tool_renumber)
+        self.renumber_thread.start()
+
+    def _on_tool_renumber_done(self, ok: bool, messages: dict):
+        """
+        일괄 수정 결과를 출력합니다.
+        - 실패하면 파일은 모두 원복되었으므로 표의 툴번호도 원본 캐시 값으로 되돌립니다.
+        """
+        names = self._renumber_names
+        for path, msg in messages.items():
+            print(f"{'✅' if ok else '❌'} {names.get(path, path)}: {msg}")
+
+        if not ok:
+            self.table.blockSignals(True)
+            try:
+                for name in names.values():
+                    row = self._find_table_row(name)
+                    cam_row = self._cam_rows_cache.get(name)
+                    item = self.table.item(row, 2) if row >= 0 else None
+                    if item is not None and cam_row is not None:
+                        item.setText(safe_decode(cam_row.tool_no) or "N/A")
+            finally:
+                self.table.blockSignals(False)
+            QMessageBox.warning(
+                self, "툴번호 변경 실패",
+                "TOOL CALL 번호를 바꾸지 못해 변경을 모두 되돌렸습니다.\n\n"
+                + "\n".join(f"{names.get(p, p)}: {m}" for p, m in messages.items()),
+            )
 
     def set_header_provider(self, fn):
         """
@@ -160,6 +436,34 @@ class CamSheetApp(QWidget):
             return
         super().keyPressEvent(event)
 
+    def shutdown(self):
+        """
+        페이지를 닫기 전에 작업 스레드를 모두 정리하고 스캔 캐시를 닫습니다. (여러 번 호출해도 안전)
+        - 통합 쉘에서는 이 위젯의 closeEvent가 오지 않으므로 쉘의 closeEvent에서 호출합니다.
+        - 폴더 감시·스캔·분석은 취소하고, 파일을 쓰는 툴번호 변경·엑셀 저장은 끝까지 기다립니다.
+        - 모든 스레드가 끝난 뒤에만 캐시를 닫습니다.
+        """
+        self._folder_watcher.shutdown()
+        self.cancel_loading()
+
+        for thread in (self.renumber_thread, self.export_thread):
+            if thread is not None:
+                thread.wait()
+        # 앞선 변경이 끝나기를 기다리던 툴번호 편집도 반영하고 종료
+        if self._pending_renumber:
+            self._flush_tool_renumber()
+            self.renumber_thread.wait()
+
+        self._join_retired()
+        self._scan_cache.close()
+
+    def closeEvent(self, event):
+        """
+        단독 실행 시 창을 닫으면 shutdown()으로 정리합니다.
+        """
+        self.shutdown()
+        super().closeEvent(event)
+
     def initUI(self):
         """
         UI를 구성합니다.
@@ -294,9 +598,9 @@ class CamSheetApp(QWidget):
         self.table.horizontalHeader().setVisible(True)
         self.table.verticalHeader().setVisible(True)
 
-        self.table.setColumnCount(6)
+        self.table.setColumnCount(len(TABLE_COLUMNS))
         self.table.setRowCount(24)
-        self.table.setHorizontalHeaderLabels(["FILE명", "TOOL D / B", "공구 번호", "여유량(XY)", "작업 내용", "냉각수"])
+        self.table.setHorizontalHeaderLabels([header for header, _ in TABLE_COLUMNS])
         self.table.setFont(QFont("Arial", 12))
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
@@ -362,6 +666,13 @@ class CamSheetApp(QWidget):
         button_layout.addWidget(self.btn_export_both)
         container_layout.addLayout(button_layout)
 
+        # 폴더 로딩 진행률(처리 파일 수 / 전체 파일 수), 로딩 중에만 표시
+        self.scan_progress = QProgressBar(self)
+        self.scan_progress.setFormat("로딩 중... %v / %m")
+        self.scan_progress.setTextVisible(True)
+        self.scan_progress.setVisible(False)
+        container_layout.addWidget(self.scan_progress)
+
         main_layout.addWidget(container)
         self.setLayout(main_layout)
 
@@ -372,16 +683,186 @@ class CamSheetApp(QWidget):
     def _start_loading_folder(self, folder_path: str):
         """
         폴더 로딩 스레드를 시작합니다.
+        - 진행 중인 이전 스캔은 취소하고, 세대 번호를 올려 늦게 도착하는 결과를 버립니다.
         """
         self._warned_jobno_missing = False  # ✅ 3-3: 폴더마다 경고 1회 정책 초기화
 
-        self.selected_folder = folder_path
-        self.btn_folder.setEnabled(False)
+        # 전체 로딩 중에는 감시 중단(로딩 완료 후 다시 시작)
+        self._folder_watcher.stop()
+        self.cancel_loading()
 
-        self.loader_thread = FileLoaderThread(folder_path)
-        self.loader_thread.files_loaded.connect(self.load_files_into_table)
+        self._scan_generation += 1
+        self.selected_folder = folder_path
+        self._machine_limits = load_machine_limits()
+
+        self._stream_active = bool(self.stream_scan)
+        if self._stream_active:
+            self.table.setRowCount(0)
+            self._stream_keys = []
+
+        self.scan_progress.setRange(0, 0)  # 전체 수를 알기 전에는 busy 표시
+        self.scan_progress.setVisible(True)
+
+        self.loader_thread = FileLoaderThread(
+            folder_path,
+            workers=self.scan_workers,
+            cache=self._scan_cache,
+            stream=self._stream_active,
+            generation=self._scan_generation,
+        )
+        self.loader_thread.scan_done.connect(self._on_scan_done)
+        self.loader_thread.scan_failed.connect(self._on_scan_failed)
+        self.loader_thread.rows_batch.connect(self._on_scan_rows_batch)
+        self.loader_thread.progress.connect(self._on_scan_progress)
         self.loader_thread.start()
 
+    def cancel_loading(self):
+        """
+        진행 중인 폴더 로딩을 취소합니다. (스레드는 끝날 때까지 참조를 유지)
+        """
+        self.cancel_analysis()
+        thread = self.loader_thread
+        self.loader_thread = None
+        self.scan_progress.setVisible(False)
+
+        self._retire_thread(thread)
+
+    def _retire_thread(self, thread):
+        """
+        실행 중인 작업 스레드를 취소하고, 끝날 때까지 참조를 유지합니다.
+        - 실행 중인 QThread 객체가 GC되면 안 되므로 _retired_loaders에 두고, finished 때 스스로 빠집니다.
+        - 종료 시에는 _join_retired()로 모두 기다립니다.
+        """
+        if thread is None or not thread.isRunning():
+            return
+        thread.cancel()
+        self._retired_loaders.append(thread)
+        thread.finished.connect(lambda t=thread: self._drop_retired(t))
+
+    def _drop_retired(self, thread):
+        if thread in self._retired_loaders:
+            self._retired_loaders.remove(thread)
+
+    def _join_retired(self):
+        """
+        취소한 스레드가 모두 끝날 때까지 기다립니다. (프로세스 풀 정리 포함)
+        """
+        retired, self._retired_loaders = self._retired_loaders, []
+        for thread in retired:
+            thread.wait()
+
+    # =========================
+    # 프로그램 전체 분석(지연 실행)
+    # =========================
+    def start_analysis(self):
+        """
+        선택 폴더의 프로그램 전체 분석을 뒤에서 시작합니다. (진행 중이던 분석은 취소 후 다시 시작)
+        - 분석이 끝난 파일은 캐시에 있으므로 다시 시작해도 바뀐 파일만 읽습니다.
+        """
+        self.cancel_analysis()
+        if not self.background_analysis or not self.selected_folder or not self._cam_rows_cache:
+            return
+        self._analysis_generation += 1
+        self.analysis_thread = ProgramAnalysisThread(
+            self.selected_folder,
+            workers=self.analysis_workers,
+            cache=self._scan_cache,
+            generation=self._analysis_generation,
+        )
+        self.analysis_thread.rows_analyzed.connect(self._on_rows_analyzed)
+        self.analysis_thread.analysis_done.connect(self._on_analysis_done)
+        self.analysis_thread.start(QThread.Priority.LowPriority)
+
+    def cancel_analysis(self):
+        """
+        진행 중인 프로그램 분석을 취소하고, 이미 보낸 결과도 버리도록 세대 번호를 올립니다.
+        """
+        self._analysis_generation += 1
+        thread = self.analysis_thread
+        self.analysis_thread = None
+        self._retire_thread(thread)
+
+    def _on_rows_analyzed(self, generation: int, rows):
+        """
+        분석 결과를 원본 캐시에 반영하고 행정 초과 표시만 갱신합니다. (표 내용은 헤더 스캔과 같음)
+        """
+        if generation != self._analysis_generation:
+            return
+        try:
+            self._cam_rows_cache.upsert(rows, folder=self.selected_folder)
+        except ValueError as e:
+            print(f"⚠ 분석 결과 무시: {e}")
+            return
+        self.table.blockSignals(True)
+        try:
+            for r in rows:
+                row = self._find_table_row(r.file_name)
+                if row >= 0:
+                    self._flag_envelope(row, r)
+        finally:
+            self.table.blockSignals(False)
+
+    def _on_analysis_done(self, generation: int):
+        if generation != self._analysis_generation:
+            return
+        self.analysis_thread = None
+        print(f"✅ 프로그램 분석 완료: {self.selected_folder}")
+
+    def _on_scan_done(self, generation: int, store):
+        if generation != self._scan_generation:
+            return
+        self.scan_progress.setVisible(False)
+        self.load_files_into_table(store)
+
+    def _on_scan_failed(self, generation: int, message: str):
+        """
+        스캔 실패: 스트리밍으로 들어온 일부 행과 이전 폴더의 결과를 지우고 실제 오류를 표시합니다.
+        - 일부만 읽은 결과가 완성된 목록처럼 남아 저장/출력되지 않도록 빈 상태로 돌립니다.
+        """
+        if generation != self._scan_generation:
+            return
+        self.scan_progress.setVisible(False)
+        self._stream_active = False
+        self._stream_keys = []
+        self._cam_rows_cache = CamRowStore()
+
+        self.table.blockSignals(True)
+        try:
+            self.table.setRowCount(0)
+        finally:
+            self.table.blockSignals(False)
+
+        QMessageBox.critical(
+            self, "폴더 로딩 오류",
+            f"폴더를 읽는 중 오류가 발생했습니다.\n{self.selected_folder}\n\n{message}",
+        )
+
+    def _on_scan_rows_batch(self, generation: int, rows):
+        """
+        스트리밍 로딩 중 도착한 행 묶음을 파일명 자연 정렬 위치에 삽입합니다.
+        """
+        if generation != self._scan_generation or not self._stream_active:
+            return
+        self.table.blockSignals(True)
+        try:
+            for r in rows:
+                key = natural_sort_key(safe_decode(r.file_name))
+                idx = bisect.bisect_right(self._stream_keys, key)
+                self._stream_keys.insert(idx, key)
+                self.table.insertRow(idx)
+                self._set_table_row(idx, r)
+        finally:
+            self.table.blockSignals(False)
+
+    def _on_scan_progress(self, generation: int, done: int, total: int):
+        """
+        로딩 진행 상황(처리 파일 수 / 전체 파일 수)을 진행률 막대에 표시합니다.
+        """
+        if generation != self._scan_generation:
+            return
+        self.scan_progress.setRange(0, max(total, 1))
+        self.scan_progress.setValue(done)
+
     def select_folder(self):
         """
         폴더 선택 후 백그라운드 스레드로 .h 파일을 읽어 테이블에 반영합니다.
@@ -390,34 +871,49 @@ class CamSheetApp(QWidget):
         if folder_path:
             print(f"🛠 선택된 폴더: {folder_path}")
             self._start_loading_folder(folder_path)
-        else:
-            self.btn_folder.setEnabled(True)
 
-    def load_files_into_table(self, file_data, cam_rows):
-        print(f"[DEBUG] load_files_into_table called: rows={len(file_data) if file_data else 0}")
-        if file_data:
-            print(f"[DEBUG] sample_row0={file_data[0]}")
+    def load_files_into_table(self, store):
+        print(f"[DEBUG] load_files_into_table called: rows={len(store) if store else 0}")
+        if store:
+            print(f"[DEBUG] sample_row0={next(iter(store)).to_row()}")
         """
-        파일 데이터를 UI 테이블에 로드합니다.
+        CamRowStore를 UI 테이블에 로드합니다. (파일명 자연 정렬 순서)
+        - 스트리밍 로딩이었다면 테이블 행은 이미 채워져 있으므로 다시 만들지 않습니다.
         """
-        self.btn_folder.setEnabled(True)
+        streamed = self._stream_active
+        self._stream_active = False
+        self._stream_keys = []
 
         # ===== [CAM 원본 캐시 저장] =====
-        self._cam_rows_cache = cam_rows or []
-
-        if not file_data:
+        self._cam_rows_cache = store if store is not None else CamRowStore()
+
+        # 빈 폴더도 감시하여 새로 생기는 .h 파일을 받아옵니다.
+        if self.watch_enabled and self.selected_folder:
+            self._folder_watcher.start(self.selected_folder)
+
+        if not store:
+            if streamed:
+                # 스트리밍 시작 때 비운 표를 기본 빈 행(24행)으로 되돌립니다.
+                self.table.blockSignals(True)
+                try:
+                    self.table.setRowCount(24)
+                finally:
+                    self.table.blockSignals(False)
             QMessageBox.warning(self, "경고", "선택한 폴더에 .h 파일이 없습니다!")
             return
 
         # 툴번호 변경 시그널 차단(불필요한 파일 수정 방지)
         self.table.blockSignals(True)
 
-        self.table.setRowCount(len(file_data))
+        if not streamed:
+            self.table.setRowCount(len(store))
 
-        for row, (file, tool_db, tool_number, allowance, pg_name, equip_name, job_number, date, coolant) in enumerate(
-            file_data
-        ):
+        for row, r in enumerate(store):
             try:
+                file, tool_db, tool_number, allowance, pg_name = (
+                    r.file_name, r.tool_db, r.tool_no, r.allowance_xy, r.pg_name
+                )
+                equip_name, job_number, date, coolant = r.equip_name, r.job_number, r.date, r.coolant
                 equip_name = equip_name or "N/A"
                 job_number = job_number or "N/A"
                 date = date or datetime.now().strftime("%m-%d")
@@ -433,10 +929,12 @@ class CamSheetApp(QWidget):
                 date = safe_decode(date)
                 coolant = safe_decode(coolant)
 
-                for col, value in enumerate([file, tool_db, tool_number, allowance, pg_name, coolant]):
-                    it = QTableWidgetItem(value if value else "N/A")
-                    it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.table.setItem(row, col, it)
+                # 스트리밍 로딩이면 행은 이미 채워져 있으므로 상단 입력칸만 반영
+                if not streamed:
+                    for col, value in enumerate([file, tool_db, tool_number, allowance, pg_name, coolant]):
+                        it = QTableWidgetItem(value if value else "N/A")
+                        it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                        self.table.setItem(row, col, it)
 
                 # =========================
                 # 상단 입력칸 자동 반영
@@ -463,7 +961,132 @@ class CamSheetApp(QWidget):
             except Exception as e:
                 print(f"❌ 데이터 처리 오류: {e}")
 
+        # 설비 행정 한계 초과 행 표시 (캐시된 외곽 치수로만 검사)
+        by_name = {safe_decode(r.file_name): r for r in store}
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+            cam_row = by_name.get(item.text()) if item is not None else None
+            if cam_row is not None:
+                self._flag_envelope(row, cam_row)
+
         self.table.blockSignals(False)
+        self.start_analysis()
+
+    # =========================
+    # 폴더 감시(행 단위 추가/수정/삭제)
+    # =========================
+    def _find_table_row(self, file_name: str) -> int:
+        """
+        FILE명(0열)이 file_name인 행 번호를 반환합니다. 없으면 -1.
+        """
+        target = safe_decode(file_name)
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+            if item is not None and item.text() == target:
+                return row
+        return -1
+
+    def _set_table_row(self, row: int, cam_row) -> None:
+        """
+        CamRow 1건을 테이블 row 행에 기록합니다. (load_files_into_table과 동일한 표시 규칙)
+        """
+        values = [cam_row.file_name, cam_row.tool_db, cam_row.tool_no,
+                  cam_row.allowance_xy, cam_row.pg_name, cam_row.coolant]
+        for col, value in enumerate(values):
+            value = safe_decode(value)
+            it = QTableWidgetItem(value if value else "N/A")
+            it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, col, it)
+        self._flag_envelope(row, cam_row)
+
+    def _flag_envelope(self, row: int, cam_row) -> None:
+        """
+        공구 경로 외곽 치수가 설비 행정 한계를 넘으면 행을 붉게 칠하고 툴팁으로 사유를 표시합니다.
+        - 설비는 CamRow.equip_name → 상단 설비 입력칸 순서로 찾습니다.
+        """
+        axis_limits = find_machine_limits(self._machine_limits, cam_row.equip_name, self.machine_input.text())
+        problems = check_envelope(cam_row, axis_limits)
+        if problems:
+            print(f"⚠ 행정 초과: {cam_row.file_name} ({', '.join(problems)})")
+        tip = "⚠ 설비 행정 초과\n" + "\n".join(problems) if problems else ""
+        for col in range(self.table.columnCount()):
+            it = self.table.item(row, col)
+            if it is None:
+                continue
+            if problems:
+                it.setBackground(QColor(255, 210, 210))
+            else:
+                it.setData(Qt.ItemDataRole.BackgroundRole, None)
+            it.setToolTip(tip)
+
+    def _upsert_cam_rows_cache(self, rows) -> None:
+        # 감시 중인 폴더의 행만 반영합니다. (다른 폴더의 늦은 결과면 원본 캐시를 건드리지 않음)
+        try:
+            self._cam_rows_cache.upsert(rows, folder=self._folder_watcher.folder_path)
+        except ValueError as e:
+            print(f"⚠ 감시 결과 무시: {e}")
+
+    def on_watch_rows_inserted(self, rows):
+        """
+        새로 생긴 .h 파일 행을 파일명 자연 정렬 위치에 삽입합니다. (이미 있으면 갱신)
+        """
+        self.table.blockSignals(True)
+        try:
+            for r in rows:
+                row = self._find_table_row(r.file_name)
+                if row < 0:
+                    key = natural_sort_key(safe_decode(r.file_name))
+                    row = self.table.rowCount()
+                    for i in range(self.table.rowCount()):
+                        item = self.table.item(i, 0)
+                        if item is None or not item.text() or natural_sort_key(item.text()) > key:
+                            row = i
+                            break
+                    self.table.insertRow(row)
+                self._set_table_row(row, r)
+                print(f"➕ 감시: 파일 추가 {r.file_name}")
+        finally:
+            self.table.blockSignals(False)
+        self._upsert_cam_rows_cache(rows)
+        # 감시 결과는 헤더만 읽은 행이므로 바뀐 파일의 전체 분석을 다시 채웁니다.
+        self.start_analysis()
+
+    def on_watch_rows_updated(self, rows):
+        """
+        수정된 .h 파일 행만 다시 기록합니다. (테이블에 없으면 삽입)
+        """
+        missing = []
+        self.table.blockSignals(True)
+        try:
+            for r in rows:
+                row = self._find_table_row(r.file_name)
+                if row < 0:
+                    missing.append(r)
+                    continue
+                self._set_table_row(row, r)
+                print(f"✏ 감시: 파일 수정 {r.file_name}")
+        finally:
+            self.table.blockSignals(False)
+        self._upsert_cam_rows_cache(rows)
+        if missing:
+            self.on_watch_rows_inserted(missing)
+        else:
+            self.start_analysis()
+
+    def on_watch_rows_removed(self, file_names):
+        """
+        삭제된 .h 파일 행을 테이블/원본 캐시에서 제거합니다.
+        """
+        self.table.blockSignals(True)
+        try:
+            for name in file_names:
+                row = self._find_table_row(name)
+                if row >= 0:
+                    self.table.removeRow(row)
+                    print(f"➖ 감시: 파일 삭제 {name}")
+        finally:
+            self.table.blockSignals(False)
+        self._cam_rows_cache.remove(file_names)
 
     # =========================
     # 드래그 드롭/행 조작
@@ -582,16 +1205,42 @@ class CamSheetApp(QWidget):
             QMessageBox.warning(self, "경고", "데이터 폴더를 먼저 선택해주세요!")
             return
 
-        try:
-            save_path = export_to_excel_with_auto_filename(
-                job_number, machine_name, date, self.table, folder_path
-            )
-            if save_path:
-                QMessageBox.information(self, "저장 완료", f"엑셀 파일이 저장되었습니다!\n{save_path}")
-            else:
-                QMessageBox.warning(self, "저장 실패", "파일 저장 중 오류가 발생했습니다.")
-        except Exception as e:
-            QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류 발생: {e}")
+        if self.export_thread is not None and self.export_thread.isRunning():
+            QMessageBox.information(self, "저장 중", "엑셀 저장이 진행 중입니다. 잠시 후 다시 시도해주세요.")
+            return
+
+        # 테이블(사용자 편집 포함)은 여기서 1번만 읽고, 템플릿 채우기/저장은 스레드에서 수행
+        rows = self._table_cam_rows(job_number, machine_name, date)
+
+        self.btn_export.setEnabled(False)
+        self.export_thread = ExcelExportThread(rows, folder_path, job_number, machine_name, date)
+        self.export_thread.export_done.connect(self._on_export_done)
+        self.export_thread.export_failed.connect(self._on_export_failed)
+        self.export_thread.start()
+
+    def _table_cam_rows(self, job_number: str, machine_name: str, date: str):
+        """
+        테이블 현재 내용을 CamRow 리스트로 만듭니다. (GUI 스레드에서 셀당 1번만 읽음)
+        - 행 이동/삽입/직접 편집이 반영된 테이블이 엑셀 출력의 기준입니다.
+        - 열 ↔ CamRow 속성 대응은 TABLE_COLUMNS(테이블 헤더와 같은 정의)를 따릅니다.
+        """
+        attrs = [attr for _, attr in TABLE_COLUMNS]
+        rows = []
+        for r in range(self.table.rowCount()):
+            values = {}
+            for c, attr in enumerate(attrs):
+                item = self.table.item(r, c)
+                values[attr] = item.text() if item else ""
+            rows.append(CamRow(**values, equip_name=machine_name, job_number=job_number, date=date))
+        return rows
+
+    def _on_export_done(self, save_path: str, written: int, sheets: int):
+        self.btn_export.setEnabled(True)
+        QMessageBox.information(self, "저장 완료", f"엑셀 파일이 저장되었습니다!\n{save_path}")
+
+    def _on_export_failed(self, message: str):
+        self.btn_export.setEnabled(True)
+        QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류 발생: {message}")
 
     # =========================
     # PDF 출력(CAM only / Combined Hook)
@@ -603,6 +1252,8 @@ class CamSheetApp(QWidget):
         (표 그리기는 cam_print_engine이 담당)
         """
         rows = []
+        # RPM/Feed/WOC는 테이블에 없으므로 원본 CamRow(프로그램 전체 분석 결과)에서 가져옵니다.
+        by_name = self._cam_rows_cache
         for r in range(self.table.rowCount()):
             file_name = self.table.item(r, 0).text().strip() if self.table.item(r, 0) else ""
             tool_db = self.table.item(r, 1).text().strip() if self.table.item(r, 1) else ""
@@ -615,16 +1266,19 @@ class CamSheetApp(QWidget):
             if not file_name and not tool_no:
                 continue
 
+            src = by_name.get(file_name)
+
             # cam_print_engine 기본 키(표 헤더)와 매핑
             rows.append({
                 "ToolNo": tool_no,
                 "ToolName": work_desc,
                 "Holder": tool_db,
-                "RPM": "",
-                "Feed": "",
+                "RPM": src.rpm if src else "",
+                "Feed": src.feed if src else "",
                 "DOC": allowance,
-                "WOC": "",
+                "WOC": src.woc if src else "",
                 "Coolant": coolant,
+                "Time": format_duration(src.cycle_time_s) if src else "",
                 "FILE": file_name,
             })
         return rows
@@ -639,11 +1293,12 @@ class CamSheetApp(QWidget):
                 "ToolNo": (r.tool_no or "").strip(),
                 "ToolName": (r.pg_name or "").strip(),
                 "Holder": (r.tool_db or "").strip(),
-                "RPM": "",
-                "Feed": "",
+                "RPM": (r.rpm or "").strip(),
+                "Feed": (r.feed or "").strip(),
                 "DOC": (r.allowance_xy or "").strip(),
-                "WOC": "",
+                "WOC": (r.woc or "").strip(),
                 "Coolant": (r.coolant or "").strip(),
+                "Time": format_duration(r.cycle_time_s),
                 "FILE": (r.file_name or "").strip(),
             })
         return rows
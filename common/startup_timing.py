@@ -0,0 +1,270 @@
+# machining_auto/common/startup_timing.py
+"""
+앱 시작 단계별 시간 측정/기록.
+
+- 단계: import → theme(테마/QSS) → shell(쉘 틀) → setting_page → first_paint → cam_page
+  - cam_page는 첫 화면 표시 후 유휴 시간에 생성되므로 스플래시 진행률에는 넣지 않습니다. (PROGRESS_UNTIL)
+- 스플래시 진행률은 고정 숫자가 아니라 "지난 실행들의 단계별 소요 시간(중앙값)" 비율로 계산합니다.
+  (기록이 없으면 DEFAULT_EXPECTED_MS 사용)
+- 실행마다 사용자 로컬 폴더의 JSON Lines 로그에 1줄씩 남깁니다.
+  - build: EXE(또는 app_shell.py) 수정시각. 릴리스마다 바뀌므로 빌드별로 단계 시간을 비교할 수 있습니다.
+- Qt를 import하지 않습니다. (스플래시 갱신은 on_stage 콜백으로 연결)
+
+리포트(빌드별 단계 중앙값, 직전 빌드 대비 느려진 단계 표시):
+  python -m machining_auto.common.startup_timing
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+# (단계 키, 스플래시 문구) — 실행 순서
+STAGES = (
+    ("import", "모듈 로딩 중..."),
+    ("theme", "테마 적용 중..."),
+    ("shell", "화면 틀 구성 중..."),
+    ("setting_page", "UI 로딩 중 (Setting)..."),
+    ("first_paint", "화면 표시 중..."),
+    ("cam_page", "UI 로딩 중 (CAM)..."),
+)
+STAGE_LABELS = dict(STAGES)
+# 스플래시 진행률 계산에 포함하는 마지막 단계(이후 단계는 스플래시가 닫힌 뒤 실행)
+PROGRESS_UNTIL = "first_paint"
+_STAGE_KEYS = tuple(k for k, _ in STAGES)
+_PROGRESS_STAGES = _STAGE_KEYS[:_STAGE_KEYS.index(PROGRESS_UNTIL) + 1]
+
+# 로그가 없을 때 진행률 계산에 쓰는 예상 시간(ms)
+DEFAULT_EXPECTED_MS = {
+    "import": 1500.0,
+    "theme": 100.0,
+    "shell": 150.0,
+    "setting_page": 1500.0,
+    "first_paint": 300.0,
+    "cam_page": 800.0,
+}
+
+# 예상 시간 계산에 쓰는 최근 실행 수 / 로그 최대 줄 수
+RECENT_RUNS = 5
+MAX_LOG_ENTRIES = 500
+# 직전 빌드 대비 느려짐 판정 배율
+SLOWER_RATIO = 1.2
+
+
+def default_log_path() -> Path:
+    """
+    시작 시간 로그 기본 경로를 반환합니다. (scan_cache와 같은 사용자 로컬 폴더)
+    """
+    base = os.environ.get("LOCALAPPDATA") or str(Path.home())
+    return Path(base) / "machining_auto" / "startup_timing.jsonl"
+
+
+def current_build() -> str:
+    """
+    현재 실행 파일의 빌드 식별자(수정시각).
+    - EXE(PyInstaller)면 exe 파일, 소스 실행이면 app_shell.py 기준
+    """
+    if getattr(sys, "frozen", False):
+        target = sys.executable
+    else:
+        target = str(Path(__file__).resolve().parent.parent / "app_shell.py")
+    try:
+        return datetime.fromtimestamp(os.path.getmtime(target)).strftime("%Y%m%d-%H%M%S")
+    except OSError:
+        return "unknown"
+
+
+def read_log(path: Optional[Path] = None) -> List[Dict[str, object]]:
+    """
+    로그의 실행 기록 목록(오래된 순). 깨진 줄은 건너뜁니다.
+    """
+    path = Path(path) if path else default_log_path()
+    entries: List[Dict[str, object]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(rec, dict) and isinstance(rec.get("stages_ms"), dict):
+                    entries.append(rec)
+    except OSError:
+        pass
+    return entries
+
+
+def median_stages(entries: List[Dict[str, object]]) -> Dict[str, float]:
+    """
+    실행 기록들의 단계별 중앙값(ms).
+    """
+    values: Dict[str, List[float]] = {}
+    for rec in entries:
+        for stage, ms in rec["stages_ms"].items():
+            if isinstance(ms, (int, float)):
+                values.setdefault(stage, []).append(float(ms))
+    return {stage: statistics.median(v) for stage, v in values.items()}
+
+
+class StartupTimer:
+    """
+    시작 단계 타이머.
+
+    - begin(stage)는 이전 단계를 닫고 새 단계를 시작합니다. (stage(...) 컨텍스트도 가능)
+    - on_stage(percent, message) 콜백으로 스플래시 진행률을 갱신합니다.
+    - finish()에서 로그에 1줄을 남기고, 직전 빌드보다 느려진 단계를 콘솔에 표시합니다.
+    """
+
+    def __init__(self, *, log_path: Optional[Path] = None, t0: Optional[float] = None):
+        self.log_path = Path(log_path) if log_path else default_log_path()
+        self.on_stage: Optional[Callable[[int, str], None]] = None
+        self.durations: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._started = time.perf_counter() if t0 is None else t0
+        self._stage_t0 = self._started
+        self._finished = False
+
+        self._history = read_log(self.log_path)
+        expected = dict(DEFAULT_EXPECTED_MS)
+        expected.update(median_stages(self._history[-RECENT_RUNS:]))
+        self._expected = expected
+
+    # -------------------------
+    # 측정
+    # -------------------------
+    def percent_before(self, stage: str) -> int:
+        """
+        stage 시작 시점의 진행률(%).
+        - 끝난 단계는 실제 시간, 남은 단계는 예상 시간으로 전체를 잡습니다.
+        """
+        done = remaining = 0.0
+        reached = False
+        for s in _PROGRESS_STAGES:
+            reached = reached or s == stage
+            if reached:
+                remaining += self._expected.get(s, 0.0)
+            else:
+                done += self.durations.get(s, self._expected.get(s, 0.0))
+        total = (done + remaining) or 1.0
+        return int(min(99, max(0, round(done / total * 100))))
+
+    def begin(self, stage: str, message: str = "") -> None:
+        self.end()
+        self._current = stage
+        self._stage_t0 = time.perf_counter()
+        if self.on_stage is not None:
+            try:
+                self.on_stage(self.percent_before(stage), message or STAGE_LABELS.get(stage, stage))
+            except Exception:
+                pass
+
+    def end(self) -> None:
+        if self._current is None:
+            return
+        ms = (time.perf_counter() - self._stage_t0) * 1000.0
+        self.durations[self._current] = self.durations.get(self._current, 0.0) + ms
+        self._current = None
+
+    def record(self, stage: str, start: float) -> None:
+        """
+        begin 없이 start(perf_counter 시각)부터 지금까지를 stage 시간으로 기록합니다. (import 단계용)
+        """
+        self.durations[stage] = (time.perf_counter() - start) * 1000.0
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, message: str = "") -> Iterator[None]:
+        self.begin(stage, message)
+        try:
+            yield
+        finally:
+            self.end()
+
+    # -------------------------
+    # 기록
+    # -------------------------
+    def slower_stages(self) -> List[str]:
+        """
+        이전 빌드 최근 실행들의 중앙값보다 SLOWER_RATIO배 이상 느려진 단계 설명 목록.
+        """
+        build = current_build()
+        previous = [r for r in self._history if r.get("build") != build]
+        if not previous:
+            return []
+        last_build = previous[-1].get("build")
+        base = median_stages([r for r in previous if r.get("build") == last_build][-RECENT_RUNS:])
+        out = []
+        for stage, _ in STAGES:
+            cur, prev = self.durations.get(stage), base.get(stage)
+            if cur is not None and prev and cur >= prev * SLOWER_RATIO:
+                out.append(f"{stage} {prev:.0f}→{cur:.0f}ms (x{cur / prev:.2f}, 기준 빌드 {last_build})")
+        return out
+
+    def finish(self) -> Dict[str, object]:
+        """
+        진행 중인 단계를 닫고 로그에 기록합니다. (여러 번 호출해도 1번만 기록)
+        """
+        self.end()
+        record = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "build": current_build(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "total_ms": round((time.perf_counter() - self._started) * 1000.0, 1),
+            # 첫 화면이 보이기까지(스플래시 구간) 단계 합계
+            "ready_ms": round(sum(self.durations.get(s, 0.0) for s in _PROGRESS_STAGES), 1),
+            "stages_ms": {s: round(self.durations[s], 1) for s, _ in STAGES if s in self.durations},
+        }
+        if self._finished:
+            return record
+        self._finished = True
+
+        print("⏱ 시작 시간: " + ", ".join(f"{s} {ms:.0f}ms" for s, ms in record["stages_ms"].items())
+              + f" / 첫 화면 {record['ready_ms']:.0f}ms / 합계 {record['total_ms']:.0f}ms")
+        for line in self.slower_stages():
+            print(f"⚠ 시작 단계 느려짐: {line}")
+
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            history = self._history[-(MAX_LOG_ENTRIES - 1):] + [record]
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                for rec in history:
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠ 시작 시간 로그 저장 실패: {e}")
+        return record
+
+
+def print_report(path: Optional[Path] = None) -> int:
+    """
+    빌드별 단계 중앙값을 출력하고, 직전 빌드 대비 느려진 단계를 ▲로 표시합니다.
+    """
+    entries = read_log(path)
+    if not entries:
+        print(f"기록 없음: {path or default_log_path()}")
+        return 1
+
+    builds: Dict[str, List[Dict[str, object]]] = {}
+    for rec in entries:
+        builds.setdefault(str(rec.get("build")), []).append(rec)
+
+    prev: Optional[Dict[str, float]] = None
+    for build, recs in builds.items():
+        med = median_stages(recs)
+        print(f"[{build}] 실행 {len(recs)}회")
+        for stage, _ in STAGES:
+            if stage not in med:
+                continue
+            mark = "▲" if prev and prev.get(stage) and med[stage] >= prev[stage] * SLOWER_RATIO else " "
+            print(f"  {mark} {stage:<13} {med[stage]:8.0f} ms")
+        prev = med
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(print_report(Path(sys.argv[1]) if len(sys.argv) > 1 else None))
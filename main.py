@@ -5,6 +5,8 @@ machining_auto 통합 런처.
 - 실행 예:
   python -m machining_auto setting
   python -m machining_auto cam
+  python -m machining_auto cam scan DIR --format json|csv|xlsx   (헤드리스, Qt 미사용)
+  python -m machining_auto cam export DIR1 DIR2 ...              (CAM SHEET 일괄 저장)
 
 주의:
 - 아래 import 경로는 전하의 실제 엔트리 파일명에 맞게 1줄만 수정하면 된다.
@@ -45,10 +47,16 @@ def main(argv: list[str]) -> int:
         return 0
 
     if mode in ("cam", "c"):
+        # 하위 명령(scan 등)이 있으면 Qt 없이 헤드리스 CLI로 처리
+        if len(argv) >= 3:
+            from machining_auto.cam_sheet_auto.cli import main as cam_cli_main
+            return cam_cli_main(argv[2:])
         run_cam()
         return 0
 
     print("사용법: python -m machining_auto [setting|cam]")
+    print("       python -m machining_auto cam scan DIR [--format json|csv|xlsx] [-o 출력파일] [--analyze]")
+    print("       python -m machining_auto cam export DIR [DIR ...] [--list 목록파일] [--report 결과.json]")
     return 2
 
 
@@ -87,6 +87,20 @@ def load_global_settings() -> Tuple[List[str], Dict[str, str]]:
     return machines, clean_map
 
 
+def _read_global_settings_raw() -> Dict:
+    """
+    전역 설정 파일 전체를 dict로 읽는다. (없거나 오류면 빈 dict)
+    """
+    if not GLOBAL_SETTINGS_PATH.exists():
+        return {}
+    try:
+        with GLOBAL_SETTINGS_PATH.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def save_global_settings(machine_list: List[str], operator_map: Dict[str, str]) -> None:
     """
     현재 설비 목록과 설비별 작업자명을 전역 설정 파일(global_settings.json)에 저장.
@@ -95,11 +109,13 @@ def save_global_settings(machine_list: List[str], operator_map: Dict[str, str])
     mset = set(machine_list or [])
     filtered_map = {m: (operator_map.get(m) or "") for m in mset}
 
-    data = {
+    # machine_limits 등 이 함수가 다루지 않는 키는 그대로 보존
+    data = _read_global_settings_raw()
+    data.update({
         "machine_list": list(machine_list or []),
         "operator_map": filtered_map,
         "updated_at": datetime.now().isoformat(timespec="seconds"),
-    }
+    })
 
     try:
         with GLOBAL_SETTINGS_PATH.open("w", encoding="utf-8") as f:
@@ -117,3 +133,51 @@ def get_operator_for_machine(machine: str, operator_map: Dict[str, str]) -> str:
     if not machine:
         return ""
     return operator_map.get(machine, "") or ""
+
+
+# ─────────────────────────────────────
+# 전역 설정: 설비별 행정(travel) 한계
+# ─────────────────────────────────────
+
+def load_machine_limits() -> Dict[str, Dict[str, object]]:
+    """
+    전역 설정 파일의 machine_limits(설비별 X/Y/Z 행정 한계)를 읽어온다.
+
+    기본 배포값은 빈 {}(검사 안 함)이다. 설비 사양서의 행정 값을 현장에서 직접 넣어야 한다.
+
+    형식 (축마다 둘 중 하나, 아래 숫자는 형식 예시일 뿐 실제 설비 값이 아님):
+      "machine_limits": {
+        "Dino_Max#3": {"x": 800, "y": 600, "z": 400},     # 행정 길이: 프로그램 외곽 폭(최대-최소)과 비교 (권장)
+        "STINGER":    {"z": [-300, 50]}                   # 좌표 범위: 프로그램 좌표(공작물 좌표계) 최소/최대와 비교
+      }
+    - 프로그램 좌표는 공작물 원점(워크 오프셋) 기준이라 설비 기계 좌표와 다르다.
+      좌표 범위 형식은 설비마다 원점 설정 규칙이 고정된 경우에만 쓰고, 보통은 행정 길이 형식을 쓴다.
+    - 키는 설비명(대소문자 무시). 헤더에서 번호 없이 "DINO"로만 감지된 파일은
+      "DINO" 항목이 없으면 화면에서 선택한 설비명으로 찾는다. (envelope.find_machine_limits)
+
+    잘못된 항목은 건너뛰고, 파일이 없거나 오류가 나면 {} 반환.
+    """
+    raw = _read_global_settings_raw().get("machine_limits", {})
+    if not isinstance(raw, dict):
+        return {}
+
+    limits: Dict[str, Dict[str, object]] = {}
+    for machine, axes in raw.items():
+        if not isinstance(axes, dict):
+            continue
+        clean: Dict[str, object] = {}
+        for axis, value in axes.items():
+            axis = str(axis).strip().lower()
+            if axis not in ("x", "y", "z"):
+                continue
+            try:
+                if isinstance(value, (list, tuple)) and len(value) == 2:
+                    lo, hi = float(value[0]), float(value[1])
+                    clean[axis] = (min(lo, hi), max(lo, hi))
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    clean[axis] = float(value)
+            except (TypeError, ValueError):
+                continue
+        if clean:
+            limits[str(machine)] = clean
+    return limits
@@ -0,0 +1,19 @@
+# tests/conftest.py
+"""
+저장소 루트를 machining_auto 패키지로 등록합니다.
+- 체크아웃 폴더 이름이 machining_auto가 아니어도 `python -m pytest`로 실행되게 합니다.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "machining_auto" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "machining_auto", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["machining_auto"] = _module
+    _spec.loader.exec_module(_module)
@@ -0,0 +1,84 @@
+# tests/test_bulk_export.py
+"""
+CAM SHEET 일괄 내보내기(bulk_export) 테스트 (openpyxl 필요)
+- 여러 작업 폴더를 프로세스 풀로 처리해 폴더마다 xlsx가 저장되는지
+- 실패한 폴더가 다른 폴더를 멈추지 않고 결과/리포트에 실패로 남는지
+"""
+
+import os
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from machining_auto.benchmarks.nc_corpus import generate_corpus  # noqa: E402
+from machining_auto.cam_sheet_auto.bulk_export import bulk_export_sheets, format_report  # noqa: E402
+from machining_auto.cam_sheet_auto.excel_utils import HEADER_CELLS, build_merged_anchor_index  # noqa: E402
+
+JOBS = ("JOB_123456_A", "JOB_654321_B")
+
+
+def _header(sheet, key):
+    row, col = HEADER_CELLS[key]
+    row, col = build_merged_anchor_index(sheet).get((row, col), (row, col))
+    return sheet.cell(row=row, column=col).value
+
+
+@pytest.fixture
+def folders(tmp_path):
+    out = []
+    for i, job in enumerate(JOBS):
+        generate_corpus(str(tmp_path), n_files=5 + i, seed=10 + i, job=job)
+        out.append(os.path.join(str(tmp_path), job))
+    return out
+
+
+@pytest.mark.parametrize("workers", [2, 1])
+def test_bulk_export_writes_sheet_per_folder(folders, tmp_path, workers):
+    missing = os.path.join(str(tmp_path), "JOB_999999_MISSING")
+    seen = []
+
+    results = bulk_export_sheets(
+        folders + [missing, folders[0]],  # 같은 폴더는 1번만 처리
+        workers=workers,
+        machine_name="MC-7",
+        date="10-16",
+        cache_path="",
+        on_result=lambda r: seen.append(r.folder),
+    )
+
+    assert [r.folder for r in results] == folders + [missing]
+    assert sorted(seen) == sorted(folders + [missing])
+
+    for r, folder, n_rows in zip(results, folders, (5, 6)):
+        assert r.ok, r.error
+        assert os.path.dirname(r.save_path) == folder
+        assert os.path.basename(r.save_path).startswith(f"CAM_SHEET_{r.job_number}_")
+        assert (r.rows, r.sheets) == (n_rows, 1)
+
+        sheet = openpyxl.load_workbook(r.save_path).worksheets[0]
+        assert _header(sheet, "machine_name") == "MC-7"
+        assert _header(sheet, "job_number") == r.job_number
+
+    failed = results[-1]
+    assert not failed.ok and failed.save_path == "" and failed.error
+
+    report = format_report(results)
+    assert report[0].startswith("✅ ") and report[1].startswith("✅ ")
+    assert report[2] == f"❌ {missing}: 폴더가 없습니다."
+    assert report[-1] == "📦 일괄 내보내기: 성공 2 / 실패 1 / 전체 3"
+
+
+def test_bulk_export_keeps_existing_files(folders):
+    first = bulk_export_sheets(folders[:1], workers=1, cache_path="")[0]
+    second = bulk_export_sheets(folders[:1], workers=1, cache_path="")[0]
+    assert first.ok and second.ok
+    assert second.save_path != first.save_path
+    assert os.path.exists(first.save_path) and os.path.exists(second.save_path)
+
+
+def test_folder_without_job_number_fails(tmp_path):
+    generate_corpus(str(tmp_path), n_files=2, seed=1, job="no_job_here")
+    result = bulk_export_sheets([os.path.join(str(tmp_path), "no_job_here")], workers=1, cache_path="")[0]
+    assert not result.ok
+    assert "작업번호" in result.error
@@ -0,0 +1,28 @@
+# tests/test_cam_core.py
+"""
+폴더 스캔(scan_cam_rows) 프로세스 수 자동 결정 테스트
+- 작은 폴더는 프로세스 풀 없이 현재 스레드에서 처리하는지
+"""
+
+import os
+
+from machining_auto.benchmarks.nc_corpus import DEFAULT_JOB, generate_corpus
+from machining_auto.cam_sheet_auto import cam_core
+from machining_auto.cam_sheet_auto.cam_core import scan_cam_rows
+
+
+def test_auto_workers_threshold(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 32)
+    assert cam_core._auto_workers(cam_core.AUTO_PARALLEL_MIN_FILES - 1) == 1
+    assert cam_core._auto_workers(cam_core.AUTO_PARALLEL_MIN_FILES) == cam_core.AUTO_MAX_WORKERS
+
+
+def test_small_folder_auto_scan_skips_process_pool(tmp_path, monkeypatch):
+    generate_corpus(str(tmp_path), n_files=12, seed=3)
+    folder = os.path.join(str(tmp_path), DEFAULT_JOB)
+
+    def _no_pool(*args, **kwargs):
+        raise AssertionError("process pool used for a small folder")
+
+    monkeypatch.setattr(cam_core, "_iter_parallel", _no_pool)
+    assert len(scan_cam_rows(folder, workers=0)) == 12
@@ -0,0 +1,80 @@
+# tests/test_cam_row_store.py
+"""
+CamRow 열 저장소(CamRowStore) 테스트
+- upsert: 같은 파일명은 제자리 갱신, 새 파일명은 끝에 추가
+- remove 후 인덱스/정렬 순서가 맞는지
+- 반복은 파일명 자연 정렬(T2 < T10), 인덱스 접근은 삽입 순서인지
+"""
+
+import pytest
+
+from machining_auto.cam_sheet_auto.cam_models import CamRow
+from machining_auto.cam_sheet_auto.cam_row_store import CamRowStore, natural_key
+
+
+def _row(name, tool_no="1", **kw):
+    base = dict(
+        file_name=name, tool_db="D10", tool_no=tool_no, allowance_xy="0.1", pg_name="PG",
+        coolant="M8", equip_name="MC1", job_number="J001", date="10-16",
+    )
+    base.update(kw)
+    return CamRow(**base)
+
+
+def test_round_trip_keeps_values():
+    row = _row("T1.h", rpm="8000", line_count=120, cycle_time_s=12.5, x_min=-3.0)
+    store = CamRowStore([row])
+    assert store.get("T1.h").to_row() == row
+    # Optional[float] None은 NaN으로 저장되었다가 None으로 돌아옴
+    assert store.get("T1.h").x_max is None
+
+
+def test_upsert_updates_in_place_and_appends_new():
+    store = CamRowStore([_row("T1.h"), _row("T2.h")])
+    store.upsert([_row("T2.h", tool_no="7"), _row("T3.h")])
+
+    assert len(store) == 3
+    assert store.column("file_name") == ["T1.h", "T2.h", "T3.h"]
+    assert store.get("T2.h").tool_no == "7"
+    assert store[1].tool_no == "7"
+
+
+def test_upsert_rejects_duplicates_and_other_folder(tmp_path):
+    store = CamRowStore(folder=str(tmp_path / "a"))
+    with pytest.raises(ValueError):
+        store.upsert([_row("T1.h"), _row("T1.h")])
+    with pytest.raises(ValueError):
+        store.upsert([_row("T1.h")], folder=str(tmp_path / "b"))
+    assert len(store) == 0
+
+
+def test_iteration_is_natural_order_index_is_insertion_order():
+    names = ["T10.h", "T2.h", "T1.h", "T02b.h"]
+    store = CamRowStore([_row(n) for n in names])
+
+    assert [v.file_name for v in store] == sorted(names, key=natural_key)
+    assert [v.file_name for v in store][:3] == ["T1.h", "T2.h", "T02b.h"]
+    assert [store[i].file_name for i in range(len(store))] == names
+    assert store[-1].file_name == "T02b.h"
+
+
+def test_remove_compacts_and_reorders():
+    store = CamRowStore([_row(f"T{i}.h", tool_no=str(i)) for i in (10, 2, 1, 3)])
+    list(store)  # 정렬 순서 캐시
+    store.remove(["T2.h", "missing.h"])
+
+    assert "T2.h" not in store
+    assert [v.file_name for v in store] == ["T1.h", "T3.h", "T10.h"]
+    assert store.get("T3.h").tool_no == "3"
+    assert [r.file_name for r in store.rows()] == ["T1.h", "T3.h", "T10.h"]
+
+    store.upsert([_row("T2.h", tool_no="22")])
+    assert [v.file_name for v in store] == ["T1.h", "T2.h", "T3.h", "T10.h"]
+    assert store.get("T2.h").tool_no == "22"
+
+
+def test_string_codes_widen_past_one_byte():
+    rows = [_row(f"T{i}.h", tool_db=f"DB{i}") for i in range(300)]
+    store = CamRowStore(rows)
+    assert store.get("T299.h").tool_db == "DB299"
+    assert store.column("tool_db") == [f"DB{i}" for i in range(300)]
@@ -0,0 +1,83 @@
+# tests/test_cli.py
+"""
+헤드리스 CLI 테스트
+- 결과를 stdout으로 낼 때 스캔 로그(워커 프로세스 포함)가 출력 데이터에 섞이지 않는지
+- 트리 스캔(--recursive)은 스캔 캐시를 만들지 않는지
+- export: 폴더마다 xlsx를 저장하고, 실패 폴더가 있으면 종료 코드 1과 리포트에 남는지
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from machining_auto.benchmarks.nc_corpus import DEFAULT_JOB, generate_corpus
+from machining_auto.cam_sheet_auto import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# spawn 워커는 부모의 redirect_stdout을 물려받지 않습니다. (Windows 기본 방식)
+_SPAWN_SCRIPT = """
+import contextlib, multiprocessing, sys
+sys.path.insert(0, {tests!r})
+import conftest
+from machining_auto.cam_sheet_auto.cam_core import _new_pool
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    with contextlib.redirect_stdout(sys.stderr):
+        with _new_pool(1) as pool:
+            pool.submit(print, "worker-log").result()
+"""
+
+
+def test_spawn_worker_log_follows_redirected_stdout(tmp_path):
+    script = tmp_path / "spawn_pool.py"
+    script.write_text(_SPAWN_SCRIPT.format(tests=os.path.join(ROOT, "tests")), encoding="utf-8")
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout == ""
+    assert "worker-log" in proc.stderr
+
+
+def test_scan_json_to_stdout(tmp_path, capsys):
+    generate_corpus(str(tmp_path), n_files=6, seed=5)
+    folder = os.path.join(str(tmp_path), DEFAULT_JOB)
+
+    assert cli.main(["scan", folder, "-j", "2", "--no-cache"]) == 0
+    records = json.loads(capsys.readouterr().out)
+    assert sorted(r["file_name"] for r in records) == [f"T{i}.h" for i in range(1, 7)]
+
+
+def test_recursive_scan_does_not_open_cache(tmp_path, capsys, monkeypatch):
+    generate_corpus(str(tmp_path), n_files=3, seed=5)
+    monkeypatch.setattr(cli, "ScanCache", lambda *a, **k: (_ for _ in ()).throw(AssertionError("cache opened")))
+
+    assert cli.main(["scan", str(tmp_path), "--recursive", "-j", "1", "--cache", str(tmp_path / "c.db")]) == 0
+    out = capsys.readouterr()
+    assert len(json.loads(out.out)) == 3
+    assert "--recursive" in out.err
+
+
+def test_export_folders_with_report(tmp_path, capsys):
+    pytest.importorskip("openpyxl")
+    folders = []
+    for job in ("JOB_123456_A", "JOB_654321_B"):
+        generate_corpus(str(tmp_path), n_files=4, seed=5, job=job)
+        folders.append(os.path.join(str(tmp_path), job))
+    missing = os.path.join(str(tmp_path), "JOB_999999_MISSING")
+    listing = tmp_path / "folders.txt"
+    listing.write_text(f"# 목록\n{folders[1]}\n\n{missing}\n", encoding="utf-8")
+    report = tmp_path / "report.json"
+
+    code = cli.main(["export", folders[0], "--list", str(listing), "-j", "2", "--no-cache",
+                     "--date", "10-16", "--report", str(report)])
+    assert code == 1
+    assert "성공 2 / 실패 1 / 전체 3" in capsys.readouterr().out
+
+    records = json.loads(report.read_text(encoding="utf-8"))
+    assert [(r["folder"], r["ok"]) for r in records] == [(folders[0], True), (folders[1], True), (missing, False)]
+    for r in records[:2]:
+        assert os.path.isfile(r["save_path"]) and r["rows"] == 4
@@ -0,0 +1,78 @@
+# tests/test_cycle_time.py
+"""
+가공 시간 추정(CycleTimeAccumulator) / 외곽 치수 계산 테스트
+- 직선, FMAX(급송), CC+C 원호, CR 반경 원호, 나선 이동의 길이/시간
+- 청크 경계를 넘는 모달 값(좌표/이송/원호 중심)
+"""
+
+import io
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from machining_auto.cam_sheet_auto.nc_analyzer import analyze_nc_stream  # noqa: E402
+
+
+def _analyze(*lines, chunk_size=None):
+    data = ("\n".join(f"{i} {line}" for i, line in enumerate(lines)) + "\n").encode("ascii")
+    if chunk_size is None:
+        return analyze_nc_stream(io.BytesIO(data))
+    return analyze_nc_stream(io.BytesIO(data), chunk_size=chunk_size)
+
+
+START = ("BEGIN PGM T1 MM", "TOOL CALL 1 Z S8000", "L X+10 Y+0 Z+0 FMAX")
+
+
+def test_linear_move_uses_modal_feed():
+    st = _analyze(*START, "L X+70 F600", "L Y+40")
+    assert st.cycle.cut_length == pytest.approx(100.0)
+    assert st.cycle.cut_time_s == pytest.approx(10.0)
+
+
+def test_fmax_counts_rapid_only_and_keeps_modal_feed():
+    st = _analyze(*START, "L X+70 F600", "L Z+100 FMAX", "L Z+0 FMAX", "L X+10")
+    assert st.cycle.rapid_count == 3
+    assert st.cycle.rapid_length == pytest.approx(200.0)  # 첫 이동은 시작점을 몰라 길이 0
+    assert st.cycle.cut_length == pytest.approx(120.0)
+    assert st.cycle.cut_time_s == pytest.approx(12.0)  # FMAX 뒤 이동도 F600
+    assert st.cycle.cycle_time_s(30000.0) == pytest.approx(12.0 + 200.0 / 30000.0 * 60.0)
+
+
+@pytest.mark.parametrize("direction, sweep", [("DR+", math.pi / 2), ("DR-", 3 * math.pi / 2)])
+def test_cc_arc_direction(direction, sweep):
+    st = _analyze(*START, "CC X+0 Y+0", f"C X+0 Y+10 {direction} F600")
+    assert st.cycle.cut_length == pytest.approx(10.0 * sweep)
+
+
+def test_cc_arc_full_circle_when_end_equals_start():
+    st = _analyze(*START, "CC X+0 Y+0", "C X+10 Y+0 DR+ F600")
+    assert st.cycle.cut_length == pytest.approx(20.0 * math.pi)
+
+
+@pytest.mark.parametrize("radius, sweep", [("R+10", math.pi / 2), ("R-10", 3 * math.pi / 2)])
+def test_cr_arc_radius_sign(radius, sweep):
+    st = _analyze(*START, f"CR X+0 Y+10 {radius} DR+ F600")
+    assert st.cycle.cut_length == pytest.approx(10.0 * sweep)
+
+
+def test_helical_arc_length():
+    st = _analyze(*START, "CC X+0 Y+0", "C X+0 Y+10 Z-5 DR+ F600")
+    assert st.cycle.cut_length == pytest.approx(math.hypot(5.0 * math.pi, 5.0))
+
+
+def test_arc_extents_include_quadrant_points():
+    st = _analyze(*START, "CC X+0 Y+0", "C X+0 Y+10 DR- F600")
+    ext = st.extents
+    assert (ext.x_min, ext.x_max) == pytest.approx((-10.0, 10.0))
+    assert (ext.y_min, ext.y_max) == pytest.approx((-10.0, 10.0))
+
+
+def test_modal_state_carries_across_chunks():
+    lines = (*START, "L X+70 F600", "CC X+0 Y+0", "L Y+5", "C X+0 Y+10 DR+",
+             "TOOL CALL 2 Z S9000", "L X+40 FMAX", "CR X+20 Y+30 R+10 DR- F300", "L Z-3")
+    whole = _analyze(*lines)
+    for size in (8, 24, 50):
+        assert _analyze(*lines, chunk_size=size).cycle == whole.cycle
+        assert _analyze(*lines, chunk_size=size).extents == whole.extents
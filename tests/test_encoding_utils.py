@@ -0,0 +1,107 @@
+# tests/test_encoding_utils.py
+"""
+인코딩 감지(detect_encoding) 빠른 경로/폴더 메모 테스트
+- chardet 결과는 가짜 모듈로 고정합니다. (설치 여부와 무관하게 같은 결과)
+"""
+
+import sys
+import types
+
+import pytest
+
+from machining_auto.cam_sheet_auto import encoding_utils
+from machining_auto.cam_sheet_auto.encoding_utils import detect_encoding, get_detect_stats, read_file_with_encoding
+
+KOREAN = "0 BEGIN PGM T1 MM\r\n1 ; 작업내용 : 황삭 가공\r\n2 ; 공구 D10 평엔드밀\r\n"
+ASCII = "0 BEGIN PGM T2 MM\r\n1 TOOL CALL 2 Z S8000\r\n"
+# CP949로는 디코딩되지 않는 Windows-1252 바이트 (é 뒤에 공백: CP949 두 번째 바이트로 불가)
+LATIN = "0 BEGIN PGM T3 MM\r\n1 ; caf\xe9 \r\n".encode("cp1252")
+
+
+@pytest.fixture
+def fake_chardet(monkeypatch):
+    """chardet을 호출 횟수를 세는 가짜 모듈로 바꾸고, 폴더 메모/통계를 비웁니다."""
+    calls = []
+
+    def detect(raw):
+        calls.append(raw)
+        return {"encoding": fake.guess}
+
+    fake = types.SimpleNamespace(detect=detect, guess="Windows-1252")
+    monkeypatch.setitem(sys.modules, "chardet", fake)
+    monkeypatch.setattr(encoding_utils, "_ENCODING_MEMO", {})
+    encoding_utils.reset_detect_stats()
+    fake.calls = calls
+    return fake
+
+
+def test_mixed_cp949_ascii_folder(tmp_path, fake_chardet):
+    (tmp_path / "T3.h").write_bytes(LATIN)
+    for i in range(1, 7):
+        text = KOREAN if i % 2 else ASCII
+        (tmp_path / f"T{i}0.h").write_bytes(text.encode("cp949"))
+
+    # chardet이 단일 바이트 코덱을 고른 파일이 먼저 와도 메모에 남지 않아야 함
+    assert detect_encoding(str(tmp_path / "T3.h")) == "Windows-1252"
+    assert encoding_utils._ENCODING_MEMO == {}
+
+    for i in range(1, 7):
+        path = str(tmp_path / f"T{i}0.h")
+        assert detect_encoding(path) == "cp949", path
+        lines, enc = read_file_with_encoding(path)
+        assert "".join(lines).replace("\r\n", "\n") == (KOREAN if i % 2 else ASCII).replace("\r\n", "\n")
+
+    stats = get_detect_stats()
+    assert stats["chardet"] == 1 and len(fake_chardet.calls) == 1
+    # read_file_with_encoding도 한 번 더 감지하므로 파일당 2회
+    # 첫 한글 파일만 CP949 엄격 디코딩, 이후는 폴더 메모(cp949)로 바로 판정
+    assert stats["ascii"] == 6
+    assert stats["cp949"] == 1 and stats["memo"] == 5 and stats["utf8"] == 0
+    assert list(encoding_utils._ENCODING_MEMO.values()) == ["cp949"]
+
+
+def test_multibyte_guess_is_memoized(tmp_path, fake_chardet):
+    # CP949/UTF-8로 디코딩되지 않는 Shift_JIS 바이트(반각 가나)
+    data = "0 BEGIN PGM T1 MM\r\n1 ; ｱｲｳ ｴｵ \r\n".encode("shift_jis")
+    (tmp_path / "A.h").write_bytes(data)
+    (tmp_path / "B.h").write_bytes(data)
+    fake_chardet.guess = "SHIFT_JIS"
+
+    assert detect_encoding(str(tmp_path / "A.h")) == "SHIFT_JIS"
+    assert detect_encoding(str(tmp_path / "B.h")) == "SHIFT_JIS"
+    stats = get_detect_stats()
+    assert stats["chardet"] == 1 and stats["memo"] == 1
+
+
+def test_single_byte_guess_not_reused_for_later_files(tmp_path, fake_chardet):
+    (tmp_path / "A.h").write_bytes(LATIN)
+    (tmp_path / "B.h").write_bytes(LATIN)
+
+    detect_encoding(str(tmp_path / "A.h"))
+    detect_encoding(str(tmp_path / "B.h"))
+    # 메모 없이 매번 chardet으로 다시 판단
+    assert len(fake_chardet.calls) == 2
+    assert get_detect_stats()["memo"] == 0
+
+
+def test_memo_is_tried_before_utf8_and_cp949(tmp_path, fake_chardet):
+    # 첫 파일은 GB18030 전용 바이트(4바이트 문자)라 chardet으로 판단
+    (tmp_path / "A.h").write_bytes("0 BEGIN PGM T1 MM\r\n1 ; 加工 €\U00020000 \r\n".encode("gb18030"))
+    # 두 번째 파일은 GB18030으로도, CP949로도 디코딩되는 한자
+    (tmp_path / "B.h").write_bytes("0 BEGIN PGM T2 MM\r\n1 ; 加工 \r\n".encode("gb18030"))
+    fake_chardet.guess = "GB18030"
+
+    assert detect_encoding(str(tmp_path / "A.h")) == "GB18030"
+    assert detect_encoding(str(tmp_path / "B.h")) == "GB18030"
+    stats = get_detect_stats()
+    assert stats["chardet"] == 1 and stats["memo"] == 1 and stats["cp949"] == 0
+
+
+def test_utf8_winner_is_memoized(tmp_path, fake_chardet):
+    for name in ("A.h", "B.h"):
+        (tmp_path / name).write_bytes(KOREAN.encode("utf-8"))
+
+    assert detect_encoding(str(tmp_path / "A.h")) == "utf-8"
+    assert detect_encoding(str(tmp_path / "B.h")) == "utf-8"
+    stats = get_detect_stats()
+    assert stats["utf8"] == 1 and stats["memo"] == 1 and not fake_chardet.calls
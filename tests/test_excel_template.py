@@ -0,0 +1,217 @@
+# tests/test_excel_template.py
+"""
+CAM SHEET 템플릿 캐시/병합 셀 입력 테스트 (openpyxl 필요)
+"""
+
+from copy import copy
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from machining_auto.cam_sheet_auto.excel_utils import (  # noqa: E402
+    HEADER_CELLS,
+    ROWS_PER_SHEET,
+    TEMPLATE_PATH,
+    TemplateCache,
+    build_merged_anchor_index,
+    export_to_excel_with_auto_filename,
+    fill_template_sheets,
+    save_template_workbook,
+    set_value_in_merged_cell,
+)
+
+
+def _merged(sheet):
+    return sorted(str(r) for r in sheet.merged_cells.ranges)
+
+
+def _style(cell):
+    # StyleProxy는 값 비교가 안 되므로 사본으로 비교합니다.
+    return (
+        copy(cell.font), copy(cell.fill), copy(cell.border), copy(cell.alignment),
+        cell.number_format, copy(cell.protection),
+    )
+
+
+@pytest.fixture(scope="module")
+def original():
+    workbook = openpyxl.load_workbook(TEMPLATE_PATH)
+    yield workbook
+    workbook.close()
+
+
+def test_template_cache_round_trip_keeps_layout(original):
+    cache = TemplateCache(TEMPLATE_PATH)
+    copy = cache.workbook()
+    src, dst = original.active, copy.active
+
+    assert dst.title == src.title
+    assert _merged(dst) == _merged(src)
+    assert dst.print_area == src.print_area
+    assert dst.page_margins.left == src.page_margins.left
+    assert dst.page_margins.top == src.page_margins.top
+    assert dst.page_setup.orientation == src.page_setup.orientation
+    assert dst.page_setup.paperSize == src.page_setup.paperSize
+    assert dst.oddFooter.center.text == src.oddFooter.center.text
+
+    for row in src.iter_rows():
+        for cell in row:
+            other = dst.cell(row=cell.row, column=cell.column)
+            assert other.value == cell.value, cell.coordinate
+            assert _style(other) == _style(cell), cell.coordinate
+    for key, dim in src.column_dimensions.items():
+        assert dst.column_dimensions[key].width == dim.width
+
+
+def test_template_cache_copies_are_independent():
+    cache = TemplateCache(TEMPLATE_PATH)
+    first, second = cache.workbook(), cache.workbook()
+    first.active["A6"] = "CHANGED"
+    assert second.active["A6"].value != "CHANGED"
+    assert cache.merged_index() == build_merged_anchor_index(second.active)
+
+
+def test_set_value_in_merged_cell_with_and_without_index():
+    cache = TemplateCache(TEMPLATE_PATH)
+    index = cache.merged_index()
+    for merged_index in (index, None):
+        sheet = cache.workbook().active
+        for key, (row, col) in HEADER_CELLS.items():
+            set_value_in_merged_cell(sheet, row, col, key, merged_index)
+            anchor_row, anchor_col = index.get((row, col), (row, col))
+            assert sheet.cell(row=anchor_row, column=anchor_col).value == key
+
+
+def _rows(n):
+    return ((f"T{i}.h", "D10", str(i), "0.1", "황삭") for i in range(1, n + 1))
+
+
+def test_overflow_sheet_keeps_print_settings(tmp_path):
+    cache = TemplateCache(TEMPLATE_PATH)
+    workbook = cache.workbook()
+    first = workbook.active
+    # 템플릿에 인쇄 영역/인쇄 제목이 있는 경우도 시트 2로 옮겨지는지 확인
+    first.print_area = "A1:T56"
+    first.print_title_rows = "1:3"
+
+    written = fill_template_sheets(workbook, _rows(ROWS_PER_SHEET + 10), "123450", "Dino_Max#3", "01-02",
+                                   cache.merged_index())
+    assert written == ROWS_PER_SHEET + 10
+    path = tmp_path / "out.xlsx"
+    workbook.save(path)
+
+    saved = openpyxl.load_workbook(path)
+    assert len(saved.worksheets) == 2
+    src, second = saved.worksheets
+    assert second.title == f"{src.title} (2)"
+    assert second.print_area == f"'{second.title}'!$A$1:$T$56"
+    assert second.print_title_rows == "$1:$3"
+    for name in ("left", "right", "top", "bottom", "header", "footer"):
+        assert getattr(second.page_margins, name) == getattr(src.page_margins, name)
+    assert second.page_setup.orientation == src.page_setup.orientation
+    assert second.page_setup.paperSize == src.page_setup.paperSize
+    assert second.print_options.horizontalCentered == src.print_options.horizontalCentered
+    assert second.oddFooter.center.text == src.oddFooter.center.text
+    assert _merged(second) == _merged(src)
+
+    # 헤더는 유지, 데이터 칸은 넘친 행만
+    assert second["A6"].value == f"T{ROWS_PER_SHEET + 1}.h"
+    assert second["A16"].value is None
+    row, col = HEADER_CELLS["job_number"]
+    anchor = build_merged_anchor_index(second).get((row, col), (row, col))
+    assert second.cell(row=anchor[0], column=anchor[1]).value == "123450"
+    saved.close()
+
+
+def _image_blobs(sheet):
+    blobs = []
+    for image in sheet._images:
+        image.ref.seek(0)
+        blobs.append(image.ref.read())
+        image.ref.seek(0)
+    return blobs
+
+
+@pytest.mark.parametrize("extra", [1, 104])
+def test_overflow_sheet_keeps_images(tmp_path, extra):
+    pytest.importorskip("PIL")  # Pillow가 없으면 openpyxl이 그림을 읽지 않음
+    cache = TemplateCache(TEMPLATE_PATH)
+    workbook = cache.workbook()
+    assert workbook.active._images, "템플릿 로고가 읽혀야 합니다"
+    fill_template_sheets(workbook, _rows(ROWS_PER_SHEET + extra), "123450", "M", "01-02", cache.merged_index())
+    assert len(workbook.worksheets[1]._images) == len(workbook.active._images)
+    path = tmp_path / "out.xlsx"
+    workbook.save(path)  # 원본 그림 핸들이 닫혀 있으면 여기서 ValueError
+    saved = openpyxl.load_workbook(path)
+    first_blobs = _image_blobs(saved.worksheets[0])
+    assert first_blobs
+    for sheet in saved.worksheets[1:]:
+        assert _image_blobs(sheet) == first_blobs
+    saved.close()
+
+
+def test_save_template_workbook_over_one_sheet(tmp_path):
+    path = tmp_path / "sheet.xlsx"
+    written, sheets = save_template_workbook(str(path), _rows(200), "123450", "M", "01-02")
+    assert (written, sheets) == (200, 3)
+    saved = openpyxl.load_workbook(path)
+    assert len(saved.worksheets) == 3
+    saved.close()
+
+
+class _Item:
+    def __init__(self, text):
+        self._text = text
+
+    def text(self):
+        return self._text
+
+
+class _Table:
+    """QTableWidget의 rowCount()/item(r, c)만 흉내 냅니다."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def rowCount(self):
+        return len(self.rows)
+
+    def item(self, r, c):
+        value = self.rows[r][c]
+        return _Item(value) if value is not None else None
+
+
+def test_export_to_excel_with_auto_filename(tmp_path):
+    rows = [(f"T{i}.h", "D10", str(i), "0.1", "황삭", "ON") for i in range(1, 31)]
+    rows[3] = ("T4.h", None, "4", "0.1", "정삭", "ON")
+    first = export_to_excel_with_auto_filename("123450", "M", "01-02", _Table(rows), str(tmp_path))
+    second = export_to_excel_with_auto_filename("123450", "M", "01-02", _Table(rows), str(tmp_path))
+
+    assert first and first.startswith(str(tmp_path))
+    assert second != first and second.endswith("-2.xlsx")  # 같은 날 두 번째 저장은 -2
+    saved = openpyxl.load_workbook(first)
+    sheet = saved.active
+    assert sheet["A6"].value == "T1.h"
+    assert sheet["A9"].value == "T4.h"
+    saved.close()
+
+
+def test_export_to_excel_writes_cam_rows_table(tmp_path):
+    from machining_auto.cam_sheet_auto.cam_models import CamRow
+    from machining_auto.cam_sheet_auto.excel_writer import TABLE_COLUMNS
+    from machining_auto.cam_sheet_auto.functions import export_to_excel
+
+    rows = [
+        CamRow(f"T{i}.h", "D10", str(i), "0.1", "황삭", "ON", "M", "123450", "01-02")
+        for i in range(1, 4)
+    ]
+    path = str(tmp_path / "table.xlsx")
+    assert export_to_excel(path, rows) == 3
+
+    saved = openpyxl.load_workbook(path)
+    values = [list(r) for r in saved.active.iter_rows(values_only=True)]
+    saved.close()
+    assert values[0] == [h for h, _ in TABLE_COLUMNS]
+    assert values[1:] == [["T1.h", "D10", "1", "0.1", "황삭", "ON"], ["T2.h", "D10", "2", "0.1", "황삭", "ON"],
+                          ["T3.h", "D10", "3", "0.1", "황삭", "ON"]]
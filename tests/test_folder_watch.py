@@ -0,0 +1,108 @@
+# tests/test_folder_watch.py
+"""
+폴더 감시(FolderWatcher) / 변경분 스캔(scan_cam_changes) 테스트
+- 추가/수정/삭제된 파일만 다시 분석하는지
+- 짧은 시간에 몰린 이벤트가 debounce로 1회 스캔에 묶이고, 행 단위 시그널로 전달되는지
+"""
+
+import os
+import time
+
+import pytest
+
+from machining_auto.benchmarks.nc_corpus import DEFAULT_JOB, generate_corpus
+from machining_auto.cam_sheet_auto import cam_core
+from machining_auto.cam_sheet_auto.cam_core import scan_cam_changes, snapshot_h_files
+from machining_auto.cam_sheet_auto.scan_cache import ScanCache
+
+
+@pytest.fixture
+def folder(tmp_path):
+    generate_corpus(str(tmp_path), n_files=6, seed=7)
+    return os.path.join(str(tmp_path), DEFAULT_JOB)
+
+
+def _change_folder(folder):
+    """파일 1개 추가(복사) / 1개 수정(크기 변경) / 1개 삭제 후 (추가, 수정, 삭제) 파일명을 반환합니다."""
+    names = sorted(snapshot_h_files(folder))
+    added, modified, removed = "NEW_1.h", names[0], names[1]
+    with open(os.path.join(folder, names[2]), "rb") as src, open(os.path.join(folder, added), "wb") as dst:
+        dst.write(src.read())
+    with open(os.path.join(folder, modified), "ab") as f:
+        f.write(b"; edited\n")
+    os.remove(os.path.join(folder, removed))
+    return added, modified, removed
+
+
+def test_scan_cam_changes_reports_only_changed_files(folder, tmp_path, monkeypatch):
+    previous = snapshot_h_files(folder)
+    added, modified, removed = _change_folder(folder)
+
+    parsed = []
+    real_parse = cam_core._parse_files
+    monkeypatch.setattr(
+        cam_core, "_parse_files",
+        lambda folder_path, names, *a: parsed.extend(names) or real_parse(folder_path, names, *a),
+    )
+
+    cache = ScanCache(str(tmp_path / "scan_cache.sqlite3"))
+    try:
+        current, added_rows, updated_rows, removed_names = scan_cam_changes(folder, previous, cache)
+        assert sorted(parsed) == sorted([added, modified])
+        assert [r.file_name for r in added_rows] == [added]
+        assert [r.file_name for r in updated_rows] == [modified]
+        assert removed_names == [removed]
+        assert current == snapshot_h_files(folder)
+
+        # 변경이 없으면 다시 분석하지 않음
+        parsed.clear()
+        assert scan_cam_changes(folder, current, cache)[1:] == ([], [], [])
+        assert parsed == []
+    finally:
+        cache.close()
+
+
+def test_watcher_debounces_events_and_emits_row_signals(folder, monkeypatch):
+    pytest.importorskip("PySide6")
+    from PySide6.QtCore import QCoreApplication
+
+    from machining_auto.cam_sheet_auto import folder_watch
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+
+    scans = []
+    real_scan = folder_watch.scan_cam_changes
+    monkeypatch.setattr(
+        folder_watch, "scan_cam_changes",
+        lambda *a, **kw: scans.append(a[0]) or real_scan(*a, **kw),
+    )
+
+    watcher = folder_watch.FolderWatcher(debounce_ms=100, poll_ms=60_000)
+    got = {"inserted": [], "updated": [], "removed": []}
+    watcher.rows_inserted.connect(lambda rows: got["inserted"].extend(r.file_name for r in rows))
+    watcher.rows_updated.connect(lambda rows: got["updated"].extend(r.file_name for r in rows))
+    watcher.rows_removed.connect(got["removed"].extend)
+
+    try:
+        watcher.start(folder)
+        added, modified, removed = _change_folder(folder)
+        # 네이티브 이벤트와 별개로, 몰린 이벤트를 직접 흉내 냄
+        for _ in range(5):
+            watcher._on_fs_event(folder)
+
+        deadline = time.monotonic() + 5
+        while not got["removed"] and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        # 추가 이벤트가 없는지 debounce 간격보다 조금 더 지켜봄
+        settle = time.monotonic() + 0.3
+        while time.monotonic() < settle:
+            app.processEvents()
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+        if watcher._thread is not None:
+            watcher._thread.wait()
+
+    assert scans == [folder]
+    assert got == {"inserted": [added], "updated": [modified], "removed": [removed]}
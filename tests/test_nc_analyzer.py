@@ -0,0 +1,46 @@
+# tests/test_nc_analyzer.py
+"""
+프로그램 전체 분석(analyze_nc_stream) 테스트
+- TOOL CALL / 회전수 / 이송 / 줄 수 집계
+- 청크 크기와 무관하게 같은 결과를 내는지
+"""
+
+import io
+
+from machining_auto.cam_sheet_auto.nc_analyzer import analyze_nc_stream
+
+PROGRAM = (
+    b"0 BEGIN PGM T1 MM\n"
+    b"1 ; WOC = 0.50\n"
+    b"2 TOOL CALL 12 Z S8000\n"
+    b"3 L X+10 Y+0 Z+0 F1200.\n"
+    b"4 L X+20 FMAX\n"
+    b"5 tool call 5 Z s12000\n"
+    b"6 L X+0 F500\n"
+    b"7 L Y+5 F1200\n"
+    b"8 END PGM T1 MM"
+)
+
+
+def test_counts_and_header_values():
+    st = analyze_nc_stream(io.BytesIO(PROGRAM))
+    assert st.line_count == 9
+    assert st.segment_count == 4
+    assert st.woc == "0.5"
+    assert st.rpm_text == "8000/12000"
+    assert st.main_feed == "1200"
+    assert st.feeds_text == "500,1200"
+
+
+def test_lowercase_tool_call_is_counted():
+    st = analyze_nc_stream(io.BytesIO(PROGRAM))
+    assert st.tool_calls == (("12", "8000"), ("5", "12000"))
+    assert st.tool_calls_text == "T12 S8000 / T5 S12000"
+    if st.cycle is not None:  # NumPy가 있으면 공구 구간도 TOOL CALL 수와 맞아야 함
+        assert len(st.cycle.tools) == 3
+
+
+def test_chunk_size_does_not_change_result():
+    whole = analyze_nc_stream(io.BytesIO(PROGRAM))
+    for size in (40, 64, 128):  # WOC는 첫 청크(헤더)에서만 찾으므로 헤더 주석보다 크게
+        assert analyze_nc_stream(io.BytesIO(PROGRAM), chunk_size=size) == whole
@@ -0,0 +1,36 @@
+# tests/test_parse_header.py
+"""
+헤더 파싱 회귀 테스트
+- parse_header_lines(사전 컴파일 + 키워드 분류)가 변경 전 구현과 같은 결과를 내는지 검사합니다.
+- 기준 구현/합성 헤더는 벤치마크(bench_parse_header)와 같은 것을 씁니다.
+"""
+
+import random
+
+import pytest
+
+from machining_auto.benchmarks.bench_parse_header import legacy_parse_header_lines, make_header
+from machining_auto.cam_sheet_auto.functions import parse_header_lines
+
+
+@pytest.mark.parametrize("seed", [1234, 7, 2024])
+def test_matches_legacy_on_generated_headers(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        lines = make_header(rng, n_lines=rng.randint(1, 120))
+        job = rng.choice(["N/A", "123450"])
+        assert parse_header_lines(lines, job) == legacy_parse_header_lines(lines, job), lines
+
+
+@pytest.mark.parametrize("lines", [
+    [],
+    [""],
+    ["; tname:D10R0.5", "tool call 12 z s8000", "; allowance:-0.05"],
+    ["; [첫 번째]", "; [두 번째] [세 번째]", "; TNAME :   "],
+    ["L Z+100 M3", "L X+0 M13", "L Y+0 M8M17", "L Z-5 M17 M8"],
+    ["; MACHINE : stinger dino_max#2", "; JOB NUMBER : J1 J2", "; JOB NUMBER :"],
+    ["TOOL CALL 5 Z S100", "TOOL CALL 6 Y", "TOOL CALL 07 Z"],
+    ["; ALLOWANCE : .", "; ALLOWANCE : 0.1.2", "; allowance :abc"],
+])
+def test_matches_legacy_on_edge_cases(lines):
+    assert parse_header_lines(lines, "N/A") == legacy_parse_header_lines(lines, "N/A")
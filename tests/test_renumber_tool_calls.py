@@ -0,0 +1,128 @@
+# tests/test_renumber_tool_calls.py
+"""
+TOOL CALL 일괄 번호 변경(renumber_tool_calls) 테스트
+- 일반 경로 / 대용량 in-place(mmap) / 대용량 스트리밍 복사 / 실패 시 원복 / 임시 파일 정리
+"""
+
+import os
+
+import pytest
+
+from machining_auto.cam_sheet_auto import cam_core
+from machining_auto.cam_sheet_auto.cam_core import renumber_tool_calls
+
+PROGRAM = (
+    "0 BEGIN PGM T5 MM\r\n"
+    "1 ; 황삭 가공\r\n"
+    "2 TOOL CALL 5 Z S8000 F2000\r\n"
+    "3 L X+0 Y+0 R0 FMAX\r\n"
+    "4 tool call 5 z s9000\r\n"
+    "5 ; TOOL CALL 7 (주석 아님, Z 없음)\r\n"
+    "6 END PGM T5 MM\r\n"
+).encode("cp949")
+
+
+def _write(path, data=PROGRAM):
+    path.write_bytes(data)
+    return str(path)
+
+
+def _expected(new_no: bytes) -> bytes:
+    return PROGRAM.replace(b"TOOL CALL 5 Z", b"TOOL CALL " + new_no + b" Z").replace(
+        b"tool call 5 z", b"tool call " + new_no + b" z"
+    )
+
+
+def _names(folder):
+    return sorted(os.listdir(folder))
+
+
+@pytest.fixture
+def mmap_always(monkeypatch):
+    # 작은 파일도 대용량(mmap) 경로로 처리
+    monkeypatch.setattr(cam_core, "MMAP_PATCH_MIN_BYTES", 0)
+
+
+def test_small_file_replaced_atomically(tmp_path):
+    path = _write(tmp_path / "T5.h")
+    ok, messages = renumber_tool_calls({path: "12"})
+    assert ok, messages
+    assert "(2곳)" in messages[path]
+    assert (tmp_path / "T5.h").read_bytes() == _expected(b"12")
+    assert _names(tmp_path) == ["T5.h"]
+
+
+def test_mmap_patch_same_width_in_place(tmp_path, mmap_always):
+    path = _write(tmp_path / "T5.h")
+    inode = os.stat(path).st_ino
+    ok, messages = renumber_tool_calls({path: "7"})
+    assert ok, messages
+    assert messages[path].endswith("[in-place]")
+    assert (tmp_path / "T5.h").read_bytes() == _expected(b"7")
+    assert os.stat(path).st_ino == inode  # 교체가 아니라 제자리 덮어쓰기
+    assert _names(tmp_path) == ["T5.h"]
+
+
+def test_mmap_stream_copy_when_width_changes(tmp_path, mmap_always, monkeypatch):
+    # 청크 경계를 여러 번 넘도록 복사 단위를 줄임
+    monkeypatch.setattr(cam_core, "_COPY_CHUNK_BYTES", 16)
+    path = _write(tmp_path / "T5.h")
+    ok, messages = renumber_tool_calls({path: "105"})
+    assert ok, messages
+    assert messages[path].endswith("[stream]")
+    assert (tmp_path / "T5.h").read_bytes() == _expected(b"105")
+    assert _names(tmp_path) == ["T5.h"]
+
+
+def test_unchanged_file_is_left_alone(tmp_path):
+    path = _write(tmp_path / "T5.h")
+    mtime = os.stat(path).st_mtime_ns
+    ok, messages = renumber_tool_calls({path: "5"})
+    assert ok, messages
+    assert os.stat(path).st_mtime_ns == mtime
+    assert _names(tmp_path) == ["T5.h"]
+
+
+def test_stage_failure_touches_nothing(tmp_path):
+    good = _write(tmp_path / "T5.h")
+    missing = str(tmp_path / "T9.h")
+    ok, messages = renumber_tool_calls({good: "12", missing: "12"})
+    assert not ok
+    assert "실패" in messages[missing]
+    assert "취소" in messages[good]
+    assert (tmp_path / "T5.h").read_bytes() == PROGRAM
+    assert _names(tmp_path) == ["T5.h"]
+
+
+@pytest.mark.parametrize("new_no, threshold", [("12", None), ("7", 0), ("105", 0)])
+def test_commit_failure_rolls_back_batch(tmp_path, monkeypatch, new_no, threshold):
+    if threshold is not None:
+        monkeypatch.setattr(cam_core, "MMAP_PATCH_MIN_BYTES", threshold)
+    first = _write(tmp_path / "T1.h")
+    second = _write(tmp_path / "T2.h")
+    third = _write(tmp_path / "T3.h")
+
+    commit = cam_core._commit_plan
+
+    def _failing_commit(path, plan):
+        if path == third:
+            raise OSError("디스크 쓰기 실패")
+        return commit(path, plan)
+
+    monkeypatch.setattr(cam_core, "_commit_plan", _failing_commit)
+    ok, messages = renumber_tool_calls({first: new_no, second: new_no, third: new_no}, workers=1)
+
+    assert not ok
+    assert "디스크 쓰기 실패" in messages[third]
+    assert "원복" in messages[first] and "원복" in messages[second]
+    for name in ("T1.h", "T2.h", "T3.h"):
+        assert (tmp_path / name).read_bytes() == PROGRAM, name
+    # 임시 수정본/백업이 남지 않아야 함
+    assert _names(tmp_path) == ["T1.h", "T2.h", "T3.h"]
+
+
+def test_non_digit_number_rejected(tmp_path):
+    path = _write(tmp_path / "T5.h")
+    ok, messages = renumber_tool_calls({path: "1a"})
+    assert not ok
+    assert (tmp_path / "T5.h").read_bytes() == PROGRAM
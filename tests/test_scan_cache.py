@@ -0,0 +1,135 @@
+# tests/test_scan_cache.py
+"""
+스캔 캐시(ScanCache) 회귀 테스트
+- 캐시 사용 여부와 무관하게 같은 결과를 내는지
+- 크기 / 수정 시각 / 파서 버전이 바뀐 파일만 다시 분석하는지
+"""
+
+import os
+import threading
+
+import pytest
+
+from machining_auto.benchmarks.nc_corpus import DEFAULT_JOB, generate_corpus
+from machining_auto.cam_sheet_auto import cam_core
+from machining_auto.cam_sheet_auto.cam_core import scan_cam_rows
+from machining_auto.cam_sheet_auto.scan_cache import ScanCache
+
+
+@pytest.fixture
+def folder(tmp_path):
+    generate_corpus(str(tmp_path), n_files=24, seed=99)
+    return os.path.join(str(tmp_path), DEFAULT_JOB)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScanCache(str(tmp_path / "scan_cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """실제로 분석(파싱)한 파일명을 기록합니다."""
+    names = []
+    iter_parse_files = cam_core._iter_parse_files
+
+    def _recording(folder_path, file_names, *args, **kwargs):
+        names.extend(file_names)
+        return iter_parse_files(folder_path, file_names, *args, **kwargs)
+
+    monkeypatch.setattr(cam_core, "_iter_parse_files", _recording)
+    return names
+
+
+@pytest.mark.parametrize("analyze", [False, True])
+def test_cached_scan_matches_uncached(folder, cache, parsed, analyze):
+    expected = scan_cam_rows(folder, analyze=analyze)
+    assert len(expected) == 24
+
+    cold = scan_cam_rows(folder, cache=cache, analyze=analyze)
+    parsed.clear()
+    warm = scan_cam_rows(folder, cache=cache, analyze=analyze)
+
+    assert cold == expected
+    assert warm == expected
+    assert parsed == []  # 두 번째 스캔은 모두 캐시 적중
+
+
+def _touch(path, delta_ns=2_000_000_000):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+def test_size_change_invalidates_entry(folder, cache, parsed):
+    scan_cam_rows(folder, cache=cache)
+    path = os.path.join(folder, "T3.h")
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, "ab") as f:
+        f.write(b"; padding\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))  # 수정 시각은 그대로, 크기만 변경
+
+    parsed.clear()
+    rows = scan_cam_rows(folder, cache=cache)
+    assert parsed == ["T3.h"]
+    assert rows == scan_cam_rows(folder)
+
+
+def test_mtime_change_invalidates_entry(folder, cache, parsed):
+    scan_cam_rows(folder, cache=cache)
+    _touch(os.path.join(folder, "T5.h"))
+
+    parsed.clear()
+    scan_cam_rows(folder, cache=cache)
+    assert parsed == ["T5.h"]
+
+
+def test_parser_version_change_invalidates_all(folder, cache, parsed, monkeypatch):
+    scan_cam_rows(folder, cache=cache)
+    monkeypatch.setattr(cam_core, "PARSER_VERSION", cam_core.PARSER_VERSION + 1)
+
+    parsed.clear()
+    rows = scan_cam_rows(folder, cache=cache)
+    assert sorted(parsed) == sorted(os.listdir(folder))
+
+    parsed.clear()
+    assert scan_cam_rows(folder, cache=cache) == rows
+    assert parsed == []
+
+
+def test_header_cache_not_used_for_analysis(folder, cache, parsed):
+    scan_cam_rows(folder, cache=cache)  # 헤더만 저장
+    parsed.clear()
+    scan_cam_rows(folder, cache=cache, analyze=True)
+    assert len(parsed) == 24
+
+    # 전체 분석 결과는 헤더 스캔에서도 그대로 적중
+    parsed.clear()
+    scan_cam_rows(folder, cache=cache)
+    assert parsed == []
+
+
+def test_release_thread_closes_worker_connection(folder, cache):
+    def _worker():
+        try:
+            scan_cam_rows(folder, cache=cache)
+        finally:
+            cache.release_thread()
+
+    threads = [threading.Thread(target=_worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache._conns == []
+
+
+def test_unwritable_cache_dir_falls_back_to_uncached_scan(folder, tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    cache = ScanCache(str(blocker / "scan_cache.sqlite3"))  # 상위가 파일이라 mkdir 실패
+    try:
+        assert scan_cam_rows(folder, cache=cache) == scan_cam_rows(folder)
+    finally:
+        cache.close()
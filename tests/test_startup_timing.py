@@ -0,0 +1,99 @@
+# tests/test_startup_timing.py
+"""
+시작 시간 측정(StartupTimer) 테스트
+- 스플래시 진행률이 지난 실행들의 단계별 중앙값 비율로 계산되는지
+- finish() 기록이 JSON Lines 로그로 저장되고 다시 읽히는지
+"""
+
+import json
+
+from machining_auto.common import startup_timing
+from machining_auto.common.startup_timing import (
+    RECENT_RUNS,
+    StartupTimer,
+    median_stages,
+    read_log,
+)
+
+
+def _write_log(path, runs):
+    with open(path, "w", encoding="utf-8") as f:
+        for stages in runs:
+            f.write(json.dumps({"build": "b1", "stages_ms": stages}) + "\n")
+
+
+def test_median_stages_ignores_outliers_and_bad_values():
+    entries = [
+        {"stages_ms": {"import": 100, "theme": 10}},
+        {"stages_ms": {"import": 300, "theme": "x"}},
+        {"stages_ms": {"import": 5000}},  # 1회 튀는 값
+        {"stages_ms": {"import": 200, "theme": 30}},
+    ]
+    assert median_stages(entries) == {"import": 250.0, "theme": 20.0}
+
+
+def test_progress_uses_median_of_recent_runs(tmp_path):
+    log = tmp_path / "startup_timing.jsonl"
+    base = {"import": 600, "theme": 100, "shell": 100, "setting_page": 100, "first_paint": 100}
+    # 오래된 기록은 RECENT_RUNS 밖이라 무시, 최근 기록 중 튀는 값 1개는 중앙값에 묻힘
+    runs = [dict(base, setting_page=9000)] * 3 + [base] * (RECENT_RUNS - 1)
+    runs.append(dict(base, theme=5000))
+    _write_log(log, runs)
+
+    timer = StartupTimer(log_path=log)
+    assert timer.percent_before("import") == 0
+    # import가 전체 예상(1000ms)의 60%
+    assert timer.percent_before("theme") == 60
+    assert timer.percent_before("first_paint") == 90
+
+    # 끝난 단계는 실제 시간으로 바뀜: import 1400ms → (1400) / (1400 + 400)
+    timer.durations["import"] = 1400.0
+    assert timer.percent_before("theme") == 78
+
+
+def test_progress_falls_back_to_defaults_without_log(tmp_path):
+    timer = StartupTimer(log_path=tmp_path / "missing.jsonl")
+    expected = startup_timing.DEFAULT_EXPECTED_MS
+    stages = ("import", "theme", "shell", "setting_page", "first_paint")
+    total = sum(expected[s] for s in stages)
+    assert timer.percent_before("theme") == round(expected["import"] / total * 100)
+
+
+def test_finish_round_trips_jsonl(tmp_path, monkeypatch):
+    log = tmp_path / "sub" / "startup_timing.jsonl"
+    monkeypatch.setattr(startup_timing, "current_build", lambda: "b2")
+    messages = []
+
+    timer = StartupTimer(log_path=log)
+    timer.on_stage = lambda percent, message: messages.append((percent, message))
+    with timer.stage("theme"):
+        pass
+    timer.begin("shell")
+    record = timer.finish()
+    again = timer.finish()  # 두 번째 호출은 기록하지 않음
+
+    assert [m for _, m in messages] == ["테마 적용 중...", "화면 틀 구성 중..."]
+    assert set(record["stages_ms"]) == {"theme", "shell"}
+    assert again["build"] == "b2"
+
+    entries = read_log(log)
+    assert len(entries) == 1
+    assert entries[0]["build"] == "b2"
+    assert entries[0]["stages_ms"] == record["stages_ms"]
+
+    # 깨진 줄은 건너뛰고, 다음 실행은 기존 기록 뒤에 이어 씀
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+    StartupTimer(log_path=log).finish()
+    assert [e["build"] for e in read_log(log)] == ["b2", "b2"]
+
+
+def test_slower_stages_compares_with_previous_build(tmp_path, monkeypatch):
+    log = tmp_path / "startup_timing.jsonl"
+    _write_log(log, [{"setting_page": 1000, "theme": 100}] * 3)
+    monkeypatch.setattr(startup_timing, "current_build", lambda: "b2")
+
+    timer = StartupTimer(log_path=log)
+    timer.durations.update({"setting_page": 1500.0, "theme": 105.0})
+    slower = timer.slower_stages()
+    assert len(slower) == 1 and slower[0].startswith("setting_page 1000→1500ms")